@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Single-flight authentication benchmark.
+
+Fans out N concurrent requests for one account against the mock server and
+reports how many POST /login calls reached upstream, both for a cold cache
+and for a server-side session expiry (401 storm).
+
+    python benchmarks/bench_auth_singleflight.py --concurrency 10
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchlib import use_server, percentile
+from mock_axigen import MockAxigen
+
+use_server("email")
+from src.utils import get_session_cache, quick_request  # noqa: E402
+
+EMAIL = "bench@example.com"
+PASSWORD = "secret"
+
+
+async def fan_out(server_url: str, concurrency: int):
+    async def one(index: int):
+        start = time.perf_counter()
+        # Distinct params so concurrent GETs aren't coalesced into one
+        await quick_request(EMAIL, PASSWORD, server_url, "GET", "folders", params={"request": index})
+        return time.perf_counter() - start
+
+    return await asyncio.gather(*(one(i) for i in range(concurrency)))
+
+
+async def run(concurrency: int, login_latency: float):
+    async with MockAxigen(login_latency=login_latency) as mock:
+        cold = await fan_out(mock.url, concurrency)
+        cold_logins = mock.stats["logins"]
+
+        mock.expire_sessions()
+        storm = await fan_out(mock.url, concurrency)
+        storm_logins = mock.stats["logins"] - cold_logins
+
+        await get_session_cache().close_all()
+
+    print(f"concurrent calls:          {concurrency}")
+    print(f"logins (cold cache):       {cold_logins}")
+    print(f"logins (after 401 storm):  {storm_logins}")
+    print(f"cold p50/p99 ms:           {percentile(cold, 50) * 1000:.1f} / {percentile(cold, 99) * 1000:.1f}")
+    print(f"storm p50/p99 ms:          {percentile(storm, 50) * 1000:.1f} / {percentile(storm, 99) * 1000:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--login-latency", type=float, default=0.05)
+    args = parser.parse_args()
+    asyncio.run(run(args.concurrency, args.login_latency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Circuit breaker benchmark.
+
+Runs three phases against the fault-injecting mock: a hanging backend (every
+request exceeds the client timeout), a failing backend (every request gets
+503), and recovery (half-open probe, then closed). Reports how many calls reached upstream, how many were
+rejected fast, and the call latency in each phase.
+
+    python benchmarks/bench_circuit_breaker.py --calls 200
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchlib import use_server, percentile
+from mock_axigen import MockAxigen
+
+use_server("email")
+from src.utils import (  # noqa: E402
+    APIError, CircuitOpenError, get_circuit_breakers, get_metrics,
+    get_pool_manager, get_session_cache, quick_request
+)
+
+
+async def phase(name: str, mock: MockAxigen, calls: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, outcomes = [], {"ok": 0, "rejected": 0, "failed": 0}
+    upstream_before = mock.stats["requests"]
+
+    async def one(index: int):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await quick_request(f"user{index % 50}@example.com", "secret", mock.url, "GET", "folders",
+                                    params={"request": index})
+                outcomes["ok"] += 1
+            except CircuitOpenError:
+                outcomes["rejected"] += 1
+            except APIError:
+                outcomes["failed"] += 1
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(calls)))
+    elapsed = time.perf_counter() - start
+    state = get_circuit_breakers().get(mock.url).state
+    print(f"{name:<10} upstream={mock.stats['requests'] - upstream_before:<5} "
+          f"ok={outcomes['ok']:<5} failed={outcomes['failed']:<5} rejected={outcomes['rejected']:<5} "
+          f"p50={percentile(latencies, 50) * 1000:7.1f}ms p99={percentile(latencies, 99) * 1000:7.1f}ms "
+          f"wall={elapsed:5.2f}s state={state}")
+
+
+async def run(calls: int, concurrency: int, open_seconds: float):
+    breakers = get_circuit_breakers()
+    breakers.open_seconds = open_seconds
+    get_pool_manager().request_timeout = 0.5
+
+    async with MockAxigen() as mock:
+        # Log everyone in while healthy so the phases only exercise API calls
+        await phase("warmup", mock, 50, concurrency)
+
+        mock.latency = 2.0
+        await phase("hanging", mock, calls, concurrency)
+
+        mock.latency = 0.0
+        await asyncio.sleep(open_seconds)
+        mock.error_rate = 1.0
+        await phase("failing", mock, calls, concurrency)
+
+        mock.error_rate = 0.0
+        await asyncio.sleep(open_seconds)
+        # The first burst after the cool-down only lets the probe through
+        await phase("probe", mock, calls, concurrency)
+        await phase("recovered", mock, calls, concurrency)
+
+        await get_session_cache().close_all()
+
+    print({k: v for k, v in get_metrics().snapshot().items() if "circuit" in k})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--open-seconds", type=float, default=1.0)
+    args = parser.parse_args()
+    asyncio.run(run(args.calls, args.concurrency, args.open_seconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+GET coalescing benchmark.
+
+Mimics the email server's folder helpers (validate_folder_id,
+auto_discover_folder_id, get_reliable_common_folders, ...) all asking for
+GET folders at once, for several accounts, and counts upstream requests with
+coalescing off and on.
+
+    python benchmarks/bench_coalescing.py --accounts 20 --fanout 4 --rounds 10
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+from benchlib import use_server
+from mock_axigen import MockAxigen
+
+use_server("email")
+from src.utils import get_metrics, get_session_cache, quick_request  # noqa: E402
+
+
+async def run_once(label: str, accounts: int, fanout: int, rounds: int, latency: float):
+    get_metrics().reset()
+    async with MockAxigen(latency=latency) as mock:
+        emails = [f"user{i}@example.com" for i in range(accounts)]
+        # Log everyone in first so only API requests are counted
+        await asyncio.gather(*(quick_request(e, "secret", mock.url, "GET", "account/info") for e in emails))
+        before = mock.stats["requests"]
+        started = time.perf_counter()
+        for _ in range(rounds):
+            await asyncio.gather(*(
+                quick_request(e, "secret", mock.url, "GET", "folders")
+                for e in emails for _ in range(fanout)
+            ))
+        wall = time.perf_counter() - started
+        upstream = mock.stats["requests"] - before
+        await get_session_cache().close_all()
+
+    calls = accounts * fanout * rounds
+    print(f"{label:<14} calls {calls:>5}  upstream {upstream:>5}  "
+          f"coalesced {get_metrics().get('axigen_requests_coalesced_total'):>5.0f}  wall {wall:.2f}s")
+
+
+async def run(args):
+    os.environ["AXIGEN_COALESCE_GETS"] = "0"
+    await run_once("coalescing off", args.accounts, args.fanout, args.rounds, args.latency)
+    os.environ["AXIGEN_COALESCE_GETS"] = "1"
+    await run_once("coalescing on", args.accounts, args.fanout, args.rounds, args.latency)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--accounts", type=int, default=20)
+    parser.add_argument("--fanout", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.01)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
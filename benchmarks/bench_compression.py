@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Compressed transport benchmark.
+
+Fetches list_emails-sized pages from the mock with response compression off
+and on, and reports bytes on the wire, bytes after decoding and latency. Then
+sends large draft bodies with request compression enabled against a mock that
+rejects gzip bodies, to show the one-time fallback to plain bodies.
+
+    python benchmarks/bench_compression.py --items 500 --calls 50
+    python benchmarks/bench_compression.py --latency 0.02   # simulate a slow link
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+from benchlib import percentile, use_server
+from mock_axigen import MockAxigen
+
+use_server("email")
+from src.utils import accept_encoding, get_metrics, get_session_cache, quick_request  # noqa: E402
+
+
+def byte_counters(server_url: str, prefix: str) -> dict:
+    snapshot = get_metrics().snapshot()
+    return {
+        stage: snapshot.get(f'{prefix}{{server="{server_url}",stage="{stage}"}}', 0)
+        for stage in ("raw", "wire", "decoded")
+    }
+
+
+async def fetch_pages(label: str, compress: bool, items: int, calls: int, latency: float):
+    async with MockAxigen(compress=compress, latency=latency, mailbox_size=items) as mock:
+        timings = []
+        for _ in range(calls):
+            started = time.perf_counter()
+            await quick_request("user@example.com", "secret", mock.url, "GET", "mails",
+                                params={"limit": items})
+            timings.append((time.perf_counter() - started) * 1000)
+        await get_session_cache().close_all()
+
+    counters = byte_counters(mock.url, "axigen_response_bytes_total")
+    print(f"{label:<12} wire {counters['wire'] / calls / 1024:>8.1f} KiB/page  "
+          f"decoded {counters['decoded'] / calls / 1024:>8.1f} KiB/page  "
+          f"p50 {percentile(timings, 50):>6.1f}ms  p95 {percentile(timings, 95):>6.1f}ms")
+
+
+async def send_drafts(calls: int, body_kib: int):
+    os.environ["AXIGEN_COMPRESS_REQUESTS_MIN_BYTES"] = "1024"
+    body = {"to": "a@example.com", "subject": "Report", "isHtml": True,
+            "body": "<p>quarterly report figures attached</p>" * (body_kib * 1024 // 40)}
+    for accepts in (True, False):
+        async with MockAxigen(accept_compressed_bodies=accepts) as mock:
+            for _ in range(calls):
+                await quick_request("user@example.com", "secret", mock.url, "POST", "mails",
+                                    data=body)
+            await get_session_cache().close_all()
+        counters = byte_counters(mock.url, "axigen_request_bytes_total")
+        label = "accepted" if accepts else "rejected"
+        print(f"gzip {label:<8} {calls} drafts, {mock.stats['compressed_bodies']} sent compressed, "
+              f"raw {counters['raw'] / 1024:.0f} KiB -> wire {counters['wire'] / 1024:.0f} KiB")
+    del os.environ["AXIGEN_COMPRESS_REQUESTS_MIN_BYTES"]
+
+
+async def run(items: int, calls: int, latency: float, body_kib: int):
+    print(f"Accept-Encoding: {accept_encoding()}")
+    await fetch_pages("identity", False, items, calls, latency)
+    await fetch_pages("compressed", True, items, calls, latency)
+    await send_drafts(calls, body_kib)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--body-kib", type=int, default=64)
+    args = parser.parse_args()
+    asyncio.run(run(args.items, args.calls, args.latency, args.body_kib))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Connection pool benchmark.
+
+Drives many accounts against one mock host and reports how many connections
+(TCP/TLS handshakes) the server accepted and how many client sockets stay
+open afterwards.
+
+    python benchmarks/bench_connection_pool.py --accounts 500 --requests 4
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+from benchlib import use_server
+from mock_axigen import MockAxigen
+
+use_server("email")
+from src.utils import get_pool_manager, get_session_cache, quick_request  # noqa: E402
+
+
+def open_socket_fds() -> int:
+    """Number of socket file descriptors held by this process (Linux only)."""
+    count = 0
+    try:
+        for fd in os.listdir("/proc/self/fd"):
+            try:
+                if os.readlink(f"/proc/self/fd/{fd}").startswith("socket:"):
+                    count += 1
+            except OSError:
+                pass
+    except FileNotFoundError:
+        return -1
+    return count
+
+
+async def run(accounts: int, requests: int, concurrency: int):
+    async with MockAxigen() as mock:
+        baseline_fds = open_socket_fds()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one(index: int):
+            async with semaphore:
+                await quick_request(f"user{index}@example.com", "secret", mock.url, "GET", "folders")
+
+        jobs = [one(i) for i in range(accounts) for _ in range(requests)]
+        start = time.perf_counter()
+        await asyncio.gather(*jobs)
+        elapsed = time.perf_counter() - start
+
+        pool_stats = get_pool_manager().stats()
+        # Server-side sockets mirror client ones, so halve the process delta
+        client_sockets = max(0, open_socket_fds() - baseline_fds) // 2
+
+        print(f"accounts x requests:       {accounts} x {requests}")
+        print(f"connection pools:          {len(pool_stats)}")
+        print(f"handshakes (server-side):  {mock.stats['connections']}")
+        print(f"open client sockets:       {client_sockets}")
+        print(f"requests/s:                {len(jobs) / elapsed:.0f}")
+
+        await get_session_cache().close_all()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--accounts", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run(args.accounts, args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tool deadline benchmark.
+
+Runs a get_email-style chain (validate, get mail, get body) against a mock
+whose body endpoint is slow, with and without an end-to-end deadline, and
+reports how long the chain took and what came back. Also checks the
+timeout profile picked for a few endpoints, exiting with status 1 if any
+endpoint gets the wrong one.
+
+    python benchmarks/bench_deadlines.py --slow-body 10 --budget 2
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+from benchlib import use_server
+from mock_axigen import MockAxigen
+
+use_server("email")
+from src.utils import (  # noqa: E402
+    APIError, DeadlineExceededError, deadline, get_session_cache, get_timeout_profiles, quick_request
+)
+
+# (method, endpoint, profile the request must get)
+PROFILE_CHECKS = (
+    ("GET", "mails/counters", "metadata"),
+    ("GET", "mails/1/body", "default"),
+    ("POST", "mails/search", "search"),
+    ("POST", "batch/mails/move", "batch"),
+    ("GET", "mails/1/source", "bulk"),
+    ("GET", "mails/1/eml", "bulk"),
+    ("GET", "drafts/1/attachments/2/download", "bulk"),
+)
+
+
+async def get_email_chain(server_url: str) -> dict:
+    account = ("user@example.com", "secret", server_url)
+    await quick_request(*account, "GET", "mails", params={"limit": 1})
+    result = {"mail": await quick_request(*account, "GET", "mails/1")}
+    try:
+        result["body"] = await quick_request(*account, "GET", "mails/1/body")
+    except DeadlineExceededError:
+        result["partial"] = True
+    except APIError as e:
+        result["body_error"] = str(e)
+    return result
+
+
+async def run(slow_body: float, budget: float) -> int:
+    wrong = 0
+    profiles = get_timeout_profiles()
+    for method, endpoint, expected in PROFILE_CHECKS:
+        profile = profiles.for_request(method, endpoint)
+        check = "" if profile.name == expected else f"  WRONG, expected {expected}"
+        wrong += bool(check)
+        print(f"{method:<5} {endpoint:<32} -> {profile}{check}")
+    print()
+
+    async with MockAxigen(path_latency={r"mails/[^/]+/body": slow_body}) as mock:
+        for label, seconds in (("no deadline", None), (f"deadline {budget:g}s", budget)):
+            started = time.perf_counter()
+            with deadline(seconds):
+                result = await get_email_chain(mock.url)
+            elapsed = time.perf_counter() - started
+            outcome = "partial" if result.get("partial") else ("body" if "body" in result else "error")
+            print(f"{label:<14} {elapsed:>6.2f}s  result: {outcome}")
+        await get_session_cache().close_all()
+    return wrong
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--slow-body", type=float, default=10.0)
+    parser.add_argument("--budget", type=float, default=2.0)
+    args = parser.parse_args()
+    sys.exit(1 if asyncio.run(run(args.slow_body, args.budget)) else 0)
+
+
+if __name__ == "__main__":
+    main()
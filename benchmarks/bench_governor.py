@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Concurrency governor benchmark.
+
+One greedy account fires a large burst of concurrent requests at a mock host
+that can only serve a few at a time, while several well-behaved accounts make
+a handful of calls each. Reports latency for both kinds of account with the
+governor off and on, plus the governor's queue metrics.
+
+    python benchmarks/bench_governor.py --burst 400 --tenants 5 --capacity 16
+"""
+
+import argparse
+import asyncio
+import itertools
+import time
+
+from benchlib import percentile, use_server
+from mock_axigen import MockAxigen
+
+use_server("email")
+from src.utils import get_governor, get_metrics, get_session_cache, quick_request  # noqa: E402
+
+
+async def run_once(label: str, burst: int, tenants: int, calls: int, capacity: int, latency: float):
+    get_metrics().reset()
+    async with MockAxigen(latency=latency, capacity=capacity) as mock:
+        greedy_times, tenant_times = [], []
+        request_ids = itertools.count()
+
+        async def one(account: str, into: list):
+            started = time.perf_counter()
+            # Distinct params so the burst isn't coalesced into one GET
+            await quick_request(account, "secret", mock.url, "GET", "folders", params={"request": next(request_ids)})
+            into.append((time.perf_counter() - started) * 1000)
+
+        async def tenant(index: int):
+            # Arrive just after the burst, like a user sharing the host
+            await asyncio.sleep(0.01)
+            for _ in range(calls):
+                await one(f"tenant{index}@example.com", tenant_times)
+
+        # Warm the sessions so logins don't skew the comparison
+        await asyncio.gather(one("greedy@example.com", []),
+                             *(one(f"tenant{i}@example.com", []) for i in range(tenants)))
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(one("greedy@example.com", greedy_times) for _ in range(burst)),
+            *(tenant(i) for i in range(tenants)),
+        )
+        wall = time.perf_counter() - started
+        await get_session_cache().close_all()
+
+    metrics = get_metrics()
+    waits = metrics.get("axigen_governor_waits_total")
+    wait_avg = metrics.get("axigen_governor_wait_seconds_total") / waits * 1000 if waits else 0.0
+    print(f"{label:<13} tenants p50 {percentile(tenant_times, 50):>7.1f}ms  "
+          f"p95 {percentile(tenant_times, 95):>7.1f}ms | "
+          f"greedy p95 {percentile(greedy_times, 95):>7.1f}ms | "
+          f"wall {wall:.2f}s | queued {waits:.0f}, avg wait {wait_avg:.1f}ms")
+
+
+async def run(args):
+    governor = get_governor()
+    limits = governor.account_limit, governor.host_limit
+    governor.account_limit = governor.host_limit = 0
+    await run_once("governor off", args.burst, args.tenants, args.calls, args.capacity, args.latency)
+    governor.account_limit, governor.host_limit = limits
+    await run_once(f"governor {limits[0]}/{limits[1]}", args.burst, args.tenants, args.calls,
+                   args.capacity, args.latency)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--burst", type=int, default=400)
+    parser.add_argument("--tenants", type=int, default=5)
+    parser.add_argument("--calls", type=int, default=10)
+    parser.add_argument("--capacity", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.01)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
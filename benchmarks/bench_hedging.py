@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Hedged request benchmark.
+
+Sends GET mails/{id} calls to a mock where a small fraction of responses are
+much slower than the rest, with hedging off and on, and reports latency
+percentiles, upstream requests and how many hedges were sent and won.
+
+    python benchmarks/bench_hedging.py --calls 3000 --slow-rate 0.02 --slow-latency 0.3
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchlib import percentile, use_server
+from mock_axigen import MockAxigen
+
+use_server("email")
+from src.utils import get_hedge_policy, get_metrics, get_session_cache, quick_request  # noqa: E402
+
+
+async def run_once(label: str, args):
+    get_metrics().reset()
+    async with MockAxigen(latency=args.latency, slow_rate=args.slow_rate,
+                          slow_latency=args.slow_latency, seed=1) as mock:
+        timings = []
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        async def one(index: int):
+            async with semaphore:
+                started = time.perf_counter()
+                await quick_request(f"user{index % 20}@example.com", "secret", mock.url,
+                                    "GET", f"mails/{index % 500 + 1}")
+                timings.append((time.perf_counter() - started) * 1000)
+
+        await asyncio.gather(*(one(i) for i in range(args.calls)))
+        await get_session_cache().close_all()
+
+    # Skip the warm-up before the policy has enough samples
+    steady = timings[len(timings) // 10:]
+    metrics = get_metrics()
+    print(f"{label:<12} p50 {percentile(steady, 50):>6.1f}ms  p95 {percentile(steady, 95):>6.1f}ms  "
+          f"p99 {percentile(steady, 99):>6.1f}ms  p99.9 {percentile(steady, 99.9):>6.1f}ms | "
+          f"upstream {mock.stats['requests']:>5}  hedges {metrics.get('axigen_hedges_total'):>4.0f}  "
+          f"won {metrics.get('axigen_hedge_wins_total'):>4.0f}")
+
+
+async def run(args):
+    policy = get_hedge_policy()
+    policy.percentile = 0
+    await run_once("hedging off", args)
+    policy.percentile = args.percentile
+    policy.max_rate = args.max_rate
+    await run_once(f"p{args.percentile:g} hedge", args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.005)
+    parser.add_argument("--slow-rate", type=float, default=0.02)
+    parser.add_argument("--slow-latency", type=float, default=0.3)
+    parser.add_argument("--percentile", type=float, default=95)
+    parser.add_argument("--max-rate", type=float, default=0.1)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark.
+
+Starts a fresh interpreter per run that only imports a server's server.py,
+under `python -X importtime`, for each of the four servers and the gateway.
+Reports the median time to import the server module and to run the whole
+process, the heaviest modules it imports directly, and whether any module
+that src/utils.py defers to first use (aiohttp, email_validator, dnspython,
+sqlite3) was loaded anyway.
+
+A server whose median import time is over the budget, or that loads a
+deferred module at import, is a failure and makes the script exit with
+status 1, so it can gate CI. The budget defaults to AXIGEN_IMPORT_BUDGET_MS
+(2000ms if unset); it depends on the machine, so set it for the one the
+check runs on.
+
+    python benchmarks/bench_import.py --runs 7
+    python benchmarks/bench_import.py --servers email gateway --budget-ms 800 --top 10
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from benchlib import REPO_ROOT
+
+SERVERS = {
+    "email": "fastmcp-axigen-email",
+    "filters": "fastmcp-axigen-filters",
+    "security": "fastmcp-axigen-security",
+    "settings": "fastmcp-axigen-settings",
+    "gateway": "fastmcp-axigen-gateway",
+}
+# Top-level packages src/utils.py imports on first use rather than at load
+DEFERRED = ("aiohttp", "email_validator", "dns", "sqlite3")
+
+
+def parse_importtime(stderr: str) -> List[Tuple[int, str, int, int]]:
+    """(depth, module, self us, cumulative us) for each line of -X importtime output."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((depth, name.strip(), int(self_us), int(cumulative_us)))
+    return entries
+
+
+def import_once(server: str) -> Dict[str, Any]:
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import server"],
+        cwd=REPO_ROOT / SERVERS[server], capture_output=True, text=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    )
+    process_ms = (time.perf_counter() - started) * 1000
+    if completed.returncode != 0:
+        raise RuntimeError(f"importing {server} failed:\n{completed.stderr[-2000:]}")
+
+    entries = parse_importtime(completed.stderr)
+    # server is the last top-level import; its direct imports are the depth-1
+    # entries logged since the top-level import before it
+    index = max(i for i, entry in enumerate(entries) if entry[:2] == (0, "server"))
+    start = max((i for i in range(index) if entries[i][0] == 0), default=-1) + 1
+    children = {name: cumulative for depth, name, _, cumulative in entries[start:index] if depth == 1}
+    loaded = {name.split(".")[0] for _, name, _, _ in entries}
+    return {
+        "import_ms": entries[index][3] / 1000,
+        "process_ms": process_ms,
+        "children": children,
+        "deferred_loaded": sorted(loaded & set(DEFERRED)),
+    }
+
+
+def measure(server: str, runs: int) -> Dict[str, Any]:
+    import_once(server)  # fill the OS file cache; bytecode is already compiled
+    samples = [import_once(server) for _ in range(runs)]
+    children: Dict[str, List[float]] = {}
+    for sample in samples:
+        for name, cumulative in sample["children"].items():
+            children.setdefault(name, []).append(cumulative / 1000)
+    return {
+        "import_ms": statistics.median(sample["import_ms"] for sample in samples),
+        "process_ms": statistics.median(sample["process_ms"] for sample in samples),
+        "heaviest": sorted(((name, statistics.median(times)) for name, times in children.items()),
+                           key=lambda item: -item[1]),
+        "deferred_loaded": sorted({name for sample in samples for name in sample["deferred_loaded"]}),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--servers", nargs="*", choices=list(SERVERS), default=list(SERVERS))
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=float(os.environ.get("AXIGEN_IMPORT_BUDGET_MS", 2000)),
+                        help="maximum median import time per server")
+    parser.add_argument("--top", type=int, default=5, help="heaviest direct imports to list per server")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    results = {}
+    failures = []
+    print(f"{'server':<9} {'import ms':>9} {'process ms':>10}  heaviest direct imports (ms)")
+    for server in args.servers:
+        result = results[server] = measure(server, args.runs)
+        heaviest = ", ".join(f"{name} {ms:.0f}" for name, ms in result["heaviest"][:args.top])
+        print(f"{server:<9} {result['import_ms']:>9.0f} {result['process_ms']:>10.0f}  {heaviest}")
+        if result["import_ms"] > args.budget_ms:
+            failures.append(f"{server}: import took {result['import_ms']:.0f}ms, budget {args.budget_ms:.0f}ms")
+        if result["deferred_loaded"]:
+            failures.append(f"{server}: loads {', '.join(result['deferred_loaded'])} at import")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2) + "\n")
+    for failure in failures:
+        print(f"FAIL {failure}")
+    print(f"{len(failures)} failure(s) against a {args.budget_ms:.0f}ms budget")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+JSON codec microbenchmark.
+
+Times the three codecs the session layer can use on a 500-item list_emails
+page: decoding the upstream response, encoding a draft request body, and
+encoding a wrapped tool response. Tool responses are additionally encoded
+with pydantic-core, which is what FastMCP uses for tool results.
+
+    python benchmarks/bench_json_codec.py --items 500
+    python benchmarks/bench_json_codec.py --record page.json   # save the payload
+    python benchmarks/bench_json_codec.py --payload page.json  # replay a recorded one
+"""
+
+import argparse
+import timeit
+
+from benchlib import use_server
+from mock_axigen import make_mail_page
+
+use_server("email")
+from src.utils import format_success, load_json_codec  # noqa: E402
+
+
+def best_of(func, number: int) -> float:
+    """Best per-call time in microseconds over five repeats."""
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--number", type=int, default=50)
+    parser.add_argument("--payload", help="Recorded response body to replay")
+    parser.add_argument("--record", help="Write the generated payload here and exit")
+    args = parser.parse_args()
+
+    stdlib = load_json_codec("stdlib")
+    if args.payload:
+        with open(args.payload, "rb") as f:
+            raw = f.read()
+    else:
+        raw = stdlib.dumps(make_mail_page(args.items))
+    if args.record:
+        with open(args.record, "wb") as f:
+            f.write(raw)
+        print(f"wrote {len(raw)} bytes to {args.record}")
+        return
+
+    page = stdlib.loads(raw)
+    draft = {"to": "a@example.com", "subject": "Hi", "body": page["items"][0]["snippet"] * 200,
+             "isHtml": True}
+    tool_response = format_success(page, "Emails retrieved")
+    print(f"payload: {len(page['items'])} items, {len(raw) / 1024:.0f} KiB")
+    print(f"{'codec':<10} {'decode page':>12} {'encode draft':>13} {'encode tool resp':>17}")
+
+    for name in ("stdlib", "orjson", "msgspec"):
+        codec = load_json_codec(name)
+        if codec.name != name:
+            print(f"{name:<10} not installed")
+            continue
+        print(f"{name:<10} "
+              f"{best_of(lambda: codec.loads(raw), args.number):>10.0f}us "
+              f"{best_of(lambda: codec.dumps(draft), args.number):>11.0f}us "
+              f"{best_of(lambda: codec.dumps(tool_response), args.number):>15.0f}us")
+
+    try:
+        import pydantic_core
+    except ImportError:
+        return
+    print(f"{'pydantic':<10} {'-':>12} {'-':>13} "
+          f"{best_of(lambda: pydantic_core.to_json(tool_response), args.number):>15.0f}us")
+
+
+if __name__ == "__main__":
+    main()
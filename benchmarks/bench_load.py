@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Load test driver.
+
+Ramps up simulated MCP clients against the gateway, each working one of a
+fixed set of accounts on the mock in a closed loop of a realistic tool mix:
+list_emails, then get_email, add_label_by_name and move_email on one of the
+listed mails (alternating inbox -> archive and back so mailboxes don't
+drain). The mock and, with --transport http, the gateway run as separate
+processes, so the numbers cover the session cache, the aiohttp pools and the
+FastMCP transport rather than the driver.
+
+Every --sample-seconds it prints throughput, latency percentiles, server
+memory and open file descriptors, cached sessions and pooled connections;
+each stage ends with a summary, and the stage after which throughput stops
+growing while latency climbs is reported as the knee. Linux only (/proc).
+
+    python benchmarks/bench_load.py --clients 50,100,200,400,800 --accounts 500
+    python benchmarks/bench_load.py --transport memory --stage-seconds 5 --json load.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import re
+import resource
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from benchlib import REPO_ROOT, percentile
+
+# Labels the simulated clients apply, cycling through them
+LABELS = ("Work", "Personal", "Finance", "Travel", "Follow up")
+# Gauges read from the server's /metrics on every sample
+GAUGES = {
+    "sessions": r"^axigen_session_cache_size (\S+)$",
+    "pool_in_use": r'^axigen_pool_connections\{[^}]*state="in_use"[^}]*\} (\S+)$',
+    "pool_idle": r'^axigen_pool_connections\{[^}]*state="idle"[^}]*\} (\S+)$',
+}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port: int, process: subprocess.Popen, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{process.args[1]} exited with status {process.returncode}")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"nothing listening on port {port} after {timeout}s")
+
+
+def raise_fd_limit() -> int:
+    """Lift the soft open-file limit to the hard limit (inherited by the child processes)."""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    return resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+
+
+def process_usage(pid: int) -> Dict[str, float]:
+    """Resident memory (MiB), open file descriptors and CPU seconds used so far by a process."""
+    with open(f"/proc/{pid}/status") as f:
+        rss_kib = next(int(line.split()[1]) for line in f if line.startswith("VmRSS:"))
+    with open(f"/proc/{pid}/stat") as f:
+        # utime and stime, after the parenthesised command name
+        ticks = sum(int(field) for field in f.read().rsplit(")", 1)[1].split()[11:13])
+    return {"rss_mib": rss_kib / 1024, "fds": len(os.listdir(f"/proc/{pid}/fd")),
+            "cpu_seconds": ticks / os.sysconf("SC_CLK_TCK")}
+
+
+def read_gauges(text: str) -> Dict[str, float]:
+    values = {}
+    for name, pattern in GAUGES.items():
+        values[name] = sum(float(match) for match in re.findall(pattern, text, re.MULTILINE))
+    return values
+
+
+def mail_ids(payload: Any) -> List[str]:
+    """Mail IDs from a list_emails result, whichever shape the server returned."""
+    if not isinstance(payload, dict):
+        return []
+    items = payload.get("emails") or payload.get("items") or (payload.get("data") or {}).get("items") or []
+    return [str(item["id"]) for item in items if isinstance(item, dict) and "id" in item]
+
+
+def serve_gateway(port: int):
+    """--serve mode: run the gateway on the streamable HTTP transport."""
+    # Configure logging before the servers do, so their INFO lines stay quiet
+    logging.basicConfig(level=logging.WARNING)
+    import bench_tools  # puts the servers on sys.path and loads the gateway
+    bench_tools.gateway.mcp.run(transport="http", host="127.0.0.1", port=port, show_banner=False,
+                                log_level="warning")
+
+
+class Recorder:
+    """Latencies and errors since the last sample and since the stage began."""
+
+    def __init__(self):
+        self.sample: List[float] = []
+        self.stage: List[float] = []
+        self.errors = 0
+        self.stage_errors = 0
+        self.calls = 0
+
+    def record(self, seconds: float, ok: bool):
+        self.calls += 1
+        self.sample.append(seconds * 1000)
+        self.stage.append(seconds * 1000)
+        if not ok:
+            self.errors += 1
+            self.stage_errors += 1
+
+
+async def simulated_client(index: int, args, connect, recorder: Recorder, stop: asyncio.Event,
+                           connected: asyncio.Event):
+    account = f"load{index % args.accounts}@example.com"
+    credentials = {"email": account, "password": "Load-Passw0rd", "server_url": args.mock_url}
+
+    async def call(client, tool: str, **arguments):
+        started = time.perf_counter()
+        ok = False
+        result = None
+        try:
+            result = await client.call_tool(tool, {**credentials, **arguments}, raise_on_error=False)
+            payload = result.structured_content
+            ok = not result.is_error and not (isinstance(payload, dict) and payload.get("success") is False)
+        except Exception:
+            pass
+        recorder.record(time.perf_counter() - started, ok)
+        if args.think:
+            await asyncio.sleep(args.think)
+        return result.structured_content if result is not None else None
+
+    async with connect() as client:
+        connected.set()
+        iteration = index
+        while not stop.is_set():
+            source, target = ("inbox", "archive") if iteration % 2 == 0 else ("archive", "inbox")
+            ids = mail_ids(await call(client, "list_emails", folder_id=source, limit=10))
+            if ids:
+                mail_id = ids[iteration % len(ids)]
+                await call(client, "get_email", mail_id=mail_id)
+                await call(client, "add_label_by_name", mail_id=mail_id, label_name=LABELS[iteration % len(LABELS)])
+                await call(client, "move_email", mail_id=mail_id, folder_id=target)
+            iteration += 1
+
+
+async def run(args) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    from fastmcp import Client
+
+    if args.transport == "http":
+        server_url = f"http://127.0.0.1:{args.server_port}/mcp"
+
+        def connect():
+            return Client(server_url, timeout=120)
+
+        def scrape() -> str:
+            with urllib.request.urlopen(f"http://127.0.0.1:{args.server_port}/metrics", timeout=10) as response:
+                return response.read().decode()
+        server_pid = args.server_pid
+    else:
+        import bench_tools
+        from src.utils import render_metrics
+
+        def connect():
+            return Client(bench_tools.gateway.mcp)
+
+        scrape = render_metrics
+        server_pid = os.getpid()
+
+    recorder = Recorder()
+    stop = asyncio.Event()
+    tasks: List[asyncio.Task] = []
+    stages = []
+    timeline = []
+    started = time.monotonic()
+    cpu_started = time.process_time()
+
+    print(f"{'t (s)':>6} {'clients':>7} {'calls/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>6} "
+          f"{'rss MiB':>8} {'fds':>6} {'sessions':>8} {'pool':>9} {'server cpu':>10} {'driver cpu':>10}")
+    for level in args.clients:
+        while len(tasks) < level:
+            connected = asyncio.Event()
+            tasks.append(asyncio.create_task(
+                simulated_client(len(tasks), args, connect, recorder, stop, connected)))
+            # Don't let thousands of handshakes land in the same instant
+            if len(tasks) % 50 == 0:
+                await asyncio.sleep(0)
+        recorder.stage.clear()
+        recorder.stage_errors = 0
+        stage_started = time.monotonic()
+        stage_calls = recorder.calls
+        peak = {"rss_mib": 0.0, "fds": 0}
+
+        while time.monotonic() - stage_started < args.stage_seconds:
+            sample_started, sample_calls, sample_cpu = time.monotonic(), recorder.calls, time.process_time()
+            server_cpu = process_usage(server_pid)["cpu_seconds"]
+            recorder.sample.clear()
+            recorder.errors = 0
+            await asyncio.sleep(args.sample_seconds)
+            elapsed = time.monotonic() - sample_started
+            usage = process_usage(server_pid)
+            gauges = await asyncio.to_thread(scrape) if args.transport == "http" else scrape()
+            gauges = read_gauges(gauges)
+            point = {
+                "t": round(time.monotonic() - started, 1), "clients": len(tasks),
+                "calls_per_second": (recorder.calls - sample_calls) / elapsed,
+                "p50_ms": percentile(recorder.sample, 50), "p95_ms": percentile(recorder.sample, 95),
+                "p99_ms": percentile(recorder.sample, 99), "errors": recorder.errors,
+                "server_cpu": (usage.pop("cpu_seconds") - server_cpu) / elapsed,
+                "driver_cpu": (time.process_time() - sample_cpu) / elapsed,
+                **usage, **gauges,
+            }
+            timeline.append(point)
+            peak = {key: max(peak[key], usage[key]) for key in peak}
+            print(f"{point['t']:>6.1f} {point['clients']:>7} {point['calls_per_second']:>8.0f} "
+                  f"{point['p50_ms']:>8.1f} {point['p95_ms']:>8.1f} {point['p99_ms']:>8.1f} {point['errors']:>6} "
+                  f"{point['rss_mib']:>8.1f} {point['fds']:>6} {point['sessions']:>8.0f} "
+                  f"{point['pool_in_use']:>4.0f}/{point['pool_idle']:<4.0f} {point['server_cpu']:>9.0%} "
+                  f"{point['driver_cpu']:>9.0%}")
+
+        duration = time.monotonic() - stage_started
+        stages.append({
+            "clients": level, "calls_per_second": (recorder.calls - stage_calls) / duration,
+            "p50_ms": percentile(recorder.stage, 50), "p95_ms": percentile(recorder.stage, 95),
+            "p99_ms": percentile(recorder.stage, 99), "errors": recorder.stage_errors,
+            "peak_rss_mib": peak["rss_mib"], "peak_fds": peak["fds"],
+        })
+
+    stop.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    cpu = time.process_time() - cpu_started
+    print(f"driver used {cpu:.1f}s CPU over {time.monotonic() - started:.1f}s; "
+          f"near 100% the driver, not the server, is the limit")
+    return stages, timeline
+
+
+def report(stages: List[Dict[str, Any]]):
+    print()
+    print(f"{'clients':>7} {'calls/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>6} "
+          f"{'peak rss':>9} {'peak fds':>8}")
+    knee: Optional[int] = None
+    for previous, stage in zip([None] + stages, stages):
+        print(f"{stage['clients']:>7} {stage['calls_per_second']:>8.0f} {stage['p50_ms']:>8.1f} "
+              f"{stage['p95_ms']:>8.1f} {stage['p99_ms']:>8.1f} {stage['errors']:>6} "
+              f"{stage['peak_rss_mib']:>8.1f}M {stage['peak_fds']:>8}")
+        if knee is None and previous is not None:
+            # More clients but under 10% more throughput, while p95 grew by half
+            if (stage["calls_per_second"] < previous["calls_per_second"] * 1.1
+                    and stage["p95_ms"] > previous["p95_ms"] * 1.5):
+                knee = previous["clients"]
+    if knee is None:
+        print("no knee: throughput still scaled at the highest level; add more clients")
+    else:
+        print(f"knee at about {knee} clients: beyond it, added clients only add latency")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=lambda value: [int(n) for n in value.split(",")],
+                        default=[50, 100, 200, 400, 800], help="comma-separated concurrency levels to ramp through")
+    parser.add_argument("--accounts", type=int, default=500)
+    parser.add_argument("--transport", choices=("http", "memory"), default="http")
+    parser.add_argument("--stage-seconds", type=float, default=15)
+    parser.add_argument("--sample-seconds", type=float, default=5)
+    parser.add_argument("--think", type=float, default=0.0, help="seconds each client waits between tool calls")
+    parser.add_argument("--latency", type=float, default=0.005, help="mock latency per request")
+    parser.add_argument("--mailbox-size", type=int, default=200)
+    parser.add_argument("--json", help="write stage summaries and the timeline to this file")
+    parser.add_argument("--serve", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve_gateway(args.serve)
+        return
+
+    limit = raise_fd_limit()
+    if limit < max(args.clients) * 4:
+        print(f"warning: open file limit is {limit}; {max(args.clients)} clients may run out")
+    logging.basicConfig(level=logging.WARNING)
+    env = {**os.environ, "AXIGEN_SESSION_CACHE_MAX": str(max(args.accounts * 2, 10000))}
+    children = []
+    try:
+        mock_port = free_port()
+        mock = subprocess.Popen(
+            [sys.executable, str(Path(__file__).with_name("mock_axigen.py")), "--port", str(mock_port),
+             "--latency", str(args.latency), "--mailbox-size", str(args.mailbox_size)],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env
+        )
+        children.append(mock)
+        wait_for_port(mock_port, mock)
+        args.mock_url = f"http://127.0.0.1:{mock_port}"
+
+        if args.transport == "http":
+            args.server_port = free_port()
+            server = subprocess.Popen([sys.executable, __file__, "--serve", str(args.server_port)],
+                                      stdout=subprocess.DEVNULL, cwd=REPO_ROOT, env=env)
+            children.append(server)
+            wait_for_port(args.server_port, server)
+            args.server_pid = server.pid
+        else:
+            os.environ.update(env)
+
+        stages, timeline = asyncio.run(run(args))
+        report(stages)
+        if args.json:
+            Path(args.json).write_text(json.dumps({"stages": stages, "timeline": timeline}, indent=2) + "\n")
+    finally:
+        for child in reversed(children):
+            child.terminate()
+            child.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    main()
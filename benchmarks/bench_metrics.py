@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Metrics overhead benchmark.
+
+Times the bookkeeping each upstream request and tool call does (endpoint
+label, counter and histogram update) against a mock round-trip, then fills
+the registry with series for many Axigen hosts and times a /metrics scrape.
+
+    python benchmarks/bench_metrics.py --calls 100000 --servers 20
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchlib import use_server
+from mock_axigen import MockAxigen
+
+use_server("email")
+from src.utils import endpoint_label, get_metrics, get_session_cache, quick_request, render_metrics  # noqa: E402
+
+ENDPOINTS = ["mails", "mails/12345", "mails/12345/body", "mails/12345/move", "labels/lbl-9",
+             "account/avas/whitelist/17", "drafts/200001/send", "folders"]
+
+
+def per_call_overhead(calls: int) -> float:
+    """Microseconds of metrics work per instrumented request."""
+    metrics = get_metrics()
+    started = time.perf_counter()
+    for index in range(calls):
+        label = endpoint_label(ENDPOINTS[index % len(ENDPOINTS)])
+        metrics.increment("axigen_requests_total", method="GET", endpoint=label, outcome="ok")
+        metrics.observe("axigen_request_seconds", 0.004, method="GET", endpoint=label)
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+async def round_trip(requests: int) -> float:
+    """Mean milliseconds for a GET against the mock, for scale."""
+    async with MockAxigen() as mock:
+        account = ("user@example.com", "secret", mock.url)
+        await quick_request(*account, "GET", "folders")
+        started = time.perf_counter()
+        for index in range(requests):
+            await quick_request(*account, "GET", f"mails/{index % 50 + 1}")
+        elapsed = (time.perf_counter() - started) / requests * 1000
+        await get_session_cache().close_all()
+    return elapsed
+
+
+def scrape(servers: int) -> None:
+    metrics = get_metrics()
+    for server in range(servers):
+        server_url = f"https://mail{server}.example.com"
+        for label in {endpoint_label(endpoint) for endpoint in ENDPOINTS}:
+            metrics.increment("axigen_responses_total", server=server_url, encoding="gzip")
+            metrics.increment("axigen_retries_total", method="GET", reason="503")
+            metrics.observe("axigen_request_seconds", 0.01, method="POST", endpoint=label)
+        metrics.set("axigen_circuit_state", 0, server=server_url)
+    started = time.perf_counter()
+    body = render_metrics()
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"scrape: {len(body.splitlines())} lines, {len(body) / 1024:.1f} KiB, rendered in {elapsed:.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=100_000)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--servers", type=int, default=20)
+    args = parser.parse_args()
+
+    overhead = per_call_overhead(args.calls)
+    request_ms = asyncio.run(round_trip(args.requests))
+    print(f"metrics per request: {overhead:.2f}us "
+          f"({overhead / (request_ms * 1000) * 100:.2f}% of a {request_ms:.2f}ms mock round-trip)")
+    scrape(args.servers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Retry policy benchmark.
+
+Sends idempotent GETs through a mock that fails a fraction of requests with a
+transient status and reports how many calls still surfaced as errors, plus the
+retry counters from the session layer metrics.
+
+    python benchmarks/bench_retries.py --error-rate 0.2 --error-status 503
+"""
+
+import argparse
+import asyncio
+import json
+
+from benchlib import use_server
+from mock_axigen import MockAxigen
+
+use_server("email")
+from src.utils import APIError, get_metrics, get_session_cache, quick_request  # noqa: E402
+
+
+async def run(calls: int, error_rate: float, error_status: int, retry_after: float):
+    async with MockAxigen(error_rate=error_rate, error_status=error_status, retry_after=retry_after) as mock:
+        failures = 0
+
+        async def one(index: int):
+            nonlocal failures
+            try:
+                await quick_request(f"user{index % 20}@example.com", "secret", mock.url, "GET", "folders",
+                                    params={"request": index})
+            except APIError:
+                failures += 1
+
+        await asyncio.gather(*(one(i) for i in range(calls)))
+        await get_session_cache().close_all()
+
+    print(f"calls:             {calls}")
+    print(f"injected errors:   {mock.stats['injected_errors']} (HTTP {error_status})")
+    print(f"surfaced failures: {failures}")
+    print(json.dumps({k: v for k, v in get_metrics().snapshot().items() if "retr" in k}, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--error-rate", type=float, default=0.2)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--retry-after", type=float, default=0.05)
+    args = parser.parse_args()
+    asyncio.run(run(args.calls, args.error_rate, args.error_status, args.retry_after))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Session cache memory and socket benchmark.
+
+Streams a large number of synthetic accounts through the session cache in
+waves. Every wave looks up a batch of new accounts (a sample of them also
+makes a real request against the mock) and reports cache size, memory
+allocated from src/utils.py and open sockets, which should level off once the
+cache is full. Memory is measured after the evicted sessions have closed, and
+only counts the session layer, not the in-process mock's per-account mailboxes.
+
+    python benchmarks/bench_session_cache.py --accounts 50000 --max-entries 5000
+"""
+
+import argparse
+import asyncio
+import gc
+import tracemalloc
+
+from benchlib import use_server
+from bench_connection_pool import open_socket_fds
+from mock_axigen import MockAxigen
+
+use_server("email")
+from src.utils import SessionCache, get_metrics, get_session_cache, quick_request  # noqa: E402
+import src.utils as utils  # noqa: E402
+
+
+async def run(accounts: int, waves: int, max_entries: int, idle_seconds: float, sample: int):
+    # Swap in a cache with benchmark-sized bounds
+    utils._session_cache = SessionCache(
+        ttl_minutes=idle_seconds / 60, max_entries=max_entries, reap_interval=idle_seconds / 2
+    )
+    cache = get_session_cache()
+    per_wave = accounts // waves
+
+    tracemalloc.start()
+    async with MockAxigen() as mock:
+        print(f"{'wave':>4} {'accounts':>9} {'cached':>7} {'utils MB':>10} {'sockets':>8}")
+        for wave in range(waves):
+            first = wave * per_wave
+            for index in range(first, first + per_wave):
+                cache.get_session(f"user{index}@example.com", "secret", mock.url)
+            await asyncio.gather(*(
+                quick_request(f"user{index}@example.com", "secret", mock.url, "GET", "folders")
+                for index in range(first, first + min(sample, per_wave))
+            ))
+            # Let the evicted sessions finish closing before measuring
+            while cache._closing:
+                await asyncio.gather(*list(cache._closing), return_exceptions=True)
+            gc.collect()
+            snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(True, utils.__file__)])
+            current = sum(stat.size for stat in snapshot.statistics("filename"))
+            print(f"{wave + 1:>4} {first + per_wave:>9} {len(cache):>7} "
+                  f"{current / 1e6:>10.1f} {open_socket_fds():>8}")
+
+        await asyncio.sleep(idle_seconds * 1.5)
+        print(f"after idle sweep: cached={len(cache)}")
+        await cache.close_all()
+
+    print({k: v for k, v in get_metrics().snapshot().items() if "session_cache" in k})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--accounts", type=int, default=50000)
+    parser.add_argument("--waves", type=int, default=10)
+    parser.add_argument("--max-entries", type=int, default=5000)
+    parser.add_argument("--idle-seconds", type=float, default=2.0)
+    parser.add_argument("--sample", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.accounts, args.waves, args.max_entries, args.idle_seconds, args.sample))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Session cache concurrency benchmark.
+
+Several threads, each running its own event loop, look up sessions for an
+overlapping set of accounts at the same time. Checks that every account ends
+up with exactly one session object, and reports lookup throughput, the
+hit/miss/creation counters and the session creation latency histogram.
+
+Only lookups are measured; no requests are sent, so the sessions never bind
+to a loop. Sending requests through one cache from several running loops is
+not supported (see SessionCache).
+
+    python benchmarks/bench_session_cache_concurrency.py --accounts 100000 --threads 8
+"""
+
+import argparse
+import asyncio
+import random
+import threading
+import time
+
+from benchlib import percentile, use_server
+
+use_server("email")
+from src.utils import SessionCache, get_metrics  # noqa: E402
+import src.utils as utils  # noqa: E402
+
+SERVER_URL = "http://127.0.0.1:9"
+
+
+def worker(cache: SessionCache, accounts: int, lookups: int, tasks: int, seed: int, seen: dict, timings: list):
+    rng = random.Random(seed)
+
+    async def lookup_some(count: int):
+        for _ in range(count):
+            index = rng.randrange(accounts)
+            started = time.perf_counter()
+            session = cache.get_session(f"user{index}@example.com", "secret", SERVER_URL)
+            timings.append(time.perf_counter() - started)
+            seen.setdefault(index, set()).add(id(session))
+            if rng.random() < 0.01:
+                await asyncio.sleep(0)
+
+    async def main():
+        await asyncio.gather(*(lookup_some(lookups // tasks) for _ in range(tasks)))
+
+    asyncio.run(main())
+
+
+def run(args):
+    utils._session_cache = cache = SessionCache(max_entries=args.accounts)
+    get_metrics().reset()
+    seen = [{} for _ in range(args.threads)]
+    timings = [[] for _ in range(args.threads)]
+    threads = [
+        threading.Thread(target=worker, args=(cache, args.accounts, args.lookups, args.tasks, i, seen[i], timings[i]))
+        for i in range(args.threads)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    sessions = {}
+    for per_thread in seen:
+        for index, ids in per_thread.items():
+            sessions.setdefault(index, set()).update(ids)
+    duplicates = sum(1 for ids in sessions.values() if len(ids) > 1)
+    total = args.threads * args.lookups
+    all_timings = [t * 1e6 for per_thread in timings for t in per_thread]
+
+    metrics = get_metrics()
+    print(f"{args.threads} threads x {args.lookups} lookups over {args.accounts} accounts in {wall:.2f}s "
+          f"({total / wall:,.0f} lookups/s)")
+    print(f"lookup p50 {percentile(all_timings, 50):.1f}us  p99 {percentile(all_timings, 99):.1f}us")
+    print(f"accounts touched {len(sessions)}, cached {len(cache)}, accounts with >1 session: {duplicates}")
+    print(f"hits {metrics.get('axigen_session_cache_lookups_total', result='hit'):.0f}  "
+          f"misses {metrics.get('axigen_session_cache_lookups_total', result='miss'):.0f}  "
+          f"creations {metrics.get('axigen_session_cache_creations_total'):.0f}")
+    histogram = metrics.histogram("axigen_session_create_seconds")
+    print(f"creation latency: count {histogram['count']}, "
+          f"mean {histogram['sum'] / max(histogram['count'], 1) * 1e6:.1f}us")
+    for bound, count in histogram["buckets"]:
+        print(f"  le {bound:>7}  {count}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--accounts", type=int, default=100000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--lookups", type=int, default=50000)
+    parser.add_argument("--tasks", type=int, default=10)
+    args = parser.parse_args()
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
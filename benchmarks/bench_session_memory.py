@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Session memory benchmark.
+
+Fills a session cache with authenticated sessions for many accounts and
+reports traced bytes per cached account, for the current AxigenSession and
+for a replica of the previous dict-based layout (plaintext password,
+datetimes, per-session timedeltas, eager lock and coalescing table). Also
+times cache hits, which now compare a credential fingerprint instead of
+rebuilding the auth header.
+
+    python benchmarks/bench_session_memory.py --accounts 100000
+"""
+
+import argparse
+import asyncio
+import base64
+import gc
+import time
+import tracemalloc
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from benchlib import use_server
+
+use_server("email")
+from src.utils import SessionCache  # noqa: E402
+
+SERVER_URL = "http://mail.example.com:9000"
+
+
+class LegacySession:
+    """The attributes AxigenSession used to allocate per account."""
+
+    def __init__(self, email: str, password: str, server_url: str):
+        self.email = email
+        self.password = password
+        self.server_url = server_url.rstrip('/')
+        self.base_url = f"{self.server_url}/api/v1"
+        self.session_id = None
+        self.auth_header = "Basic " + base64.b64encode(f"{email}:{password}".encode()).decode('ascii')
+        self.expires_at = None
+        self._http_session = None
+        self._auth_lock = asyncio.Lock()
+        self.session_ttl = timedelta(minutes=30)
+        self.refresh_window = timedelta(minutes=5)
+        self.authenticated_at = None
+        self.last_activity = None
+        self._refresh_task = None
+        self._in_flight = 0
+        self._drained = None
+        self._pending_reads = {}
+        self.last_used = time.monotonic()
+
+
+def fill_legacy(accounts: int, pool) -> OrderedDict:
+    cache = OrderedDict()
+    for index in range(accounts):
+        email = f"user{index}@example.com"
+        session = LegacySession(email, f"password-{index}", SERVER_URL)
+        session.session_id = f"{index:032x}"
+        now = datetime.now()
+        session.authenticated_at = session.last_activity = now
+        session.expires_at = now + session.session_ttl
+        session._http_session = pool
+        cache[(email.lower(), SERVER_URL)] = session
+    return cache
+
+
+def fill_current(accounts: int, pool) -> SessionCache:
+    cache = SessionCache(max_entries=accounts)
+    for index in range(accounts):
+        session = cache.get_session(f"user{index}@example.com", f"password-{index}", SERVER_URL)
+        session.session_id = f"{index:032x}"
+        now = time.time()
+        session.authenticated_at = session.last_activity = now
+        session.expires_at = now + session.session_ttl.total_seconds()
+        session._http_session = pool
+    return cache
+
+
+def measure(label: str, fill, accounts: int):
+    pool = object()  # stands in for the shared per-host ClientSession
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    cache = fill(accounts, pool)
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    per_account = (after - before) / accounts
+    print(f"{label:<8} {accounts} accounts  {(after - before) / 2**20:>7.1f} MiB  {per_account:>6.0f} bytes/account")
+    return cache
+
+
+def time_hits(cache: SessionCache, accounts: int, lookups: int):
+    started = time.perf_counter()
+    for index in range(lookups):
+        account = index % accounts
+        cache.get_session(f"user{account}@example.com", f"password-{account}", SERVER_URL)
+    elapsed = time.perf_counter() - started
+    print(f"cache hit {elapsed / lookups * 1e6:.2f}us per lookup ({lookups} lookups)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--accounts", type=int, default=100000)
+    parser.add_argument("--lookups", type=int, default=200000)
+    args = parser.parse_args()
+    legacy = measure("before", fill_legacy, args.accounts)
+    del legacy
+    current = measure("after", fill_current, args.accounts)
+    time_hits(current, args.accounts, args.lookups)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Sliding-expiry and background refresh benchmark.
+
+Simulates accounts that make a call, go idle for a random gap and come back,
+alongside one-off accounts that make a single call and leave, with session
+lifetimes scaled down to seconds. Reports how often a call had to block on a
+login, and how many one-off sessions were refreshed for nothing, with and
+without proactive refresh.
+
+    python benchmarks/bench_session_refresh.py --accounts 100 --one-off 100 --rounds 6
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import timedelta
+
+from benchlib import use_server, percentile
+from mock_axigen import MockAxigen
+
+use_server("email")
+from src.utils import SessionCache, get_metrics, quick_request  # noqa: E402
+import src.utils as utils  # noqa: E402
+
+
+async def scenario(label: str, accounts: int, one_off: int, rounds: int, ttl: float, refresh: float, seed: int):
+    get_metrics().reset()
+    utils._session_cache = SessionCache(ttl_minutes=60, reap_interval=ttl / 10)
+    # Scale the burst gap down along with the lifetime
+    utils._SESSION_BURST_GAP = ttl / 20
+    cache = utils.get_session_cache()
+    rng = random.Random(seed)
+
+    async with MockAxigen(login_latency=0.05) as mock:
+        sessions = {}
+        for name in [f"user{index}" for index in range(accounts)] + [f"once{index}" for index in range(one_off)]:
+            session = sessions[name] = cache.get_session(f"{name}@example.com", "secret", mock.url)
+            session.session_ttl = timedelta(seconds=ttl)
+            session.refresh_window = timedelta(seconds=refresh)
+
+        latencies = []
+
+        async def user(index: int):
+            for _ in range(rounds):
+                start = time.perf_counter()
+                await quick_request(f"user{index}@example.com", "secret", mock.url, "GET", "folders")
+                latencies.append(time.perf_counter() - start)
+                # Idle between 0.5x and 1.5x the session lifetime
+                await asyncio.sleep(rng.uniform(0.5, 1.5) * ttl)
+
+        async def once(index: int):
+            await quick_request(f"once{index}@example.com", "secret", mock.url, "GET", "folders")
+            return sessions[f"once{index}"].authenticated_at
+
+        logged_in = await asyncio.gather(*(once(i) for i in range(one_off)))
+        await asyncio.gather(*(user(i) for i in range(accounts)))
+        wasted = sum(sessions[f"once{index}"].authenticated_at != at for index, at in enumerate(logged_in))
+        await cache.close_all()
+
+    metrics = get_metrics()
+    print(f"{label:<16} logins={mock.stats['logins']:<5} "
+          f"blocking(expired)={metrics.get('axigen_session_auth_checks_total', outcome='expired'):<5.0f} "
+          f"refreshes={metrics.get('axigen_session_refreshes_total'):<5.0f} "
+          f"one-off refreshed={wasted:<4} "
+          f"hit_rate={metrics.get('axigen_session_refresh_hit_rate'):.2f} "
+          f"p99={percentile(latencies, 99) * 1000:.1f}ms")
+
+
+async def run(accounts: int, one_off: int, rounds: int, ttl: float):
+    await scenario("no refresh", accounts, one_off, rounds, ttl, 0.0, seed=1)
+    await scenario("with refresh", accounts, one_off, rounds, ttl, ttl * 0.6, seed=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--accounts", type=int, default=100)
+    parser.add_argument("--one-off", type=int, default=100, help="Accounts that make a single call")
+    parser.add_argument("--rounds", type=int, default=6)
+    parser.add_argument("--ttl", type=float, default=1.0, help="Scaled session lifetime in seconds")
+    args = parser.parse_args()
+    asyncio.run(run(args.accounts, args.one_off, args.rounds, args.ttl))
+
+
+if __name__ == "__main__":
+    main()
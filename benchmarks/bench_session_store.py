@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Persistent session store benchmark.
+
+Simulates a restart: N users make a call, the session layer shuts down, a
+fresh process state comes up and the same users call again. Counts POST
+/login calls and the restarted users' latency with and without the
+encrypted session store.
+
+    python benchmarks/bench_session_store.py --users 1000
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from benchlib import percentile, use_server
+from mock_axigen import MockAxigen
+
+use_server("email")
+from src.utils import (  # noqa: E402
+    SessionStore, get_session_cache, get_session_store, quick_request, set_session_store
+)
+
+
+async def call_all(server_url: str, users: int) -> list:
+    timings = []
+    semaphore = asyncio.Semaphore(100)
+
+    async def one(index: int):
+        async with semaphore:
+            started = time.perf_counter()
+            await quick_request(f"user{index}@example.com", "secret", server_url, "GET", "folders")
+            timings.append((time.perf_counter() - started) * 1000)
+
+    await asyncio.gather(*(one(i) for i in range(users)))
+    return timings
+
+
+async def run_once(label: str, users: int, store_path: str = None):
+    async with MockAxigen(login_latency=0.02) as mock:
+        set_session_store(SessionStore(store_path, "bench-passphrase") if store_path else None)
+        await call_all(mock.url, users)
+        await get_session_cache().close_all()
+        before_restart = mock.stats["logins"]
+
+        # "Restart": a new store handle, as a new process would open
+        if store_path:
+            get_session_store().close()
+            set_session_store(SessionStore(store_path, "bench-passphrase"))
+        timings = await call_all(mock.url, users)
+        logins_after = mock.stats["logins"] - before_restart
+        await get_session_cache().close_all()
+        store = get_session_store()
+        if store is not None:
+            store.close()
+        set_session_store(None)
+
+    print(f"{label:<10} logins before restart {before_restart:>5}  after {logins_after:>5}  "
+          f"rejected {mock.stats['rejected']:>3}  restarted p50 {percentile(timings, 50):>6.1f}ms  "
+          f"p99 {percentile(timings, 99):>6.1f}ms")
+
+
+async def run(users: int):
+    await run_once("no store", users)
+    with tempfile.TemporaryDirectory() as tmp:
+        await run_once("store", users, os.path.join(tmp, "sessions.db"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(run(args.users))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Graceful shutdown benchmark.
+
+Logs in N accounts against the mock, leaves slow requests in flight, then
+shuts the session cache down. Reports how many in-flight requests completed,
+how many server-side sessions were logged out (and how many were left
+orphaned), and how long shutdown took.
+
+    python benchmarks/bench_shutdown.py --accounts 1000 --in-flight 50
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchlib import use_server
+from mock_axigen import MockAxigen
+
+use_server("email")
+from src.utils import APIError, get_metrics, get_session_cache, quick_request  # noqa: E402
+
+
+async def run(accounts: int, in_flight: int, latency: float):
+    async with MockAxigen() as mock:
+        await asyncio.gather(*(
+            quick_request(f"user{i}@example.com", "secret", mock.url, "GET", "folders")
+            for i in range(accounts)
+        ))
+        logged_in = len(mock.sessions)
+
+        mock.latency = latency
+        completed = 0
+
+        async def slow(index: int):
+            nonlocal completed
+            try:
+                await quick_request(f"user{index}@example.com", "secret", mock.url, "GET", "mails")
+                completed += 1
+            except APIError:
+                pass
+
+        pending = [asyncio.create_task(slow(i)) for i in range(in_flight)]
+        await asyncio.sleep(latency / 4)
+
+        start = time.perf_counter()
+        await get_session_cache().close_all()
+        elapsed = time.perf_counter() - start
+        await asyncio.gather(*pending)
+
+    print(f"server sessions before:    {logged_in}")
+    print(f"in-flight completed:       {completed} / {in_flight}")
+    print(f"logouts received:          {mock.stats['logouts']}")
+    print(f"orphaned server sessions:  {len(mock.sessions)}")
+    print(f"shutdown time:             {elapsed:.2f}s")
+    print({k: v for k, v in get_metrics().snapshot().items() if "logout" in k})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--accounts", type=int, default=1000)
+    parser.add_argument("--in-flight", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.5)
+    args = parser.parse_args()
+    asyncio.run(run(args.accounts, args.in_flight, args.latency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Streaming download benchmark.
+
+Fetches a large mails/{id}/source from the mock three ways and reports
+traced peak memory, time to first byte and bytes the mock actually sent:
+buffered make_request, streaming into a null sink with download(), and
+reading just the headers then stopping early.
+
+    python benchmarks/bench_streaming.py --size-mib 25
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from benchlib import use_server
+from mock_axigen import MockAxigen
+
+use_server("email")
+from src.utils import (  # noqa: E402
+    ResponseTooLargeError, get_session_cache, quick_download, quick_request, quick_stream
+)
+
+
+class NullSink:
+    def write(self, chunk: bytes):
+        pass
+
+
+async def measure(label: str, mock: MockAxigen, func):
+    sent_before = mock.stats["source_bytes_sent"]
+    first_byte = []
+    started = time.perf_counter()
+
+    def progress(received, total):
+        if not first_byte:
+            first_byte.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    try:
+        await func(progress)
+    except ResponseTooLargeError as e:
+        label += f" ({e.__class__.__name__})"
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    elapsed = time.perf_counter() - started
+    ttfb = f"{first_byte[0] * 1000:>7.1f}ms" if first_byte else f"{elapsed * 1000:>7.1f}ms"
+    await asyncio.sleep(0.05)  # let the mock notice an aborted transfer
+    sent = mock.stats["source_bytes_sent"] - sent_before
+    print(f"{label:<50} peak {peak / 2**20:>7.1f} MiB  first byte {ttfb}  "
+          f"total {elapsed * 1000:>7.1f}ms  mock sent {sent / 2**20:>6.1f} MiB")
+
+
+async def run(size_mib: int):
+    async with MockAxigen(source_bytes=size_mib * 2**20) as mock:
+        mock.raw_source()
+        account = ("user@example.com", "secret", mock.url)
+        endpoint = "mails/1/source"
+        await quick_request(*account, "GET", "folders")
+
+        async def buffered(progress):
+            await quick_request(*account, "GET", endpoint)
+
+        async def download(progress):
+            await quick_download(*account, endpoint, NullSink(), progress=progress)
+
+        async def capped(progress):
+            await quick_download(*account, endpoint, NullSink(), max_bytes=2**20, progress=progress)
+
+        async def headers_only(progress):
+            async with quick_stream(*account, "GET", endpoint, progress=progress) as body:
+                async for chunk in body:
+                    if b"\r\n\r\n" in chunk:
+                        break
+
+        await measure("buffered make_request", mock, buffered)
+        await measure("download() to null sink", mock, download)
+        await measure("download() max_bytes=1MiB", mock, capped)
+        await measure("stream, stop after headers", mock, headers_only)
+        await get_session_cache().close_all()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size-mib", type=int, default=25)
+    args = parser.parse_args()
+    asyncio.run(run(args.size_mib))
+
+
+if __name__ == "__main__":
+    main()
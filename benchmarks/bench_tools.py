@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Per-tool round-trip benchmark.
+
+Calls every MCP tool of the four servers (through the gateway, over an
+in-memory MCP client) against the mock running on its own thread, and
+records per tool: upstream API calls and which endpoints they hit, request
+and response bytes, wall time and CPU time spent on the event loop thread.
+Each repetition uses a fresh seeded mailbox, and sessions are logged in
+beforehand, so logins are not counted.
+
+Results can be written as JSON and compared against a stored baseline; more
+upstream calls or noticeably more bytes than the baseline are reported as
+regressions and make the script exit with status 1, so it can gate CI.
+
+    python benchmarks/bench_tools.py                      # compare with baselines/tools.json
+    python benchmarks/bench_tools.py --json results.json  # also write the results
+    python benchmarks/bench_tools.py --update-baseline    # accept the current numbers
+    python benchmarks/bench_tools.py --tools get_email send_draft --repeat 20
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Union
+
+import email_validator
+
+from benchlib import REPO_ROOT, use_server
+from mock_axigen import Mailbox, MockAxigen
+
+use_server("email")
+sys.path.insert(0, str(REPO_ROOT / "fastmcp-axigen-gateway"))
+from fastmcp import Client  # noqa: E402
+from src.utils import get_session_cache  # noqa: E402
+import server as gateway  # noqa: E402
+
+# The mock's addresses use reserved domains that fail deliverability checks
+email_validator.TEST_ENVIRONMENT = True
+# Failing tools show up in the results table; don't print their tracebacks
+logging.getLogger("fastmcp").setLevel(logging.CRITICAL)
+
+BASELINE = Path(__file__).resolve().parent / "baselines" / "tools.json"
+PASSWORD = "Bench-Passw0rd"
+# Seeded IDs: inbox mails are 1..N, drafts start at 200001
+MAIL_ID = "1"
+DRAFT_ID = "200001"
+MESSAGE = {"to": "bob@example.org", "subject": "Benchmark", "body_text": "Quarterly figures attached."}
+
+# Arguments per tool (besides credentials); callables get the account's mailbox
+# and can create whatever the tool needs to find
+ToolArgs = Union[Dict[str, Any], Callable[[Mailbox], Dict[str, Any]]]
+TOOL_ARGS: Dict[str, ToolArgs] = {
+    # Email
+    "list_emails": {"folder_id": "inbox", "limit": 50},
+    "search_emails": {"folder_ids": ["inbox"], "search_criteria": [{"field": "subject", "value": "report"}]},
+    "get_email": {"mail_id": MAIL_ID},
+    "get_email_body": {"mail_id": MAIL_ID},
+    "create_draft": MESSAGE,
+    "send_email": MESSAGE,
+    "send_draft": {"draft_id": DRAFT_ID},
+    "update_draft": {"draft_id": DRAFT_ID, **MESSAGE},
+    "schedule_send_draft": lambda box: {"draft_id": DRAFT_ID, "delivery_time": int(time.time()) + 3600},
+    "cancel_scheduled_send": lambda box: {"mail_id": box.schedule({"sendDate": "2030-01-01T09:00:00Z"}, DRAFT_ID)["id"]},
+    "delete_email": {"mail_id": MAIL_ID},
+    "move_email": {"mail_id": MAIL_ID, "folder_id": "archive"},
+    "copy_email": {"mail_id": MAIL_ID, "folder_id": "archive"},
+    "update_email_flags": {"mail_id": MAIL_ID, "is_flagged": True},
+    "mark_as_spam": {"mail_id": MAIL_ID},
+    "get_label": {"label_id": "label-1"},
+    "create_label": {"name": "Benchmark"},
+    "update_label": {"label_id": "label-1", "name": "Renamed"},
+    "delete_label": {"label_id": "label-5"},
+    "add_label_to_email": {"mail_id": MAIL_ID, "label_id": "label-1"},
+    "remove_label_from_email": lambda box: box.add_label(MAIL_ID, "label-1") and {"mail_id": MAIL_ID,
+                                                                                  "label_id": "label-1"},
+    "add_label_by_name": {"mail_id": MAIL_ID, "label_name": "Work"},
+    "get_email_source": {"mail_id": MAIL_ID, "max_bytes": 64 * 1024},
+    "get_email_headers": {"mail_id": MAIL_ID},
+    "create_folder": {"name": "Benchmark"},
+    "update_folder": lambda box: {"folder_id": box.create_folder({"name": "Old"})["id"], "name": "New"},
+    "delete_folder": lambda box: {"folder_id": box.create_folder({"name": "Old"})["id"]},
+    # Settings
+    "update_account_settings": {"settings": {"language": "en"}},
+    "create_signature": {"name": "Benchmark", "content_html": "<p>Regards</p>"},
+    "update_signature": lambda box: {"signature_id": next(iter(box.collections["account/signatures"])),
+                                     "name": "Renamed"},
+    "delete_signature": lambda box: {"signature_id": next(iter(box.collections["account/signatures"]))},
+    "set_vacation_reply": {"enabled": True, "subject": "Away", "message": "Back on Monday."},
+    "update_contact_info": {"first_name": "Bench"},
+    "save_ui_settings": {"settings_data": "{\"theme\": \"dark\"}"},
+    # Filters
+    "update_spam_settings": {"whitelist_include_addressbook": False},
+    "add_to_whitelist": {"email_address": "friend@example.org"},
+    "remove_from_whitelist": lambda box: {"whitelist_id": next(iter(box.collections["account/avas/whitelist"]))},
+    "add_to_blacklist": {"email_address": "spammer@bulk.example"},
+    "remove_from_blacklist": lambda box: {"blacklist_id": next(iter(box.collections["account/avas/blacklist"]))},
+    "bulk_update_whitelist": lambda box: {"add_emails": ["a@example.org", "b@example.org"],
+                                          "remove_ids": [next(iter(box.collections["account/avas/whitelist"]))]},
+    "bulk_update_blacklist": lambda box: {"add_emails": ["c@bulk.example"],
+                                          "remove_ids": [next(iter(box.collections["account/avas/blacklist"]))]},
+    # Security
+    "create_temporary_alias": {"days_valid": 7},
+    "delete_temporary_alias": lambda box: {"alias_id": next(iter(box.collections["account/temporaryaliases"]))},
+    "change_password": {"new_password": "N3w-Bench-Passw0rd!"},
+}
+
+
+class MockThread:
+    """Run the mock on its own event loop so its CPU time isn't charged to the tools."""
+
+    def __init__(self, mock: MockAxigen):
+        self.mock = mock
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+
+    def __enter__(self) -> MockAxigen:
+        self.thread.start()
+        asyncio.run_coroutine_threadsafe(self.mock.start(), self.loop).result()
+        return self.mock
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        asyncio.run_coroutine_threadsafe(self.mock.stop(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
+
+def succeeded(result) -> bool:
+    if result.is_error:
+        return False
+    payload = result.structured_content
+    if isinstance(payload, dict) and "result" in payload and len(payload) == 1:
+        payload = payload["result"]
+    return not (isinstance(payload, dict) and payload.get("success") is False)
+
+
+async def measure_tool(client: Client, mock: MockAxigen, name: str, parameters: set, repeat: int) -> Dict[str, Any]:
+    samples = []
+    for run in range(repeat):
+        account = f"{name.replace('_', '-')}-{run}@example.com"
+        spec = TOOL_ARGS.get(name, {})
+        arguments = spec(mock.mailbox(account)) if callable(spec) else dict(spec)
+        await get_session_cache().get_session(account, PASSWORD, mock.url).authenticate()
+
+        stats = dict(mock.stats)
+        routes = dict(mock.route_stats)
+        cpu_started = time.thread_time()
+        started = time.perf_counter()
+        credentials = {"email": account, "password": PASSWORD, "server_url": mock.url}
+        try:
+            result = await client.call_tool(
+                name, {**{key: value for key, value in credentials.items() if key in parameters}, **arguments},
+                raise_on_error=False
+            )
+            ok = succeeded(result)
+        except Exception:
+            # e.g. an error result that doesn't match the tool's output schema
+            ok = False
+        wall = time.perf_counter() - started
+        cpu = time.thread_time() - cpu_started
+
+        samples.append({
+            "ok": ok,
+            "calls": mock.stats["requests"] - stats.get("requests", 0),
+            "routes": {route: count - routes.get(route, 0) for route, count in mock.route_stats.items()
+                       if count > routes.get(route, 0)},
+            "request_bytes": mock.stats["bytes_received"] - stats.get("bytes_received", 0),
+            "response_bytes": mock.stats["bytes_sent"] - stats.get("bytes_sent", 0),
+            "wall_ms": wall * 1000,
+            "cpu_ms": cpu * 1000,
+        })
+
+    first = samples[0]
+    return {
+        "ok": all(sample["ok"] for sample in samples),
+        "calls": max(sample["calls"] for sample in samples),
+        "routes": dict(sorted(first["routes"].items())),
+        "request_bytes": int(statistics.median(sample["request_bytes"] for sample in samples)),
+        "response_bytes": int(statistics.median(sample["response_bytes"] for sample in samples)),
+        "wall_ms": round(statistics.median(sample["wall_ms"] for sample in samples), 2),
+        "cpu_ms": round(statistics.median(sample["cpu_ms"] for sample in samples), 2),
+    }
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], byte_tolerance: float):
+    """Print differences from the baseline and return the number of regressions."""
+    regressions = 0
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            print(f"  new        {name}: {result['calls']} calls")
+            continue
+        notes = []
+        if result["calls"] > before["calls"]:
+            notes.append(f"calls {before['calls']} -> {result['calls']}")
+        elif result["calls"] < before["calls"]:
+            print(f"  improved   {name}: calls {before['calls']} -> {result['calls']}")
+        for key in ("request_bytes", "response_bytes"):
+            if result[key] > before[key] * (1 + byte_tolerance) + 256:
+                notes.append(f"{key} {before[key]} -> {result[key]}")
+        if before["ok"] and not result["ok"]:
+            notes.append("now fails")
+        if notes:
+            regressions += 1
+            print(f"  REGRESSION {name}: {', '.join(notes)}")
+        if result["cpu_ms"] > before["cpu_ms"] * 2 + 1:
+            # Timing depends on the machine, so it is reported but never fails the run
+            print(f"  slower     {name}: cpu {before['cpu_ms']:.2f}ms -> {result['cpu_ms']:.2f}ms")
+    for name in baseline.keys() - results.keys():
+        print(f"  missing    {name}")
+    return regressions
+
+
+async def run(args) -> int:
+    tools = {tool.name: set(tool.parameters.get("properties", {})) for tool in await gateway.mcp.list_tools()}
+    if args.tools:
+        tools = {name: parameters for name, parameters in tools.items() if name in args.tools}
+
+    results: Dict[str, Dict[str, Any]] = {}
+    with MockThread(MockAxigen(latency=args.latency, source_bytes=256 * 1024, mailbox_size=200)) as mock:
+        async with Client(gateway.mcp) as client:
+            # Warm up imports and the connection pool before measuring
+            await client.call_tool("get_account_info", {"email": "warmup@example.com", "password": PASSWORD,
+                                                        "server_url": mock.url}, raise_on_error=False)
+            for name, parameters in tools.items():
+                results[name] = await measure_tool(client, mock, name, parameters, args.repeat)
+            await get_session_cache().close_all()
+
+    print(f"{'tool':<26} {'ok':<3} {'calls':>5} {'req B':>6} {'resp B':>7} {'wall ms':>8} {'cpu ms':>7}  endpoints")
+    for name, result in results.items():
+        routes = ", ".join(f"{route}" + (f" x{count}" if count > 1 else "")
+                           for route, count in result["routes"].items())
+        print(f"{name:<26} {'yes' if result['ok'] else 'NO':<3} {result['calls']:>5} {result['request_bytes']:>6} "
+              f"{result['response_bytes']:>7} {result['wall_ms']:>8.2f} {result['cpu_ms']:>7.2f}  {routes}")
+    print(f"{len(results)} tools, {sum(r['calls'] for r in results.values())} upstream calls, "
+          f"{sum(not r['ok'] for r in results.values())} failed")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2) + "\n")
+    if args.update_baseline:
+        stored = json.loads(args.baseline.read_text()) if args.tools and args.baseline.exists() else {}
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps({**stored, **results}, indent=2, sort_keys=True) + "\n")
+        print(f"baseline written to {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"no baseline at {args.baseline}; run with --update-baseline to create one")
+        return 0
+    baseline = json.loads(args.baseline.read_text())
+    if args.tools:
+        baseline = {name: value for name, value in baseline.items() if name in results}
+    print(f"compared with {args.baseline}:")
+    regressions = compare(results, baseline, args.byte_tolerance)
+    print(f"{regressions} regression(s)")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tools", nargs="*", help="only these tools (default: all)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.0, help="mock latency per API request")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--byte-tolerance", type=float, default=0.1,
+                        help="fractional growth in bytes allowed before it counts as a regression")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+"""
+Benchmark Helpers
+=================
+Shared plumbing for the scripts in this directory: import path setup for the
+server packages and small statistics helpers.
+"""
+
+import sys
+from pathlib import Path
+from typing import List
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def use_server(name: str = "email") -> None:
+    """Put fastmcp-axigen-<name> on sys.path so `src.utils` resolves to it."""
+    server_dir = str(REPO_ROOT / f"fastmcp-axigen-{name}")
+    if server_dir not in sys.path:
+        sys.path.insert(0, server_dir)
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples (0 if empty)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
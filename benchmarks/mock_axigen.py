@@ -0,0 +1,1084 @@
+"""
+Mock Axigen REST Server
+=======================
+In-process aiohttp stand-in for the Axigen REST API, used by the benchmarks.
+Implements every endpoint the four MCP servers call, backed by a seeded
+synthetic mailbox per account, with configurable latency, error and 429
+injection. Counts logins and requests so benchmarks can assert on upstream
+traffic.
+
+Run standalone with:
+    python benchmarks/mock_axigen.py --port 8080
+"""
+
+import argparse
+import asyncio
+import base64
+import random
+import re
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from aiohttp import web
+
+
+FIRST_NAMES = ["alice", "bob", "carol", "dave", "erin", "frank", "grace", "heidi", "ivan", "judy"]
+DOMAINS = ["example.com", "example.org", "corp.example", "mail.example.net"]
+WORDS = ("quarterly report invoice meeting agenda follow up project update review draft "
+         "contract schedule budget proposal feedback release notes travel plans").split()
+
+
+def make_mail(rng: random.Random, index: int, folder_id: str = "inbox", mail_id: Optional[str] = None) -> Dict[str, Any]:
+    """Build one synthetic MailInstance shaped like the Axigen schema."""
+    sender = f"{rng.choice(FIRST_NAMES)}@{rng.choice(DOMAINS)}"
+    recipient = f"{rng.choice(FIRST_NAMES)}@{rng.choice(DOMAINS)}"
+    subject = " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 8))).capitalize()
+    snippet = " ".join(rng.choice(WORDS) for _ in range(rng.randint(15, 30)))
+    return {
+        "id": mail_id or f"{folder_id}-{index:06d}",
+        "folderId": folder_id,
+        "size": rng.randint(1_000, 250_000),
+        "from": f"\"{sender.split('@')[0].title()}\" <{sender}>",
+        "to": recipient,
+        "cc": "",
+        "replyTo": sender,
+        "replyToAll": recipient,
+        "sender": sender,
+        "messageId": f"<{uuid.UUID(int=rng.getrandbits(128)).hex}@{sender.split('@')[1]}>",
+        "subject": subject,
+        "snippet": snippet,
+        "date": str(1_700_000_000 + index * 37),
+        "isUnread": rng.random() < 0.3,
+        "isFlagged": rng.random() < 0.05,
+        "isDraft": folder_id == "drafts",
+        "refwFlags": rng.choice(["", "", "", "re", "fw"]),
+        "isDeleted": False,
+        "hasAttachments": rng.random() < 0.2,
+        "importance": rng.choice(["normal", "normal", "normal", "low", "high"]),
+        "labelIds": [f"label-{rng.randint(1, 5)}"] if rng.random() < 0.2 else [],
+    }
+
+
+def make_mail_page(count: int = 500, seed: int = 0, folder_id: str = "inbox") -> Dict[str, Any]:
+    """Build a GET /mails response page with count synthetic mails."""
+    rng = random.Random(seed)
+    items = [make_mail(rng, index, folder_id) for index in range(count)]
+    return {
+        "syncToken": uuid.UUID(int=rng.getrandbits(128)).hex,
+        "totalItems": count,
+        "sortInfo": {"field": "date", "direction": "DESC", "activeRowIndex": 0},
+        "items": items,
+    }
+
+
+# ============================================================================
+# Synthetic Mailbox
+# ============================================================================
+
+# System folders and their size relative to the inbox
+SYSTEM_FOLDERS = (("Inbox", 1.0), ("Sent", 0.4), ("Drafts", 0.02), ("Trash", 0.1), ("Spam", 0.05), ("Archive", 0.6))
+# Seeded mails in system folder n have numeric IDs n * stride + 1, ...
+FOLDER_ID_STRIDE = 100_000
+FIRST_NEW_MAIL_ID = 10_000_000
+UNREAD_SHARE = 0.3
+MUTABLE_MAIL_FIELDS = ("isUnread", "isFlagged", "importance", "labelIds")
+DRAFT_FIELDS = ("to", "cc", "bcc", "replyTo", "subject", "bodyText", "bodyHtml", "from")
+
+
+class MockError(Exception):
+    """Raised by mailbox operations; turned into a JSON error response."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def destination(body: Dict[str, Any]) -> str:
+    """Target folder of a move or copy request."""
+    return body.get("destinationFolderId") or body.get("folderId", "")
+
+
+def envelope(handler):
+    """
+    Wrap a route in the {"success": true, "data": ...} envelope Axigen puts
+    around actions (create, send, move, label, update, delete) and mail
+    bodies; the tools check "success" on these before reading the data.
+    """
+    def wrapped(request, box, body):
+        result = handler(request, box, body)
+        return {"success": True} if result is None else {"success": True, "data": result}
+    return wrapped
+
+
+def _iso(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class Mailbox:
+    """
+    Seeded synthetic mailbox for one account.
+
+    The same account and seed always produce the same folders, labels and
+    mails, so runs are reproducible. Folder contents are generated on first
+    access (folder counts are known before that) and are then changed by the
+    API calls: moves, deletes, flags, drafts and sends. Every change bumps a
+    version that doubles as the sync token for the delta endpoints.
+
+    Args:
+        account: Email address the mailbox belongs to
+        seed: Seed shared by every mailbox of one mock
+        size: Mails in the inbox; other folders are sized relative to it
+    """
+
+    def __init__(self, account: str, seed: int = 0, size: int = 500):
+        self.account = account
+        self.seed = seed
+        self.size = size
+        self.domain = account.partition("@")[2] or "example.com"
+        self.version = 0
+        # (version, kind, action, id, folderId) with kind "mail" or "folder"
+        self.changes: List[Tuple[int, str, str, str, str]] = []
+        self.folders: Dict[str, Dict[str, Any]] = {}
+        self.folder_mails: Dict[str, Dict[str, None]] = {}
+        self.mails: Dict[str, Dict[str, Any]] = {}
+        self.bodies: Dict[str, str] = {}
+        self._planned: Dict[str, int] = {}
+        self._next_id = FIRST_NEW_MAIL_ID
+        self._ids = random.Random(f"{seed}:{account}:ids")
+
+        for position, (name, share) in enumerate(SYSTEM_FOLDERS):
+            folder_id = name.lower()
+            self.folders[folder_id] = {
+                "id": folder_id, "name": name, "parentId": None, "type": "mails",
+                "isSystem": True, "position": position,
+            }
+            self._planned[folder_id] = max(1, int(size * share)) if size else 0
+
+        rng = random.Random(f"{seed}:{account}:account")
+        self.labels: Dict[str, Dict[str, Any]] = {
+            f"label-{n}": {"id": f"label-{n}", "name": name, "color": color}
+            for n, (name, color) in enumerate(
+                (("Work", "#1e88e5"), ("Personal", "#43a047"), ("Finance", "#fdd835"),
+                 ("Travel", "#8e24aa"), ("Follow up", "#e53935")), 1)
+        }
+        now = datetime.now(timezone.utc)
+        local = account.partition("@")[0]
+        self.info = {
+            "emailAddress": account, "displayName": local.title(), "domain": self.domain,
+            "quota": {"used": rng.randint(10, 900) * 2 ** 20, "total": 2 ** 30},
+            "lastLogin": _iso(now - timedelta(hours=rng.randint(1, 72))),
+        }
+        self.aliases = [
+            {"id": "alias-1", "type": "primary", "emailAddress": account},
+            {"id": "alias-2", "type": "alias", "emailAddress": f"{local}.alias@{self.domain}"},
+        ]
+        # Singleton resources: GET returns them, PUT replaces and PATCH merges
+        self.resources: Dict[str, Dict[str, Any]] = {
+            "account/avas": {"whitelistIncludeAddressBook": True, "blacklistExcludeAddressBook": False,
+                             "spamAction": "moveToSpam"},
+            "account/settings": {"language": "en", "timezone": "UTC", "dateFormat": "dd/MM/yyyy",
+                                 "pageSize": 50},
+            "account/settings/ui": {"theme": "light", "readingPane": "right"},
+            "account/settings/client": {"syncDays": 30},
+            "account/contactinfo": {"firstName": local.title(), "lastName": "Example", "company": "Example Ltd",
+                                    "phone": f"+1 555 01{rng.randint(10, 99)}"},
+            "account/vacation": {"enabled": False, "subject": "Out of office", "message": "Back soon.",
+                                 "startDate": None, "endDate": None},
+        }
+        # Collections: GET lists, POST creates, PUT/PATCH/DELETE by ID
+        self.collections: Dict[str, Dict[str, Dict[str, Any]]] = {
+            "account/avas/whitelist": {},
+            "account/avas/blacklist": {},
+            "account/signatures": {},
+            "account/temporaryaliases": {},
+        }
+        for n in range(3):
+            self.create("account/avas/whitelist", {"emailAddress": f"{rng.choice(FIRST_NAMES)}@{rng.choice(DOMAINS)}"})
+        self.create("account/avas/blacklist", {"emailAddress": f"spam{rng.randint(1, 99)}@bulk.example"})
+        self.create("account/signatures", {"name": "Default", "content": f"-- \n{local.title()}", "isDefault": True})
+        for days in (-2, 3, 10):
+            alias = self.create("account/temporaryaliases", {})
+            alias["expireDate"] = _iso(now + timedelta(days=days))
+        self.scheduled: Dict[str, Dict[str, Any]] = {}
+        self.search_results: Dict[str, List[str]] = {}
+
+    # ------------------------------------------------------------------
+    # Changes
+    # ------------------------------------------------------------------
+
+    def _changed(self, kind: str, action: str, item_id: str, folder_id: str = ""):
+        self.version += 1
+        self.changes.append((self.version, kind, action, item_id, folder_id))
+
+    def _new_id(self) -> str:
+        self._next_id += 1
+        return str(self._next_id)
+
+    def _token(self, prefix: str) -> str:
+        """Seeded ID for folders, labels, searches and account resources."""
+        return f"{prefix}-{self._ids.getrandbits(48):012x}"
+
+    # ------------------------------------------------------------------
+    # Folders
+    # ------------------------------------------------------------------
+
+    def _ensure_folder(self, folder_id: str):
+        """Generate a system folder's seeded mails on first access."""
+        if folder_id in self.folder_mails:
+            return
+        if folder_id not in self.folders:
+            raise MockError(404, f"Folder {folder_id} not found")
+        mails: Dict[str, None] = {}
+        count = self._planned.get(folder_id, 0)
+        if count:
+            rng = random.Random(f"{self.seed}:{self.account}:{folder_id}")
+            base = self.folders[folder_id]["position"] * FOLDER_ID_STRIDE
+            unread_from = count - int(count * UNREAD_SHARE) if folder_id == "inbox" else count
+            for index in range(count):
+                mail = make_mail(rng, index, folder_id, mail_id=str(base + index + 1))
+                # The newest inbox mails are the unread ones, so counts are known up front
+                mail["isUnread"] = index >= unread_from
+                self.mails[mail["id"]] = mail
+                mails[mail["id"]] = None
+        self.folder_mails[folder_id] = mails
+
+    def folder_counts(self, folder_id: str) -> Tuple[int, int]:
+        """(total, unread) for a folder, without generating it."""
+        if folder_id not in self.folder_mails:
+            count = self._planned.get(folder_id, 0)
+            return count, int(count * UNREAD_SHARE) if folder_id == "inbox" else 0
+        ids = self.folder_mails[folder_id]
+        return len(ids), sum(1 for mail_id in ids if self.mails[mail_id]["isUnread"])
+
+    def folder(self, folder_id: str) -> Dict[str, Any]:
+        if folder_id not in self.folders:
+            raise MockError(404, f"Folder {folder_id} not found")
+        total, unread = self.folder_counts(folder_id)
+        return {**self.folders[folder_id], "totalCount": total, "unreadCount": unread}
+
+    def list_folders(self) -> Dict[str, Any]:
+        return {"items": [self.folder(folder_id) for folder_id in self.folders], "syncToken": str(self.version)}
+
+    def create_folder(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        name = body.get("name")
+        if not name:
+            raise MockError(400, "Folder name is required")
+        parent_id = body.get("parentId")
+        if parent_id is not None and parent_id not in self.folders:
+            raise MockError(404, f"Folder {parent_id} not found")
+        folder_id = self._token("folder")
+        self.folders[folder_id] = {"id": folder_id, "name": name, "parentId": parent_id,
+                                   "type": body.get("type", "mails"), "isSystem": False,
+                                   "position": len(self.folders)}
+        self.folder_mails[folder_id] = {}
+        self._changed("folder", "created", folder_id)
+        return self.folder(folder_id)
+
+    def update_folder(self, folder_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        folder = self.folders.get(folder_id)
+        if folder is None:
+            raise MockError(404, f"Folder {folder_id} not found")
+        if folder["isSystem"] and "name" in body:
+            raise MockError(403, "System folders can't be renamed")
+        for key in ("name", "parentId"):
+            if key in body:
+                folder[key] = body[key]
+        self._changed("folder", "updated", folder_id)
+        return self.folder(folder_id)
+
+    def delete_folder(self, folder_id: str):
+        folder = self.folders.get(folder_id)
+        if folder is None:
+            raise MockError(404, f"Folder {folder_id} not found")
+        if folder["isSystem"]:
+            raise MockError(403, "System folders can't be deleted")
+        for mail_id in list(self.folder_mails.get(folder_id, ())):
+            self._remove_mail(mail_id)
+        self.folder_mails.pop(folder_id, None)
+        del self.folders[folder_id]
+        self._changed("folder", "deleted", folder_id)
+
+    # ------------------------------------------------------------------
+    # Mails
+    # ------------------------------------------------------------------
+
+    def mail(self, mail_id: str) -> Dict[str, Any]:
+        mail = self.mails.get(mail_id)
+        if mail is None and mail_id.isdigit() and int(mail_id) < FIRST_NEW_MAIL_ID:
+            position = (int(mail_id) - 1) // FOLDER_ID_STRIDE
+            if 0 <= position < len(SYSTEM_FOLDERS):
+                self._ensure_folder(SYSTEM_FOLDERS[position][0].lower())
+                mail = self.mails.get(mail_id)
+        if mail is None:
+            raise MockError(404, f"Mail {mail_id} not found")
+        return mail
+
+    def list_mails(self, query) -> Dict[str, Any]:
+        folder_id = query.get("folderId", "inbox")
+        if folder_id in self.search_results:
+            ids = [mail_id for mail_id in self.search_results[folder_id] if mail_id in self.mails]
+        else:
+            self._ensure_folder(folder_id)
+            ids = list(self.folder_mails[folder_id])
+        mails = [self.mails[mail_id] for mail_id in ids]
+        field = query.get("sort", "date")
+        direction = query.get("dir", "DESC").upper()
+        if field == "date":
+            mails.sort(key=lambda mail: int(mail["date"]), reverse=direction == "DESC")
+        else:
+            mails.sort(key=lambda mail: str(mail.get(field, "")), reverse=direction == "DESC")
+        start = int(query.get("start", 0))
+        limit = int(query.get("limit", 100))
+        return {
+            "syncToken": str(self.version),
+            "totalItems": len(mails),
+            "sortInfo": {"field": field, "direction": direction, "activeRowIndex": start},
+            "items": mails[start:start + limit],
+        }
+
+    def _add_mail(self, folder_id: str, fields: Dict[str, Any]) -> Dict[str, Any]:
+        self._ensure_folder(folder_id)
+        mail_id = self._new_id()
+        to = fields.get("to") or ""
+        if isinstance(to, list):
+            to = ", ".join(to)
+        body = fields.get("bodyText") or fields.get("bodyHtml") or ""
+        mail = {
+            "id": mail_id, "folderId": folder_id, "size": len(body) + 800,
+            "from": fields.get("from") or self.account, "to": to, "cc": fields.get("cc") or "",
+            "replyTo": fields.get("replyTo") or self.account, "replyToAll": to, "sender": self.account,
+            "messageId": f"<{uuid.uuid4().hex}@{self.domain}>", "subject": fields.get("subject", ""),
+            "snippet": body[:200], "date": str(int(time.time())), "isUnread": False, "isFlagged": False,
+            "isDraft": folder_id == "drafts", "refwFlags": "", "isDeleted": False,
+            "hasAttachments": False, "importance": fields.get("importance", "normal"), "labelIds": [],
+        }
+        self.mails[mail_id] = mail
+        self.bodies[mail_id] = body
+        self.folder_mails[folder_id][mail_id] = None
+        self._changed("mail", "created", mail_id, folder_id)
+        return mail
+
+    def _remove_mail(self, mail_id: str):
+        mail = self.mails.pop(mail_id)
+        self.bodies.pop(mail_id, None)
+        self.folder_mails[mail["folderId"]].pop(mail_id, None)
+        self._changed("mail", "deleted", mail_id, mail["folderId"])
+
+    def update_mail(self, mail_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        mail = self.mail(mail_id)
+        for key in MUTABLE_MAIL_FIELDS:
+            if key in body:
+                mail[key] = body[key]
+        self._changed("mail", "updated", mail_id, mail["folderId"])
+        return mail
+
+    def move_mail(self, mail_id: str, folder_id: str) -> Dict[str, Any]:
+        mail = self.mail(mail_id)
+        self._ensure_folder(folder_id)
+        self.folder_mails[mail["folderId"]].pop(mail_id, None)
+        self._changed("mail", "deleted", mail_id, mail["folderId"])
+        mail["folderId"] = folder_id
+        mail["isDraft"] = folder_id == "drafts"
+        self.folder_mails[folder_id][mail_id] = None
+        self._changed("mail", "created", mail_id, folder_id)
+        return mail
+
+    def copy_mail(self, mail_id: str, folder_id: str) -> Dict[str, Any]:
+        source = self.mail(mail_id)
+        self._ensure_folder(folder_id)
+        copy_id = self._new_id()
+        self.mails[copy_id] = {**source, "id": copy_id, "folderId": folder_id, "labelIds": list(source["labelIds"])}
+        if mail_id in self.bodies:
+            self.bodies[copy_id] = self.bodies[mail_id]
+        self.folder_mails[folder_id][copy_id] = None
+        self._changed("mail", "created", copy_id, folder_id)
+        return self.mails[copy_id]
+
+    def delete_mail(self, mail_id: str):
+        """Move to trash, or delete for good if already there."""
+        mail = self.mail(mail_id)
+        if mail["folderId"] == "trash":
+            self._remove_mail(mail_id)
+        else:
+            self.move_mail(mail_id, "trash")
+
+    def add_label(self, mail_id: str, label_id: str) -> Dict[str, Any]:
+        if label_id not in self.labels:
+            raise MockError(404, f"Label {label_id} not found")
+        mail = self.mail(mail_id)
+        if label_id not in mail["labelIds"]:
+            mail["labelIds"] = mail["labelIds"] + [label_id]
+            self._changed("mail", "updated", mail_id, mail["folderId"])
+        return mail
+
+    def remove_label(self, mail_id: str, label_id: str):
+        mail = self.mail(mail_id)
+        if label_id not in mail["labelIds"]:
+            raise MockError(404, f"Label {label_id} not on mail {mail_id}")
+        mail["labelIds"] = [existing for existing in mail["labelIds"] if existing != label_id]
+        self._changed("mail", "updated", mail_id, mail["folderId"])
+
+    def body(self, mail_id: str) -> str:
+        mail = self.mail(mail_id)
+        if mail_id not in self.bodies:
+            rng = random.Random(f"{self.seed}:{mail_id}")
+            paragraphs = [" ".join(rng.choice(WORDS) for _ in range(rng.randint(30, 80))).capitalize() + "."
+                          for _ in range(rng.randint(2, 6))]
+            self.bodies[mail_id] = mail["snippet"] + "\n\n" + "\n\n".join(paragraphs)
+        return self.bodies[mail_id]
+
+    def headers(self, mail_id: str) -> List[Dict[str, str]]:
+        mail = self.mail(mail_id)
+        date = datetime.fromtimestamp(int(mail["date"]), timezone.utc)
+        return [
+            {"name": "From", "value": mail["from"]},
+            {"name": "To", "value": mail["to"]},
+            {"name": "Subject", "value": mail["subject"]},
+            {"name": "Date", "value": date.strftime("%a, %d %b %Y %H:%M:%S +0000")},
+            {"name": "Message-ID", "value": mail["messageId"]},
+            {"name": "MIME-Version", "value": "1.0"},
+            {"name": "Content-Type", "value": "text/plain; charset=utf-8"},
+        ]
+
+    def search(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a search and park the hits in a temporary folder, like Axigen does."""
+        folder_ids = body.get("folderIds") or ["inbox"]
+        if body.get("recursive"):
+            folder_ids = folder_ids + [folder_id for folder_id, folder in self.folders.items()
+                                       if folder["parentId"] in folder_ids]
+        hits = []
+        for folder_id in folder_ids:
+            self._ensure_folder(folder_id)
+            hits.extend(mail_id for mail_id in self.folder_mails[folder_id]
+                        if all(self._matches(self.mails[mail_id], criterion) for criterion in body.get("query", [])))
+        search_id = self._token("search")
+        self.search_results[search_id] = hits
+        return {"folderId": search_id, "totalItems": len(hits)}
+
+    @staticmethod
+    def _matches(mail: Dict[str, Any], criterion: Dict[str, Any]) -> bool:
+        field = str(criterion.get("field", "")).lower()
+        value = str(criterion.get("value", "")).lower()
+        if field in ("unread", "flagged", "hasattachments"):
+            key = {"unread": "isUnread", "flagged": "isFlagged", "hasattachments": "hasAttachments"}[field]
+            matched = bool(mail[key]) == (value in ("true", "1", "yes"))
+        elif field in ("body", "text"):
+            matched = value in mail["snippet"].lower()
+        elif field in ("any", "all"):
+            matched = any(value in str(mail[key]).lower() for key in ("from", "to", "subject", "snippet"))
+        else:
+            matched = value in str(mail.get(field, "")).lower()
+        return matched != bool(criterion.get("negate"))
+
+    def counters(self, folder_id: Optional[str] = None) -> Dict[str, Any]:
+        folder_ids = [folder_id] if folder_id else list(self.folders)
+        items = []
+        for current in folder_ids:
+            if current not in self.folders:
+                raise MockError(404, f"Folder {current} not found")
+            total, unread = self.folder_counts(current)
+            items.append({"folderId": current, "totalCount": total, "unreadCount": unread})
+        return {"items": items}
+
+    def delta(self, kind: str, sync_token: Optional[str], folder_id: Optional[str] = None) -> Dict[str, Any]:
+        """Changes since sync_token; without a valid token, everything is reported as created."""
+        if kind == "mail" and folder_id:
+            self._ensure_folder(folder_id)
+        if not sync_token or not sync_token.isdigit() or int(sync_token) > self.version:
+            if kind == "folder":
+                created = [self.folder(current) for current in self.folders]
+            else:
+                ids = self.folder_mails[folder_id] if folder_id else self.mails
+                created = [self.mails[mail_id] for mail_id in ids]
+            return {"syncToken": str(self.version), "created": created, "updated": [], "deleted": []}
+        latest: Dict[str, str] = {}
+        for version, change_kind, action, item_id, change_folder in self.changes:
+            if version <= int(sync_token) or change_kind != kind:
+                continue
+            if folder_id and change_folder != folder_id:
+                continue
+            # A create followed by updates is still a create
+            latest[item_id] = "created" if latest.get(item_id) == "created" and action == "updated" else action
+        result = {"syncToken": str(self.version), "created": [], "updated": [], "deleted": []}
+        store = self.mails if kind == "mail" else self.folders
+        for item_id, action in latest.items():
+            if action == "deleted" or item_id not in store:
+                result["deleted"].append(item_id)
+            elif kind == "mail" and folder_id and store[item_id]["folderId"] != folder_id:
+                result["deleted"].append(item_id)
+            else:
+                result[action].append(self.folder(item_id) if kind == "folder" else store[item_id])
+        return result
+
+    # ------------------------------------------------------------------
+    # Drafts and sending
+    # ------------------------------------------------------------------
+
+    def create_draft(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        mail = self._add_mail("drafts", body)
+        return {"id": mail["id"], "mailId": mail["id"], "folderId": "drafts"}
+
+    def update_draft(self, draft_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        mail = self.mail(draft_id)
+        if not mail["isDraft"]:
+            raise MockError(400, f"Mail {draft_id} is not a draft")
+        for key in DRAFT_FIELDS:
+            if key in body:
+                mail[key] = body[key]
+        if "bodyText" in body or "bodyHtml" in body:
+            self.bodies[draft_id] = body.get("bodyText") or body.get("bodyHtml") or ""
+            mail["snippet"] = self.bodies[draft_id][:200]
+        self._changed("mail", "updated", draft_id, mail["folderId"])
+        return {"id": draft_id, "mailId": draft_id}
+
+    def send(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        if not body.get("to"):
+            raise MockError(400, "At least one recipient is required")
+        mail = self._add_mail("sent", body)
+        return {"mailId": mail["id"], "processingId": uuid.uuid4().hex}
+
+    def send_draft(self, draft_id: str) -> Dict[str, Any]:
+        mail = self.mail(draft_id)
+        if not mail["isDraft"]:
+            raise MockError(400, f"Mail {draft_id} is not a draft")
+        self.move_mail(draft_id, "sent")
+        mail["date"] = str(int(time.time()))
+        return {"mailId": draft_id, "processingId": uuid.uuid4().hex}
+
+    def schedule(self, body: Dict[str, Any], draft_id: Optional[str] = None) -> Dict[str, Any]:
+        if draft_id is not None:
+            self.mail(draft_id)
+        scheduled_id = self._token("scheduled")
+        self.scheduled[scheduled_id] = {"id": scheduled_id, "draftId": draft_id, **body}
+        return {"id": scheduled_id, "mailId": scheduled_id, "sendDate": body.get("sendDate")}
+
+    def cancel_scheduled(self, scheduled_id: str):
+        if self.scheduled.pop(scheduled_id, None) is None:
+            raise MockError(404, f"Scheduled mail {scheduled_id} not found")
+
+    def batch(self, action: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        """batch/mails/{action}: apply one operation to many mails."""
+        operations = {
+            "move": lambda mail_id: self.move_mail(mail_id, destination(body)),
+            "copy": lambda mail_id: self.copy_mail(mail_id, destination(body)),
+            "delete": self.delete_mail,
+            "spam": lambda mail_id: self.move_mail(mail_id, "spam"),
+            "update": lambda mail_id: self.update_mail(mail_id, body),
+            "flag": lambda mail_id: self.update_mail(mail_id, {"isFlagged": body.get("isFlagged", True)}),
+            "read": lambda mail_id: self.update_mail(mail_id, {"isUnread": not body.get("isRead", True)}),
+        }
+        operation = operations.get(action)
+        if operation is None:
+            raise MockError(404, f"Unknown batch operation {action}")
+        items = []
+        for mail_id in body.get("ids") or body.get("mailIds") or []:
+            try:
+                operation(mail_id)
+                items.append({"id": mail_id, "status": 200})
+            except MockError as e:
+                items.append({"id": mail_id, "status": e.status, "error": e.message})
+        return {"items": items}
+
+    # ------------------------------------------------------------------
+    # Labels
+    # ------------------------------------------------------------------
+
+    def label(self, label_id: str) -> Dict[str, Any]:
+        if label_id not in self.labels:
+            raise MockError(404, f"Label {label_id} not found")
+        return self.labels[label_id]
+
+    def create_label(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        if not body.get("name"):
+            raise MockError(400, "Label name is required")
+        label_id = self._token("label")
+        self.labels[label_id] = {"id": label_id, "name": body["name"], "color": body.get("color", "#757575")}
+        return self.labels[label_id]
+
+    def update_label(self, label_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        label = self.label(label_id)
+        for key in ("name", "color"):
+            if key in body:
+                label[key] = body[key]
+        return label
+
+    def delete_label(self, label_id: str):
+        self.label(label_id)
+        del self.labels[label_id]
+        for mail in self.mails.values():
+            if label_id in mail["labelIds"]:
+                mail["labelIds"] = [existing for existing in mail["labelIds"] if existing != label_id]
+
+    # ------------------------------------------------------------------
+    # Account resources
+    # ------------------------------------------------------------------
+
+    def resource(self, path: str) -> Dict[str, Any]:
+        return self.resources[path]
+
+    def replace_resource(self, path: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        self.resources[path] = dict(body)
+        return self.resources[path]
+
+    def patch_resource(self, path: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        self.resources[path].update(body)
+        return self.resources[path]
+
+    def create(self, collection: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        items = self.collections[collection]
+        item_id = self._token("item")
+        item = {"id": item_id, **body}
+        if collection == "account/temporaryaliases":
+            item.setdefault("emailAddress", f"tmp-{self._ids.getrandbits(32):08x}@{self.domain}")
+            item.setdefault("type", "temporary")
+            item.setdefault("expireDate", _iso(datetime.now(timezone.utc) + timedelta(days=7)))
+        items[item_id] = item
+        return item
+
+    def update(self, collection: str, item_id: str, body: Dict[str, Any], replace: bool) -> Dict[str, Any]:
+        items = self.collections[collection]
+        if item_id not in items:
+            raise MockError(404, f"{item_id} not found")
+        items[item_id] = {"id": item_id, **body} if replace else {**items[item_id], **body}
+        return items[item_id]
+
+    def delete(self, collection: str, item_id: str):
+        if self.collections[collection].pop(item_id, None) is None:
+            raise MockError(404, f"{item_id} not found")
+
+
+# ============================================================================
+# Mock Server
+# ============================================================================
+
+class MockAxigen:
+    """
+    Axigen API mock.
+
+    Every endpoint the email, filters, security and settings servers call is
+    served from a per-account Mailbox. Requests to any other path get a 404
+    and are counted as stats["unknown_endpoints"].
+
+    Args:
+        latency: Seconds to sleep before answering any API request
+        login_latency: Seconds to sleep before answering POST /login
+        error_rate: Fraction of API requests answered with error_status
+        error_status: Status code used for injected errors (429 adds Retry-After)
+        retry_after: Retry-After seconds sent with injected 429/503 responses
+        seed: Seed for the fault-injection random generator and the mailboxes
+        compress: Compress responses when the client sends Accept-Encoding
+        accept_compressed_bodies: If False, answer gzip request bodies with 415
+        capacity: Requests served at once; the rest queue FIFO like a busy server
+        source_bytes: Size of the raw message served by GET mails/{id}/source
+        path_latency: Extra seconds for API paths matching a regex, e.g. {r"mails/[^/]+/body": 2.0}
+        slow_rate: Fraction of API requests that get slow_latency on top (a latency tail)
+        slow_latency: Extra seconds for those slow requests
+        mailbox_size: Mails in each account's inbox (other folders are smaller)
+        rate_limit: Requests per second allowed per account; excess requests
+            get 429 with a Retry-After for when a token is next free
+        accounts: Optional {email: password}; if given, other credentials get 401
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        login_latency: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        retry_after: Optional[float] = None,
+        seed: int = 0,
+        compress: bool = False,
+        accept_compressed_bodies: bool = True,
+        capacity: Optional[int] = None,
+        source_bytes: int = 25 * 1024 * 1024,
+        path_latency: Optional[Dict[str, float]] = None,
+        slow_rate: float = 0.0,
+        slow_latency: float = 0.0,
+        mailbox_size: int = 500,
+        rate_limit: Optional[float] = None,
+        accounts: Optional[Dict[str, str]] = None
+    ):
+        self.latency = latency
+        self.login_latency = login_latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.compress = compress
+        self.accept_compressed_bodies = accept_compressed_bodies
+        self.capacity = capacity
+        self._workers: Optional[asyncio.Semaphore] = None
+        self.source_bytes = source_bytes
+        self.path_latency = [(re.compile(pattern), delay) for pattern, delay in (path_latency or {}).items()]
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.mailbox_size = mailbox_size
+        self.rate_limit = rate_limit
+        self.accounts = {email.lower(): password for email, password in (accounts or {}).items()} or None
+        self._buckets: Dict[str, List[float]] = {}
+        self._source: Optional[bytes] = None
+        self.stats: Counter = Counter()
+        # Requests per route, e.g. "GET mails/{mail_id}"
+        self.route_stats: Counter = Counter()
+        # Session ID -> account email
+        self.sessions: Dict[str, str] = {}
+        self.mailboxes: Dict[str, Mailbox] = {}
+        self.peers: Set[Tuple[str, int]] = set()
+        self._runner: Optional[web.AppRunner] = None
+        self.url: Optional[str] = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def make_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._track_connections])
+        app.router.add_post("/api/v1/login", self.handle_login)
+        app.router.add_post("/api/v1/logout", self.handle_logout)
+        routes = [
+            # Mails
+            ("GET", "mails", lambda r, box, body: box.list_mails(r.query)),
+            ("POST", "mails", envelope(lambda r, box, body: box.create_draft(body))),
+            ("POST", "mails/search", lambda r, box, body: box.search(body)),
+            ("GET", "mails/delta", lambda r, box, body: box.delta("mail", r.query.get("syncToken"),
+                                                                  r.query.get("folderId"))),
+            ("GET", "mails/counters", lambda r, box, body: box.counters(r.query.get("folderId"))),
+            ("POST", "mails/send", envelope(lambda r, box, body: box.send(body))),
+            ("POST", "mails/send/schedule", lambda r, box, body: box.schedule(body)),
+            ("DELETE", "mails/send/schedule/{scheduled_id}",
+             lambda r, box, body: box.cancel_scheduled(r.match_info["scheduled_id"])),
+            ("GET", "mails/{mail_id}", self._mail),
+            ("PATCH", "mails/{mail_id}",
+             envelope(lambda r, box, body: box.update_mail(r.match_info["mail_id"], body))),
+            ("DELETE", "mails/{mail_id}", envelope(lambda r, box, body: box.delete_mail(r.match_info["mail_id"]))),
+            ("GET", "mails/{mail_id}/body", self._body),
+            ("GET", "mails/{mail_id}/headers",
+             lambda r, box, body: {"success": True, "items": box.headers(r.match_info["mail_id"])}),
+            ("GET", "mails/{mail_id}/source", self._source_stream),
+            ("POST", "mails/{mail_id}/move",
+             envelope(lambda r, box, body: box.move_mail(r.match_info["mail_id"], destination(body)))),
+            ("POST", "mails/{mail_id}/copy",
+             lambda r, box, body: box.copy_mail(r.match_info["mail_id"], destination(body))),
+            ("POST", "mails/{mail_id}/spam",
+             envelope(lambda r, box, body: box.move_mail(r.match_info["mail_id"], "spam"))),
+            ("POST", "mails/{mail_id}/labels",
+             envelope(lambda r, box, body: box.add_label(r.match_info["mail_id"], body.get("labelId", "")))),
+            ("DELETE", "mails/{mail_id}/labels/{label_id}",
+             envelope(lambda r, box, body: box.remove_label(r.match_info["mail_id"], r.match_info["label_id"]))),
+            ("POST", "batch/mails/{action}", lambda r, box, body: box.batch(r.match_info["action"], body)),
+            # Drafts
+            ("PUT", "drafts/{draft_id}", lambda r, box, body: box.update_draft(r.match_info["draft_id"], body)),
+            ("POST", "drafts/{draft_id}/send",
+             envelope(lambda r, box, body: box.send_draft(r.match_info["draft_id"]))),
+            ("POST", "drafts/{draft_id}/send/schedule",
+             lambda r, box, body: box.schedule(body, r.match_info["draft_id"])),
+            # Folders and labels
+            ("GET", "folders", lambda r, box, body: box.list_folders()),
+            ("POST", "folders", lambda r, box, body: box.create_folder(body)),
+            ("GET", "folders/delta", lambda r, box, body: box.delta("folder", r.query.get("syncToken"))),
+            ("GET", "folders/{folder_id}", lambda r, box, body: box.folder(r.match_info["folder_id"])),
+            ("GET", "folders/{folder_id}/counters",
+             lambda r, box, body: box.counters(r.match_info["folder_id"])["items"][0]),
+            ("PATCH", "folders/{folder_id}",
+             lambda r, box, body: box.update_folder(r.match_info["folder_id"], body)),
+            ("DELETE", "folders/{folder_id}",
+             envelope(lambda r, box, body: box.delete_folder(r.match_info["folder_id"]))),
+            ("GET", "labels", lambda r, box, body: {"items": list(box.labels.values())}),
+            ("POST", "labels", lambda r, box, body: box.create_label(body)),
+            ("GET", "labels/{label_id}", lambda r, box, body: box.label(r.match_info["label_id"])),
+            ("PATCH", "labels/{label_id}", lambda r, box, body: box.update_label(r.match_info["label_id"], body)),
+            ("DELETE", "labels/{label_id}",
+             envelope(lambda r, box, body: box.delete_label(r.match_info["label_id"]))),
+            # Account
+            ("GET", "account/info", lambda r, box, body: box.info),
+            ("GET", "account/aliases", lambda r, box, body: {"items": box.aliases}),
+            ("POST", "account/password/reset", lambda r, box, body: {"status": "sent"}),
+        ]
+        for path in ("account/avas", "account/settings", "account/settings/ui", "account/settings/client",
+                     "account/contactinfo", "account/vacation"):
+            routes += [
+                ("GET", path, lambda r, box, body, path=path: box.resource(path)),
+                ("PUT", path, lambda r, box, body, path=path: box.replace_resource(path, body)),
+                ("PATCH", path, lambda r, box, body, path=path: box.patch_resource(path, body)),
+                ("POST", path, lambda r, box, body, path=path: box.patch_resource(path, body)),
+            ]
+        for path in ("account/avas/whitelist", "account/avas/blacklist", "account/signatures",
+                     "account/temporaryaliases"):
+            routes += [
+                ("GET", path, lambda r, box, body, path=path: {"items": list(box.collections[path].values())}),
+                ("POST", path, lambda r, box, body, path=path: box.create(path, body)),
+                ("PUT", path + "/{item_id}",
+                 lambda r, box, body, path=path: box.update(path, r.match_info["item_id"], body, replace=True)),
+                ("PATCH", path + "/{item_id}",
+                 lambda r, box, body, path=path: box.update(path, r.match_info["item_id"], body, replace=False)),
+                ("DELETE", path + "/{item_id}",
+                 lambda r, box, body, path=path: box.delete(path, r.match_info["item_id"])),
+            ]
+        for method, path, handler in routes:
+            app.router.add_route(method, f"/api/v1/{path}", self._api(f"{method} {path}", handler))
+        app.router.add_route("*", "/api/v1/{tail:.*}", self._api("unknown", None))
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving and return the server URL (without /api/v1)."""
+        self._runner = web.AppRunner(self.make_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://{host}:{bound_port}"
+        return self.url
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
+
+    def expire_sessions(self):
+        """Invalidate every issued session so the next requests get 401."""
+        self.sessions.clear()
+
+    def mailbox(self, account: str) -> Mailbox:
+        """The seeded mailbox for an account, created on first use."""
+        account = account.lower()
+        mailbox = self.mailboxes.get(account)
+        if mailbox is None:
+            mailbox = self.mailboxes[account] = Mailbox(account, self.seed, self.mailbox_size)
+        return mailbox
+
+    # ------------------------------------------------------------------
+    # Handlers
+    # ------------------------------------------------------------------
+
+    @web.middleware
+    async def _track_connections(self, request: web.Request, handler):
+        """
+        Count distinct client connections, i.e. TCP (and TLS) handshakes, and
+        requests carrying W3C trace context.
+        """
+        peer = request.transport.get_extra_info("peername") if request.transport else None
+        if peer not in self.peers:
+            self.peers.add(peer)
+            self.stats["connections"] += 1
+        if "traceparent" in request.headers:
+            self.stats["traceparent_headers"] += 1
+        return await handler(request)
+
+    async def handle_login(self, request: web.Request) -> web.Response:
+        self.stats["logins"] += 1
+        account = self._basic_auth(request)
+        if account is None:
+            return web.json_response({"error": "unauthorized"}, status=401)
+        if self.login_latency:
+            await asyncio.sleep(self.login_latency)
+        session_id = uuid.uuid4().hex
+        self.sessions[session_id] = account
+        return web.json_response({"sessid": session_id})
+
+    async def handle_logout(self, request: web.Request) -> web.Response:
+        self.stats["logouts"] += 1
+        session_id = request.headers.get("X-Axigen-Session")
+        if session_id not in self.sessions:
+            return web.json_response({"error": "session expired"}, status=401)
+        del self.sessions[session_id]
+        return web.Response(status=204)
+
+    def _basic_auth(self, request: web.Request) -> Optional[str]:
+        """Account named by a valid Basic Authorization header, else None."""
+        header = request.headers.get("Authorization", "")
+        if not header.startswith("Basic "):
+            return None
+        try:
+            account, _, password = base64.b64decode(header[6:]).decode().partition(":")
+        except ValueError:
+            return None
+        account = account.lower()
+        if self.accounts is not None and self.accounts.get(account) != password:
+            return None
+        return account
+
+    def _api(self, route: str, handler):
+        """Wrap a mailbox handler with auth, fault injection and JSON encoding."""
+
+        async def serve(request: web.Request) -> web.StreamResponse:
+            response = await handle(request)
+            if isinstance(response, web.Response) and isinstance(response.body, (bytes, bytearray)):
+                self.stats["bytes_sent"] += len(response.body)
+            return response
+
+        async def handle(request: web.Request) -> web.StreamResponse:
+            self.stats["requests"] += 1
+            self.route_stats[route] += 1
+            account = self.sessions.get(request.headers.get("X-Axigen-Session"))
+            if account is None:
+                self.stats["rejected"] += 1
+                return web.json_response({"error": "session expired"}, status=401)
+            throttled = self.throttle(account)
+            if throttled is not None:
+                return throttled
+            await self.work(request.match_info.get("tail", request.path))
+            if self.error_rate and self.random.random() < self.error_rate:
+                return self.injected_error()
+            if request.headers.get("Content-Encoding") == "gzip":
+                self.stats["compressed_bodies"] += 1
+                if not self.accept_compressed_bodies:
+                    return web.json_response({"error": "unsupported media type"}, status=415)
+            body: Dict[str, Any] = {}
+            if request.can_read_body:
+                raw = await request.read()
+                self.stats["bytes_received"] += len(raw)
+                if raw:
+                    try:
+                        body = await request.json()
+                    except ValueError:
+                        return web.json_response({"error": "invalid JSON body"}, status=400)
+            if handler is None:
+                self.stats["unknown_endpoints"] += 1
+                return web.json_response({"error": f"unknown endpoint {request.method} {request.path}"},
+                                         status=404)
+            try:
+                result = handler(request, self.mailbox(account), body)
+                if asyncio.iscoroutine(result):
+                    result = await result
+            except MockError as e:
+                return web.json_response({"error": e.message}, status=e.status)
+            if isinstance(result, web.StreamResponse):
+                return result
+            if result is None:
+                return web.Response(status=204)
+            return self.respond(request, result)
+
+        return serve
+
+    def _mail(self, request: web.Request, mailbox: Mailbox, body: Dict[str, Any]) -> Dict[str, Any]:
+        """The mail in the envelope, with its fields also at the top level as mail id checks read them."""
+        mail = mailbox.mail(request.match_info["mail_id"])
+        return {**mail, "success": True, "data": mail}
+
+    def _body(self, request: web.Request, mailbox: Mailbox, body: Dict[str, Any]) -> Dict[str, Any]:
+        text = mailbox.body(request.match_info["mail_id"])
+        return {"success": True, "format": request.query.get("format", "text"),
+                "data": base64.b64encode(text.encode()).decode("ascii")}
+
+    async def _source_stream(self, request: web.Request, mailbox: Mailbox, body: Dict[str, Any]) -> web.StreamResponse:
+        """Raw RFC 822 source of source_bytes, with a large base64 attachment."""
+        mailbox.mail(request.match_info["mail_id"])
+        source = self.raw_source()
+        response = web.StreamResponse(headers={"Content-Type": "message/rfc822"})
+        response.content_length = len(source)
+        await response.prepare(request)
+        view = memoryview(source)
+        try:
+            for offset in range(0, len(source), 256 * 1024):
+                await response.write(view[offset:offset + 256 * 1024])
+                sent = min(256 * 1024, len(source) - offset)
+                self.stats["source_bytes_sent"] += sent
+                self.stats["bytes_sent"] += sent
+        except ConnectionError:
+            # Client stopped reading early
+            self.stats["source_aborted"] += 1
+        return response
+
+    def raw_source(self) -> bytes:
+        if self._source is None:
+            headers = (
+                "From: \"Alice\" <alice@example.com>\r\n"
+                "To: bob@example.org\r\n"
+                "Subject: Quarterly report\r\n"
+                "Date: Tue, 14 Nov 2023 10:00:00 +0000\r\n"
+                "Message-ID: <report@example.com>\r\n"
+                "MIME-Version: 1.0\r\n"
+                "Content-Type: multipart/mixed; boundary=\"b1\"\r\n"
+                "\r\n"
+                "--b1\r\nContent-Type: text/plain\r\n\r\nReport attached.\r\n"
+                "--b1\r\nContent-Type: application/pdf; name=\"report.pdf\"\r\n"
+                "Content-Transfer-Encoding: base64\r\n\r\n"
+            ).encode()
+            line = b"JVBERi0xLjQKJcfsj6IKNSAwIG9iago8PC9MZW5ndGggNiAwIFIvRmlsdGVyIC9GbGF0ZUR\r\n"
+            lines = max(0, self.source_bytes - len(headers) - 8) // len(line)
+            self._source = headers + line * lines + b"--b1--\r\n"
+        return self._source
+
+    def respond(self, request: web.Request, payload: Any) -> web.Response:
+        """JSON response, compressed when enabled and the client accepts it."""
+        response = web.json_response(payload)
+        if self.compress and request.headers.get("Accept-Encoding", "identity") != "identity":
+            response.enable_compression()
+            self.stats["compressed_responses"] += 1
+        return response
+
+    async def work(self, path: str = ""):
+        """Spend the request's latency, holding one of capacity workers."""
+        latency = self.latency + sum(delay for pattern, delay in self.path_latency if pattern.search(path))
+        if self.slow_rate and self.random.random() < self.slow_rate:
+            self.stats["slow_responses"] += 1
+            latency += self.slow_latency
+        if not self.capacity:
+            if latency:
+                await asyncio.sleep(latency)
+            return
+        if self._workers is None:
+            self._workers = asyncio.Semaphore(self.capacity)
+        async with self._workers:
+            if latency:
+                await asyncio.sleep(latency)
+
+    def throttle(self, account: str) -> Optional[web.Response]:
+        """Per-account token bucket; a 429 with Retry-After once it runs dry."""
+        if not self.rate_limit:
+            return None
+        now = time.monotonic()
+        bucket = self._buckets.get(account)
+        if bucket is None:
+            bucket = self._buckets[account] = [self.rate_limit, now]
+        bucket[0] = min(self.rate_limit, bucket[0] + (now - bucket[1]) * self.rate_limit)
+        bucket[1] = now
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return None
+        self.stats["throttled"] += 1
+        wait = (1 - bucket[0]) / self.rate_limit
+        return web.json_response({"error": "too many requests"}, status=429,
+                                 headers={"Retry-After": f"{wait:.3f}"})
+
+    def injected_error(self) -> web.Response:
+        self.stats["injected_errors"] += 1
+        headers = {}
+        if self.retry_after is not None and self.error_status in (429, 503):
+            headers["Retry-After"] = str(self.retry_after)
+        return web.json_response({"error": "injected"}, status=self.error_status, headers=headers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the mock Axigen REST server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--mailbox-size", type=int, default=500, help="mails in each account's inbox")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--retry-after", type=float, default=None)
+    parser.add_argument("--rate-limit", type=float, default=None, help="requests per second per account")
+    parser.add_argument("--compress", action="store_true")
+    args = parser.parse_args()
+    mock = MockAxigen(latency=args.latency, error_rate=args.error_rate, error_status=args.error_status,
+                      retry_after=args.retry_after, seed=args.seed, compress=args.compress,
+                      mailbox_size=args.mailbox_size, rate_limit=args.rate_limit)
+    web.run_app(mock.make_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
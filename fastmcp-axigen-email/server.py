@@ -6,11 +6,15 @@ Provides tools for email management through the Axigen REST API.
 
 from fastmcp import FastMCP
 from typing import Dict, Any, Optional, List
-from src.utils import quick_request, format_email_list, parse_email_addresses
+from src.utils import (
+    quick_request, quick_stream, format_email_list, parse_email_addresses, session_lifespan,
+    instrument_server, tool_deadline, DeadlineExceededError
+)
 import json
 import base64
 
-mcp = FastMCP("Axigen Email Server")
+mcp = FastMCP("Axigen Email Server", lifespan=session_lifespan)
+instrument_server(mcp)
 
 # Helper functions
 
@@ -392,6 +396,7 @@ async def list_emails(
     return result
 
 @mcp.tool()
+@tool_deadline()
 async def search_emails(
     email: str,
     password: str,
@@ -481,6 +486,7 @@ async def search_emails(
 
 
 @mcp.tool()
+@tool_deadline()
 async def get_email(
     email: str,
     password: str,
@@ -535,6 +541,9 @@ async def get_email(
             except Exception as e:
                 result["data"]["body_included"] = False
                 result["data"]["body_error"] = f"Body retrieval failed: {str(e)}"
+                if isinstance(e, DeadlineExceededError):
+                    # Out of time: return what we have rather than nothing
+                    result["data"]["partial"] = True
 
         # Add metadata for reliability
         if result.get("success"):
@@ -604,6 +613,7 @@ async def get_email_body(
 # Email Composition and Sending Tools
 
 @mcp.tool()
+@tool_deadline()
 async def create_draft(
     email: str,
     password: str,
@@ -786,6 +796,7 @@ async def send_email(
     return result
 
 @mcp.tool()
+@tool_deadline()
 async def send_draft(
     email: str,
     password: str,
@@ -904,6 +915,7 @@ async def send_draft(
         )
 
 @mcp.tool()
+@tool_deadline()
 async def update_draft(
     email: str,
     password: str,
@@ -1598,6 +1610,7 @@ async def delete_label(
 # Email Label Operations
 
 @mcp.tool()
+@tool_deadline()
 async def add_label_to_email(
     email: str,
     password: str,
@@ -1697,6 +1710,7 @@ async def remove_label_from_email(
         raise
 
 @mcp.tool()
+@tool_deadline()
 async def add_label_by_name(
     email: str,
     password: str,
@@ -1770,7 +1784,77 @@ async def add_label_by_name(
 # These may work on full Axigen installations
 # To send emails with attachments on ax.email, include them inline in the email body
 
+async def read_source_prefix(email: str, password: str, server_url: str, mail_id: str,
+                             max_bytes: int, stop_at_headers: bool = False) -> Dict[str, Any]:
+    """Stream a mail's raw source, stopping after max_bytes or the end of the headers."""
+    raw = bytearray()
+    header_end = -1
+    async with quick_stream(email, password, server_url, "GET", f"mails/{mail_id}/source") as body:
+        async for chunk in body:
+            # Look a few bytes back in case the blank line spans two chunks
+            search_from = max(0, len(raw) - 3)
+            raw += chunk
+            if stop_at_headers:
+                ends = [i for i in (raw.find(b"\r\n\r\n", search_from), raw.find(b"\n\n", search_from)) if i >= 0]
+                if ends:
+                    header_end = min(ends)
+                    break
+            if len(raw) >= max_bytes:
+                break
+        size = body.content_length
+        complete = body.complete
+
+    if header_end >= 0:
+        raw = raw[:header_end]
+    return {
+        "text": bytes(raw[:max_bytes]).decode("utf-8", errors="replace"),
+        "size": size,
+        "truncated": not complete and header_end < 0 and len(raw) >= max_bytes
+    }
+
+@mcp.tool()
+async def get_email_source(
+    email: str,
+    password: str,
+    mail_id: str,
+    max_bytes: int = 1_000_000,
+    server_url: str = "https://ax.email"
+) -> Dict[str, Any]:
+    """
+    Get the raw RFC 822 source of an email.
+
+    The source is streamed and only the first max_bytes are returned, so large
+    messages with attachments don't have to be downloaded in full.
+
+    Args:
+        email: User email for authentication
+        password: User password
+        mail_id: The email ID
+        max_bytes: Maximum bytes of source to return (default: 1000000)
+        server_url: Axigen server URL (default: https://ax.email)
+
+    Returns:
+        Raw source text, its full size and whether it was truncated
+    """
+    try:
+        source = await read_source_prefix(email, password, server_url, mail_id, max_bytes)
+        return {
+            "success": True,
+            "mail_id": mail_id,
+            "source": source["text"],
+            "size": source["size"],
+            "truncated": source["truncated"]
+        }
+    except Exception as e:
+        return create_error_response(
+            "get_email_source",
+            str(e),
+            "Verify mail_id exists by using list_emails or search_emails first",
+            {"mail_id": mail_id}
+        )
+
 @mcp.tool()
+@tool_deadline()
 async def get_email_headers(
     email: str,
     password: str,
@@ -1806,16 +1890,16 @@ async def get_email_headers(
         headers_error = str(e)
 
         if use_fallback and "404" in headers_error:
-            # Fallback: Extract headers from email source
+            # Fallback: Extract headers from email source, streaming only
+            # up to the first empty line instead of the whole message
             try:
-                source_result = await quick_request(
-                    email, password, server_url,
-                    "GET", f"mails/{mail_id}/source"
+                source_result = await read_source_prefix(
+                    email, password, server_url, mail_id,
+                    max_bytes=256 * 1024, stop_at_headers=True
                 )
 
-                if source_result.get("success") or source_result.get("raw_response"):
-                    # Extract headers from source
-                    source_text = source_result.get("raw_response") or source_result.get("source", "")
+                if source_result["text"]:
+                    source_text = source_result["text"]
 
                     if isinstance(source_text, str) and source_text:
                         # Extract headers (everything before first empty line)
@@ -1,17 +1,45 @@
 """
-Utility Functions for Axigen Email MCP Server
-==============================================
+Utility Functions for Axigen MCP Servers
+========================================
 Shared utilities for authentication, HTTP client, and response formatting.
+
+Each server ships its own copy of this module so it can run on its own; the
+copies are kept identical so the gateway can load one of them for all four.
 """
 
+import atexit
 import base64
+import bisect
+import contextvars
+import copy
+import hashlib
+import hmac
+import inspect
 import logging
 import asyncio
-import aiohttp
 import json
-from typing import Dict, Any, Optional, List, Tuple
-from datetime import datetime, timedelta
-from email_validator import validate_email, EmailNotValidError
+import os
+import random
+import re
+import ssl
+import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict, defaultdict, deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Dict, Any, Optional, List, Tuple
+from datetime import datetime, timedelta, timezone
+
+# aiohttp, email_validator (which pulls in dnspython), sqlite3 and
+# urllib.request are imported where they are used: together they are a large
+# share of a server's cold start and the MCP handshake needs none of them.
+# preload_imports() warms the first two in the background once a server runs.
+if TYPE_CHECKING:
+    import aiohttp
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +63,128 @@ class APIError(AxigenError):
     """General API error from Axigen server"""
     pass
 
+class CircuitOpenError(APIError):
+    """Axigen server is failing, so requests are rejected without being sent"""
+
+    def __init__(self, server_url: str, retry_in: float):
+        self.server_url = server_url
+        self.retry_in = retry_in
+        super().__init__(
+            f"Axigen server {server_url} is temporarily unavailable "
+            f"(circuit open, retry in {retry_in:.0f}s)"
+        )
+
+class DeadlineExceededError(APIError):
+    """The tool invocation's deadline passed before the request could finish"""
+    pass
+
+class ResponseTooLargeError(APIError):
+    """Streamed response body exceeded the caller's size cap"""
+
+    def __init__(self, limit: int, size: Optional[int] = None):
+        self.limit = limit
+        self.size = size
+        detail = f"{size} bytes" if size is not None else "more"
+        super().__init__(f"Response body too large ({detail}, limit {limit} bytes)")
+
+# ============================================================================
+# JSON Codec
+# ============================================================================
+
+class JSONCodec:
+    """
+    JSON encode/decode pair used for Axigen request and response bodies.
+
+    The fastest available backend is picked at import time: orjson, then
+    msgspec, then the standard library. Set AXIGEN_JSON_CODEC to "orjson",
+    "msgspec" or "stdlib" to force one; an unavailable choice falls back to
+    the standard library.
+    """
+
+    def __init__(self, name: str, loads, dumps):
+        self.name = name
+        self.loads = loads
+        self.dumps = dumps
+
+    def __repr__(self) -> str:
+        return f"JSONCodec({self.name!r})"
+
+def _stdlib_codec() -> JSONCodec:
+    return JSONCodec(
+        "stdlib",
+        json.loads,
+        lambda obj: json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    )
+
+def _orjson_codec() -> JSONCodec:
+    import orjson
+    return JSONCodec(
+        "orjson",
+        orjson.loads,
+        lambda obj: orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    )
+
+def _msgspec_codec() -> JSONCodec:
+    import msgspec
+    decoder = msgspec.json.Decoder()
+    encoder = msgspec.json.Encoder()
+
+    def loads(data):
+        try:
+            return decoder.decode(data)
+        except msgspec.DecodeError as e:
+            # Match the ValueError contract of json/orjson
+            raise ValueError(str(e)) from e
+
+    return JSONCodec("msgspec", loads, encoder.encode)
+
+_CODEC_LOADERS = {
+    "orjson": _orjson_codec,
+    "msgspec": _msgspec_codec,
+    "stdlib": _stdlib_codec,
+}
+
+def load_json_codec(preference: str = "auto") -> JSONCodec:
+    """
+    Build a codec by name ("auto", "orjson", "msgspec" or "stdlib").
+
+    "auto" tries orjson, then msgspec. Any backend that is not installed
+    falls back to the standard library.
+    """
+    preference = (preference or "auto").lower()
+    candidates = ["orjson", "msgspec"] if preference == "auto" else [preference]
+    for name in candidates:
+        loader = _CODEC_LOADERS.get(name)
+        if loader is None:
+            logger.warning(f"Unknown JSON codec {name!r}, using stdlib")
+            continue
+        try:
+            return loader()
+        except ImportError:
+            if preference != "auto":
+                logger.warning(f"JSON codec {name!r} is not installed, using stdlib")
+    return _stdlib_codec()
+
+_json_codec = load_json_codec(os.environ.get("AXIGEN_JSON_CODEC", "auto"))
+
+def get_json_codec() -> JSONCodec:
+    """Get the active JSON codec."""
+    return _json_codec
+
+def set_json_codec(preference: str) -> JSONCodec:
+    """Switch the active JSON codec at runtime and return it."""
+    global _json_codec
+    _json_codec = load_json_codec(preference)
+    return _json_codec
+
+def json_loads(data: Any) -> Any:
+    """Decode JSON bytes or str with the active codec. Raises ValueError."""
+    return _json_codec.loads(data)
+
+def json_dumps(obj: Any) -> bytes:
+    """Encode an object to compact UTF-8 JSON bytes with the active codec."""
+    return _json_codec.dumps(obj)
+
 # ============================================================================
 # Response Formatting
 # ============================================================================
@@ -68,6 +218,8 @@ def validate_email_address(email: str) -> Tuple[bool, Optional[str]]:
     Validate email address format.
     Returns (is_valid, error_message)
     """
+    from email_validator import validate_email, EmailNotValidError
+
     try:
         validate_email(email)
         return True, None
@@ -125,16 +277,1495 @@ def parse_email_addresses(addresses: str) -> List[str]:
         return []
     return [addr.strip() for addr in addresses.split(",") if addr.strip()]
 
+# ============================================================================
+# Metrics
+# ============================================================================
+
+class Metrics:
+    """
+    In-process counters, gauges and histograms for the session layer.
+
+    Series are keyed by name plus optional labels, e.g.
+    increment("axigen_retries_total", method="GET", reason="503").
+    """
+
+    # Upper bounds (seconds) of histogram buckets; +Inf is implied
+    buckets = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+    def __init__(self):
+        self._counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = defaultdict(float)
+        self._gauges: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+        # key -> [per-bucket counts (last is +Inf), sum, count]
+        self._histograms: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], list] = {}
+        # Read-modify-write updates must stay exact when threads share the cache
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(name: str, labels: Dict[str, Any]) -> Tuple[str, Tuple[Tuple[str, str], ...]]:
+        return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def increment(self, name: str, value: float = 1, **labels):
+        """Add value to a counter."""
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] += value
+
+    def set(self, name: str, value: float, **labels):
+        """Set a gauge to value."""
+        self._gauges[self._key(name, labels)] = value
+
+    def clear_gauge(self, name: str):
+        """Drop every series of a gauge, e.g. before re-reading per-host values."""
+        for key in [key for key in self._gauges if key[0] == name]:
+            self._gauges.pop(key, None)
+
+    def observe(self, name: str, value: float, **labels):
+        """Record one observation in a histogram."""
+        key = self._key(name, labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            histogram[0][index] += 1
+            histogram[1] += value
+            histogram[2] += 1
+
+    def histogram(self, name: str, **labels) -> Dict[str, Any]:
+        """Cumulative bucket counts, sum and count of one histogram."""
+        counts, total, count = self._histograms.get(self._key(name, labels), [[0] * (len(self.buckets) + 1), 0.0, 0])
+        cumulative = []
+        running = 0
+        for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+            running += bucket_count
+            cumulative.append((bound, running))
+        return {"buckets": cumulative, "sum": total, "count": count}
+
+    def get(self, name: str, **labels) -> float:
+        """Current value of one counter or gauge, or the sum over all labels if none given."""
+        if labels:
+            key = self._key(name, labels)
+            return self._counters.get(key, self._gauges.get(key, 0))
+        return sum(
+            value for series in (self._counters, self._gauges)
+            for (metric, _), value in series.items() if metric == name
+        )
+
+    @staticmethod
+    def _series(name: str, labels: Tuple[Tuple[str, str], ...]) -> str:
+        if not labels:
+            return name
+        label_str = ",".join(f'{k}="{v}"' for k, v in labels)
+        return f"{name}{{{label_str}}}"
+
+    def snapshot(self) -> Dict[str, float]:
+        """
+        All series as {'name{label="value"}': value}. Histograms appear as
+        name_count and name_sum.
+        """
+        result = {}
+        for (name, labels), value in sorted({**self._counters, **self._gauges}.items()):
+            result[self._series(name, labels)] = value
+        for (name, labels), (_, total, count) in sorted(self._histograms.items()):
+            result[self._series(f"{name}_count", labels)] = count
+            result[self._series(f"{name}_sum", labels)] = total
+        return result
+
+    @staticmethod
+    def _escape_label(value: str) -> str:
+        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    def render_prometheus(self) -> str:
+        """All series in the Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: (list(counts), total, count) for key, (counts, total, count) in self._histograms.items()}
+        gauges = dict(self._gauges)
+
+        def series(name: str, labels: Tuple[Tuple[str, str], ...]) -> str:
+            return self._series(name, tuple((k, self._escape_label(v)) for k, v in labels))
+
+        lines = []
+        for kind, values in (("counter", counters), ("gauge", gauges)):
+            previous = None
+            for (name, labels), value in sorted(values.items()):
+                if name != previous:
+                    lines.append(f"# TYPE {name} {kind}")
+                    previous = name
+                lines.append(f"{series(name, labels)} {value}")
+        previous = None
+        for (name, labels), (counts, total, count) in sorted(histograms.items()):
+            if name != previous:
+                lines.append(f"# TYPE {name} histogram")
+                previous = name
+            running = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                running += bucket_count
+                le = "+Inf" if bound == float("inf") else str(bound)
+                lines.append(f"{series(name + '_bucket', labels + (('le', le),))} {running}")
+            lines.append(f"{series(name + '_sum', labels)} {total}")
+            lines.append(f"{series(name + '_count', labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        """Clear all counters, gauges and histograms."""
+        self._counters.clear()
+        self._gauges.clear()
+        self._histograms.clear()
+
+# Global metrics instance
+_metrics = Metrics()
+
+def get_metrics() -> Metrics:
+    """Get the global metrics instance."""
+    return _metrics
+
+# ============================================================================
+# Connection Pooling
+# ============================================================================
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer tuning knob from the environment."""
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        logger.warning(f"Ignoring invalid {name}={os.environ[name]!r}")
+        return default
+
+def _env_float(name: str, default: float) -> float:
+    """Read a float tuning knob from the environment."""
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        logger.warning(f"Ignoring invalid {name}={os.environ[name]!r}")
+        return default
+
+class ConnectionPoolManager:
+    """
+    One pooled aiohttp.ClientSession per Axigen server URL.
+
+    Every AxigenSession for the same host borrows the same pool, so accounts
+    share keep-alive connections, the DNS cache and a single SSL context
+    instead of each opening its own sockets.
+
+    Defaults can be overridden with environment variables:
+        AXIGEN_POOL_LIMIT            Total connections per pool (default 100)
+        AXIGEN_POOL_LIMIT_PER_HOST   Connections per host, 0 = no limit (default 0)
+        AXIGEN_KEEPALIVE_TIMEOUT     Idle keep-alive seconds (default 30)
+        AXIGEN_DNS_CACHE_TTL         DNS cache seconds (default 300)
+    """
+
+    def __init__(
+        self,
+        limit: Optional[int] = None,
+        limit_per_host: Optional[int] = None,
+        keepalive_timeout: Optional[float] = None,
+        dns_cache_ttl: Optional[int] = None,
+        request_timeout: float = 30
+    ):
+        self.limit = limit if limit is not None else _env_int("AXIGEN_POOL_LIMIT", 100)
+        self.limit_per_host = (
+            limit_per_host if limit_per_host is not None
+            else _env_int("AXIGEN_POOL_LIMIT_PER_HOST", 0)
+        )
+        self.keepalive_timeout = (
+            keepalive_timeout if keepalive_timeout is not None
+            else _env_float("AXIGEN_KEEPALIVE_TIMEOUT", 30)
+        )
+        self.dns_cache_ttl = (
+            dns_cache_ttl if dns_cache_ttl is not None
+            else _env_int("AXIGEN_DNS_CACHE_TTL", 300)
+        )
+        self.request_timeout = request_timeout
+
+        # Keyed by (server, loop): an aiohttp session only works on its own loop
+        self._pools: "Dict[Tuple[str, asyncio.AbstractEventLoop], aiohttp.ClientSession]" = {}
+        self._ssl_context: Optional[ssl.SSLContext] = None
+
+    def _get_ssl_context(self) -> ssl.SSLContext:
+        """Build the SSL context once and reuse it for every pool."""
+        if self._ssl_context is None:
+            self._ssl_context = ssl.create_default_context()
+        return self._ssl_context
+
+    def get_pool(self, server_url: str) -> "aiohttp.ClientSession":
+        """
+        Get the shared HTTP session for a server, creating it on first use.
+
+        Must be called from a running event loop. Each loop gets its own pool,
+        so a pool is never replaced while another loop still uses it; pools
+        whose loop has closed are dropped.
+        """
+        import aiohttp
+
+        key = server_url.rstrip('/')
+        loop = asyncio.get_running_loop()
+
+        pool = self._pools.get((key, loop))
+        if pool is not None and not pool.closed:
+            return pool
+        # Sockets of a closed loop can no longer be closed, only forgotten
+        for stale in [entry for entry in self._pools if entry[1].is_closed()]:
+            del self._pools[stale]
+
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.dns_cache_ttl,
+            ssl=self._get_ssl_context()
+        )
+        tracer = get_tracer()
+        pool = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+            headers={"Accept-Encoding": accept_encoding()},
+            trace_configs=[tracer.trace_config()] if tracer is not None else None
+        )
+        self._pools[(key, loop)] = pool
+        logger.debug(f"Created connection pool for {key}")
+        return pool
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-host connection counts (in use and idle) for monitoring."""
+        result = {}
+        for (key, _), pool in list(self._pools.items()):
+            connector = pool.connector
+            if pool.closed or connector is None:
+                continue
+            idle = sum(len(conns) for conns in getattr(connector, "_conns", {}).values())
+            counts = result.setdefault(key, {"limit": self.limit, "in_use": 0, "idle": 0})
+            counts["in_use"] += len(getattr(connector, "_acquired", ()))
+            counts["idle"] += idle
+        return result
+
+    async def close_all(self):
+        """Close every pool and its sockets, each on the loop it belongs to."""
+        pools = list(self._pools.items())
+        self._pools.clear()
+        loop = asyncio.get_running_loop()
+        for (_, pool_loop), pool in pools:
+            if pool.closed:
+                continue
+            if pool_loop is loop:
+                await pool.close()
+            elif pool_loop.is_running():
+                await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(pool.close(), pool_loop))
+
+# Global connection pool manager instance
+_pool_manager = ConnectionPoolManager()
+
+def get_pool_manager() -> ConnectionPoolManager:
+    """Get the global connection pool manager instance."""
+    return _pool_manager
+
+# ============================================================================
+# Compression
+# ============================================================================
+
+def accept_encoding() -> str:
+    """
+    Accept-Encoding value advertised to Axigen.
+
+    Lists only encodings aiohttp can decode here: gzip and deflate always,
+    br and zstd when their optional decoders are installed. Override with
+    AXIGEN_ACCEPT_ENCODING (e.g. "identity" to turn compression off).
+    """
+    override = os.environ.get("AXIGEN_ACCEPT_ENCODING")
+    if override:
+        return override
+    try:
+        from aiohttp import compression_utils
+        has_brotli = getattr(compression_utils, "HAS_BROTLI", False)
+        has_zstd = getattr(compression_utils, "HAS_ZSTD", False)
+    except ImportError:
+        has_brotli = has_zstd = False
+    encodings = ["gzip", "deflate"]
+    if has_brotli:
+        encodings.append("br")
+    if has_zstd:
+        encodings.append("zstd")
+    return ", ".join(encodings)
+
+# Servers that rejected a gzip-encoded request body
+_request_compression_unsupported: set = set()
+
+def compress_request_body(body: bytes, server_url: str) -> Optional[bytes]:
+    """
+    Gzip a request body if request compression is enabled and worthwhile.
+
+    Enabled by setting AXIGEN_COMPRESS_REQUESTS_MIN_BYTES to the smallest
+    body size worth compressing (default 0 = off). Servers that rejected a
+    compressed body earlier are skipped.
+
+    Returns:
+        The compressed body, or None to send the original
+    """
+    min_bytes = _env_int("AXIGEN_COMPRESS_REQUESTS_MIN_BYTES", 0)
+    if min_bytes <= 0 or len(body) < min_bytes or server_url in _request_compression_unsupported:
+        return None
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    compressed = compressor.compress(body) + compressor.flush()
+    if len(compressed) >= len(body):
+        return None
+    return compressed
+
+def record_response_bytes(response: "aiohttp.ClientResponse", server_url: str, decoded_bytes: int):
+    """Count bytes received on the wire and after decompression."""
+    encoding = response.headers.get("Content-Encoding", "identity").lower()
+    wire_bytes = getattr(response.content, "total_raw_bytes", None)
+    if wire_bytes is None:
+        # Older aiohttp: only the header tells us the compressed size
+        wire_bytes = int(response.headers.get("Content-Length", decoded_bytes) or decoded_bytes)
+    metrics = get_metrics()
+    metrics.increment("axigen_response_bytes_total", wire_bytes, server=server_url, stage="wire")
+    metrics.increment("axigen_response_bytes_total", decoded_bytes, server=server_url, stage="decoded")
+    metrics.increment("axigen_responses_total", server=server_url, encoding=encoding)
+
+# ============================================================================
+# Timeouts and Deadlines
+# ============================================================================
+
+class TimeoutProfile:
+    """
+    Connect, socket-read and total timeouts for one class of endpoint.
+    A total of None means no overall limit (only the gaps between reads).
+    """
+
+    def __init__(self, name: str, connect: float, sock_read: float, total: Optional[float]):
+        self.name = name
+        self.connect = connect
+        self.sock_read = sock_read
+        self.total = total
+
+    def client_timeout(self) -> "aiohttp.ClientTimeout":
+        """ClientTimeout for one attempt, cut short by the current deadline."""
+        import aiohttp
+
+        total = self.total
+        remaining = remaining_time()
+        if remaining is not None:
+            if remaining <= 0:
+                raise DeadlineExceededError("Deadline exceeded before the request was sent")
+            total = remaining if total is None else min(total, remaining)
+        return aiohttp.ClientTimeout(total=total, sock_connect=self.connect, sock_read=self.sock_read)
+
+    def __repr__(self) -> str:
+        return f"TimeoutProfile({self.name!r}, connect={self.connect}, sock_read={self.sock_read}, total={self.total})"
+
+class TimeoutProfiles:
+    """
+    Maps requests to timeout profiles by method and endpoint.
+
+    Each profile can be overridden with AXIGEN_TIMEOUT_<NAME> set to
+    "connect,sock_read,total" (total may be "none"), e.g.
+    AXIGEN_TIMEOUT_METADATA="3,5,5".
+    """
+
+    DEFAULTS = {
+        "metadata": (5, 10, 10),
+        "default": (5, 30, 30),
+        "search": (5, 45, 45),
+        "send": (5, 60, 60),
+        "batch": (5, 60, 60),
+        "bulk": (5, 30, None),
+        "auth": (5, 10, 10),
+    }
+
+    # (methods or None for any, endpoint pattern, profile); first match wins
+    RULES = [
+        (None, r"batch/", "batch"),
+        (None, r"mails/[^/]+/(source|attachments)|.*/download$|.*/eml$", "bulk"),
+        (None, r"(mails|drafts/[^/]+)/send", "send"),
+        (None, r"mails/search", "search"),
+        ({"GET"}, r"account|folders|labels|mails/counters|mails/[^/]+/headers", "metadata"),
+    ]
+
+    def __init__(self):
+        self.profiles: Dict[str, TimeoutProfile] = {}
+        for name, default in self.DEFAULTS.items():
+            self.profiles[name] = TimeoutProfile(name, *self._from_env(name, default))
+        self._rules = [(methods, re.compile(pattern), name) for methods, pattern, name in self.RULES]
+
+    @staticmethod
+    def _from_env(name: str, default: Tuple) -> Tuple:
+        env_name = f"AXIGEN_TIMEOUT_{name.upper()}"
+        raw = os.environ.get(env_name)
+        if not raw:
+            return default
+        try:
+            connect, sock_read, total = (part.strip() for part in raw.split(","))
+            return float(connect), float(sock_read), None if total.lower() == "none" else float(total)
+        except ValueError:
+            logger.warning(f"Ignoring invalid {env_name}={raw!r}")
+            return default
+
+    def get(self, name: str) -> TimeoutProfile:
+        """Profile by name, falling back to the default profile."""
+        return self.profiles.get(name, self.profiles["default"])
+
+    def for_request(self, method: str, endpoint: str) -> TimeoutProfile:
+        """Pick the profile for a request."""
+        endpoint = endpoint.lstrip('/')
+        for methods, pattern, name in self._rules:
+            if (methods is None or method.upper() in methods) and pattern.match(endpoint):
+                return self.profiles[name]
+        return self.profiles["default"]
+
+# Global timeout profiles instance
+_timeout_profiles = TimeoutProfiles()
+
+def get_timeout_profiles() -> TimeoutProfiles:
+    """Get the global timeout profiles instance."""
+    return _timeout_profiles
+
+# Absolute monotonic time by which the current tool invocation must finish
+_deadline: ContextVar[Optional[float]] = ContextVar("axigen_deadline", default=None)
+
+def remaining_time() -> Optional[float]:
+    """Seconds left before the current deadline, or None if there is none."""
+    expires = _deadline.get()
+    return None if expires is None else expires - time.monotonic()
+
+@contextmanager
+def deadline(seconds: Optional[float]):
+    """
+    Bound every Axigen call made inside the block by one shared budget.
+
+    Works across awaits and tasks started inside the block. Nested deadlines
+    can only shorten the budget. None or 0 leaves the current deadline as is.
+    """
+    if not seconds or seconds <= 0:
+        yield
+        return
+    expires = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(expires if current is None else min(current, expires))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+def tool_deadline(seconds: Optional[float] = None):
+    """
+    Decorator giving a tool one end-to-end deadline for all of its calls.
+
+    Defaults to AXIGEN_TOOL_DEADLINE_SECONDS (45; 0 disables).
+    """
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            budget = seconds if seconds is not None else _env_float("AXIGEN_TOOL_DEADLINE_SECONDS", 45)
+            with deadline(budget):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+# ============================================================================
+# Call Tracing
+# ============================================================================
+
+class CallTrace:
+    """
+    Upstream calls and cache hits made while tracing is on, collected into a
+    per-tool timing breakdown. Each call is a dict with method, endpoint,
+    at_ms (start, from the beginning of the trace), ms (including retries and
+    any login made on the way), queued_ms, outcome, status, attempts and bytes.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.calls: List[Dict[str, Any]] = []
+        self.cache: Dict[str, int] = defaultdict(int)
+
+    def call(self, method: str, endpoint: str) -> Dict[str, Any]:
+        """Start recording one upstream call; pass the result to finish()."""
+        started = time.perf_counter()
+        entry = {"method": method.upper(), "endpoint": endpoint.lstrip("/"),
+                 "at_ms": round((started - self.started) * 1000, 2), "started": started}
+        self.calls.append(entry)
+        return entry
+
+    @staticmethod
+    def finish(entry: Dict[str, Any], **fields):
+        """Close a call started with call(), adding its elapsed time and fields."""
+        started = entry.pop("started")
+        entry["ms"] = round((time.perf_counter() - started) * 1000, 2)
+        entry.update(fields)
+
+    def count(self, event: str):
+        """Count a cache event such as a session cache hit or a shared GET."""
+        self.cache[event] += 1
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Total time, time with at least one upstream call open (overlapping
+        and nested calls count once), the calls in start order and cache counts.
+        """
+        upstream, covered_until = 0.0, 0.0
+        for start, end in sorted((call["at_ms"], call["at_ms"] + call["ms"]) for call in self.calls if "ms" in call):
+            if end > covered_until:
+                upstream += end - max(start, covered_until)
+                covered_until = end
+        return {
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 2),
+            "upstream_ms": round(upstream, 2),
+            "calls": self.calls,
+            "cache": dict(self.cache)
+        }
+
+# Trace for the current tool invocation, if timing was asked for
+_call_trace: ContextVar[Optional[CallTrace]] = ContextVar("axigen_call_trace", default=None)
+
+def current_trace() -> Optional[CallTrace]:
+    """The active CallTrace, or None when timing is off."""
+    return _call_trace.get()
+
+def timing_enabled() -> bool:
+    """Whether AXIGEN_DEBUG_TIMING asks for a timing breakdown on every tool."""
+    return os.environ.get("AXIGEN_DEBUG_TIMING", "0").lower() in ("1", "true", "yes", "on")
+
+@contextmanager
+def trace_calls():
+    """
+    Record every Axigen call made inside the block, across awaits and tasks
+    started inside it:
+
+        with trace_calls() as trace:
+            await quick_request(...)
+        trace.summary()
+    """
+    trace = CallTrace()
+    token = _call_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _call_trace.reset(token)
+
+# ============================================================================
+# Distributed Tracing
+# ============================================================================
+
+# OTLP span kinds
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+
+_TRACEPARENT = re.compile(r"00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}")
+
+def parse_traceparent(value: Any) -> Optional[Tuple[str, str]]:
+    """(trace_id, parent span_id) from a W3C traceparent header, or None if invalid."""
+    match = _TRACEPARENT.fullmatch(value.strip().lower()) if isinstance(value, str) else None
+    if match is None or match.group(1) == "0" * 32 or match.group(2) == "0" * 16:
+        return None
+    return match.group(1), match.group(2)
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+class Span:
+    """One span, exported in the OpenTelemetry OTLP/JSON shape when it ends."""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "kind", "start_ns", "end_ns",
+                 "attributes", "error", "attempts", "_token")
+
+    def __init__(self, name: str, kind: int, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes = attributes
+        self.error: Optional[str] = None
+        # HTTP attempts made under this span, for http.request.resend_count
+        self.attempts = 0
+        self._token = None
+
+    @property
+    def traceparent(self) -> str:
+        """W3C traceparent header naming this span as the parent."""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [_otlp_attribute(key, value) for key, value in self.attributes.items()],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 0},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+# Innermost open span in this task; new spans become its children
+_current_span: ContextVar[Optional[Span]] = ContextVar("axigen_current_span", default=None)
+
+def _background_task(loop: asyncio.AbstractEventLoop, coro) -> asyncio.Task:
+    """
+    Start a task that outlives the call that started it in an empty context,
+    so it doesn't inherit that call's deadline, call trace or span.
+    """
+    return contextvars.Context().run(loop.create_task, coro)
+
+class SpanExporter:
+    """
+    Batches ended spans on a daemon thread and writes them as OTLP/JSON
+    ExportTraceServiceRequest documents: one per line to a file (the format
+    of the OpenTelemetry Collector's file exporter), and/or POSTed to an
+    OTLP/HTTP endpoint such as http://127.0.0.1:4318/v1/traces.
+
+    Ending a span only appends it to a deque; the thread wakes every
+    interval seconds, so tool calls never wait on export I/O or on the
+    exporter thread.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        endpoint: Optional[str] = None,
+        service_name: str = "axigen-mcp",
+        batch_size: int = 512,
+        interval: float = 1.0,
+        max_queued: int = 100_000
+    ):
+        self.path = path
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self.interval = interval
+        self.max_queued = max_queued
+        self.exported = 0
+        self.dropped = 0
+        self._spans: deque = deque()
+        self._flush_requests: deque = deque()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        """Queue an ended span; spans past max_queued are dropped."""
+        if self._thread is None:
+            self._start()
+        if len(self._spans) >= self.max_queued:
+            self.dropped += 1
+            return
+        self._spans.append(span)
+
+    def flush(self, timeout: float = 5.0):
+        """Write everything queued so far."""
+        if self._thread is None:
+            return
+        done = threading.Event()
+        self._flush_requests.append(done)
+        self._wake.set()
+        if not done.wait(timeout):
+            logger.warning("Timed out flushing trace spans")
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="axigen-span-exporter", daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            # Take the flush requests first: their spans are already queued
+            requests = []
+            while self._flush_requests:
+                requests.append(self._flush_requests.popleft())
+            while self._spans:
+                batch = []
+                while self._spans and len(batch) < self.batch_size:
+                    batch.append(self._spans.popleft())
+                self._write(batch)
+            for done in requests:
+                done.set()
+
+    def _write(self, batch: List[Span]):
+        payload = json_dumps({
+            "resourceSpans": [{
+                "resource": {"attributes": [_otlp_attribute("service.name", self.service_name)]},
+                "scopeSpans": [{
+                    "scope": {"name": "axigen-mcp-servers"},
+                    "spans": [span.to_otlp() for span in batch]
+                }]
+            }]
+        })
+        try:
+            if self.path:
+                with open(self.path, "ab") as f:
+                    f.write(payload + b"\n")
+            if self.endpoint:
+                import urllib.request
+                request = urllib.request.Request(
+                    self.endpoint, data=payload, headers={"Content-Type": "application/json"}, method="POST"
+                )
+                urllib.request.urlopen(request, timeout=5).close()
+            self.exported += len(batch)
+        except (OSError, ValueError) as e:
+            self.dropped += len(batch)
+            logger.warning(f"Could not export {len(batch)} trace span(s): {e}")
+
+class Tracer:
+    """
+    Starts and ends spans around tools, Axigen requests and logins, and
+    propagates W3C trace context into every HTTP request a pool sends.
+    """
+
+    def __init__(self, exporter: SpanExporter):
+        self.exporter = exporter
+        self._trace_config: "Optional[aiohttp.TraceConfig]" = None
+
+    def start(
+        self,
+        name: str,
+        kind: int = SPAN_KIND_INTERNAL,
+        parent: Optional[Tuple[str, str]] = None,
+        current: bool = True,
+        **attributes
+    ) -> Span:
+        """
+        Open a span under parent (a (trace_id, span_id) pair), or else under
+        the current span, or else as a new trace. With current=True it
+        becomes the current span until end() is called in the same task.
+        """
+        if parent is None:
+            enclosing = _current_span.get()
+            if enclosing is not None:
+                parent = enclosing.trace_id, enclosing.span_id
+        if parent is None:
+            trace_id, parent_id = f"{random.getrandbits(128):032x}", None
+        else:
+            trace_id, parent_id = parent
+        span = Span(name, kind, trace_id, parent_id, attributes)
+        if current:
+            span._token = _current_span.set(span)
+        return span
+
+    def end(self, span: Span, error: Any = None, **attributes):
+        """Close a span, marking it failed if error is given, and export it."""
+        span.end_ns = time.time_ns()
+        span.attributes.update(attributes)
+        if error is not None:
+            span.error = error if isinstance(error, str) else f"{error.__class__.__name__}: {error}"
+        if span._token is not None:
+            try:
+                _current_span.reset(span._token)
+            except ValueError:
+                # Ended from another context; that context's value is not ours to restore
+                pass
+            span._token = None
+        self.exporter.export(span)
+
+    def trace_config(self) -> "aiohttp.TraceConfig":
+        """aiohttp hooks giving every HTTP attempt a client span and a traceparent header."""
+        if self._trace_config is not None:
+            return self._trace_config
+        import aiohttp
+
+        async def on_request_start(session, context, params):
+            enclosing = _current_span.get()
+            resend_count = 0
+            if enclosing is not None:
+                resend_count = enclosing.attempts
+                enclosing.attempts += 1
+            url = params.url.with_query(None)
+            context.span = self.start(
+                params.method, SPAN_KIND_CLIENT, current=False,
+                **{"http.request.method": params.method, "url.full": str(url),
+                   "server.address": url.host or "", "server.port": url.port or 0}
+            )
+            if resend_count:
+                context.span.attributes["http.request.resend_count"] = resend_count
+            params.headers["traceparent"] = context.span.traceparent
+
+        async def on_request_end(session, context, params):
+            status = params.response.status
+            self.end(context.span, error=f"HTTP {status}" if status >= 500 else None,
+                     **{"http.response.status_code": status})
+
+        async def on_request_exception(session, context, params):
+            self.end(context.span, error=params.exception, **{"error.type": params.exception.__class__.__name__})
+
+        config = aiohttp.TraceConfig()
+        config.on_request_start.append(on_request_start)
+        config.on_request_end.append(on_request_end)
+        config.on_request_exception.append(on_request_exception)
+        self._trace_config = config
+        return config
+
+def load_tracer() -> Optional[Tracer]:
+    """
+    Tracer exporting to AXIGEN_TRACE_FILE and/or AXIGEN_TRACE_OTLP_ENDPOINT,
+    or None (tracing off) when neither is set.
+    """
+    path = os.environ.get("AXIGEN_TRACE_FILE")
+    endpoint = os.environ.get("AXIGEN_TRACE_OTLP_ENDPOINT")
+    if not path and not endpoint:
+        return None
+    service_name = os.environ.get("AXIGEN_TRACE_SERVICE_NAME", "axigen-mcp")
+    logger.info(f"Tracing to {' and '.join(filter(None, (path, endpoint)))} as {service_name}")
+    return Tracer(SpanExporter(path, endpoint, service_name))
+
+# Global tracer; None keeps every tracing hook to a single check
+_tracer = load_tracer()
+
+def get_tracer() -> Optional[Tracer]:
+    """Get the global tracer, or None when tracing is off."""
+    return _tracer
+
+def set_tracer(tracer: Optional[Tracer]):
+    """
+    Replace the global tracer (None turns tracing off). Pools created before
+    the change keep their previous trace hooks until they are recreated.
+    """
+    global _tracer
+    _tracer = tracer
+
+# ============================================================================
+# Retry Policy
+# ============================================================================
+
+# Methods that are safe to repeat
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+# Batch endpoints whose effect is the same when applied twice (copy is not)
+IDEMPOTENT_BATCH_ENDPOINTS = (
+    "batch/mails/move", "batch/mails/delete", "batch/mails/update",
+    "batch/mails/labels/add", "batch/mails/labels/remove",
+    "batch/conversations/move", "batch/conversations/delete", "batch/conversations/update",
+    "batch/conversations/labels/add", "batch/conversations/labels/remove",
+)
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter for idempotent Axigen requests.
+
+    Defaults can be overridden with environment variables:
+        AXIGEN_RETRY_ATTEMPTS     Total attempts including the first (default 3)
+        AXIGEN_RETRY_BASE_DELAY   First backoff ceiling in seconds (default 0.2)
+        AXIGEN_RETRY_MAX_DELAY    Largest backoff ceiling in seconds (default 5)
+        AXIGEN_RETRY_DEADLINE     Overall budget for all attempts in seconds (default 20)
+    """
+
+    retry_statuses = frozenset({429, 502, 503, 504})
+
+    def __init__(
+        self,
+        max_attempts: Optional[int] = None,
+        base_delay: Optional[float] = None,
+        max_delay: Optional[float] = None,
+        deadline: Optional[float] = None
+    ):
+        self.max_attempts = max(1, max_attempts if max_attempts is not None
+                                else _env_int("AXIGEN_RETRY_ATTEMPTS", 3))
+        self.base_delay = base_delay if base_delay is not None else _env_float("AXIGEN_RETRY_BASE_DELAY", 0.2)
+        self.max_delay = max_delay if max_delay is not None else _env_float("AXIGEN_RETRY_MAX_DELAY", 5)
+        self.deadline = deadline if deadline is not None else _env_float("AXIGEN_RETRY_DEADLINE", 20)
+
+    def is_retryable(self, method: str, endpoint: str) -> bool:
+        """Whether a request may be sent again after a transient failure."""
+        return method.upper() in IDEMPOTENT_METHODS or endpoint in IDEMPOTENT_BATCH_ENDPOINTS
+
+    def next_delay(self, attempt: int, elapsed: float, retry_after: Optional[float] = None) -> Optional[float]:
+        """
+        Seconds to wait before the next attempt, or None to give up.
+
+        Args:
+            attempt: Zero-based index of the attempt that just failed
+            elapsed: Seconds spent since the first attempt started
+            retry_after: Server-requested delay from a Retry-After header
+        """
+        if attempt + 1 >= self.max_attempts:
+            return None
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        if elapsed + delay >= self.deadline:
+            return None
+        return delay
+
+# Global retry policy instance
+_retry_policy = RetryPolicy()
+
+def get_retry_policy() -> RetryPolicy:
+    """Get the global retry policy instance."""
+    return _retry_policy
+
+# ============================================================================
+# Request Coalescing
+# ============================================================================
+
+# Methods whose concurrent identical calls can share one upstream request
+COALESCED_METHODS = frozenset({"GET", "HEAD"})
+
+def _coalescing_enabled() -> bool:
+    """GET coalescing is on unless AXIGEN_COALESCE_GETS=0."""
+    return _env_int("AXIGEN_COALESCE_GETS", 1) != 0
+
+def _request_key(method: str, endpoint: str, params: Optional[Dict], headers: Optional[Dict]) -> Tuple:
+    """Key identifying identical requests within one account's session."""
+    def freeze(mapping: Optional[Dict]) -> Tuple:
+        return tuple(sorted((str(k), repr(v)) for k, v in (mapping or {}).items()))
+    return method.upper(), endpoint.lstrip('/'), freeze(params), freeze(headers)
+
+def _shared_fields(pending: List, call: Dict[str, Any], task: asyncio.Task) -> Dict[str, Any]:
+    """Outcome, status, attempts and bytes of a coalesced GET, for a caller that joined it."""
+    owner, first = pending[2], pending[3]
+    if owner is not None:
+        for entry in reversed(owner.calls[first:]):
+            if ("ms" in entry and not entry.get("shared") and entry["method"] == call["method"]
+                    and entry["endpoint"] == call["endpoint"]):
+                return {field: entry[field] for field in ("outcome", "status", "attempts", "bytes") if field in entry}
+    return {"outcome": "ok" if not task.cancelled() and task.exception() is None else "error"}
+
+# ============================================================================
+# Hedged Requests
+# ============================================================================
+
+class HedgePolicy:
+    """
+    Opt-in hedging for idempotent GETs.
+
+    If a GET hasn't answered within the chosen percentile of recent latencies
+    for its server and timeout profile, a second identical request is sent and
+    whichever finishes first wins. A token budget caps hedges to a fraction of
+    requests so a slow server isn't hit with twice the load.
+
+    Defaults can be overridden with environment variables:
+        AXIGEN_HEDGE_PERCENTILE   Latency percentile that triggers a hedge, 0 = off (default 0)
+        AXIGEN_HEDGE_MAX_RATE     Max fraction of requests that may be hedged (default 0.05)
+        AXIGEN_HEDGE_MIN_DELAY    Never hedge sooner than this many seconds (default 0.01)
+        AXIGEN_HEDGE_MIN_SAMPLES  Latencies needed before hedging starts (default 50)
+    """
+
+    window = 500
+
+    def __init__(
+        self,
+        percentile: Optional[float] = None,
+        max_rate: Optional[float] = None,
+        min_delay: Optional[float] = None,
+        min_samples: Optional[int] = None
+    ):
+        self.percentile = percentile if percentile is not None else _env_float("AXIGEN_HEDGE_PERCENTILE", 0)
+        self.max_rate = max_rate if max_rate is not None else _env_float("AXIGEN_HEDGE_MAX_RATE", 0.05)
+        self.min_delay = min_delay if min_delay is not None else _env_float("AXIGEN_HEDGE_MIN_DELAY", 0.01)
+        self.min_samples = min_samples if min_samples is not None else _env_int("AXIGEN_HEDGE_MIN_SAMPLES", 50)
+        self._latencies: Dict[Tuple[str, str], deque] = {}
+        self._delays: Dict[Tuple[str, str], Optional[float]] = {}
+        self._budget: Dict[str, float] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.percentile > 0
+
+    def observe(self, server_url: str, profile: str, seconds: float):
+        """Record the latency of a completed request."""
+        key = (server_url, profile)
+        samples = self._latencies.get(key)
+        if samples is None:
+            samples = self._latencies[key] = deque(maxlen=self.window)
+        samples.append(seconds)
+        # Recompute the percentile every few samples rather than per request
+        if len(samples) % 10 == 0 or key not in self._delays:
+            self._delays[key] = self._compute_delay(samples)
+
+    def _compute_delay(self, samples: deque) -> Optional[float]:
+        if len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+        return max(self.min_delay, ordered[index])
+
+    def hedge_delay(self, server_url: str, profile: str) -> Optional[float]:
+        """Seconds to wait before hedging, or None if there's no data yet."""
+        return self._delays.get((server_url, profile))
+
+    def credit(self, server_url: str):
+        """Each request earns max_rate of a hedge, up to a small burst."""
+        self._budget[server_url] = min(10.0, self._budget.get(server_url, 0.0) + self.max_rate)
+
+    def try_spend(self, server_url: str) -> bool:
+        """Take one hedge from the server's budget if there is one."""
+        if self._budget.get(server_url, 0.0) < 1:
+            return False
+        self._budget[server_url] -= 1
+        return True
+
+# Global hedge policy instance
+_hedge_policy = HedgePolicy()
+
+def get_hedge_policy() -> HedgePolicy:
+    """Get the global hedge policy instance."""
+    return _hedge_policy
+
+# ============================================================================
+# Circuit Breaker
+# ============================================================================
+
+class CircuitBreaker:
+    """
+    Failure-rate circuit breaker for one Axigen server.
+
+    CLOSED: requests flow and outcomes are tracked over a sliding window.
+    OPEN: once the failure rate crosses the threshold, requests are rejected
+        immediately with CircuitOpenError for open_seconds.
+    HALF_OPEN: after the cool-down a limited number of probe requests are let
+        through; a success closes the circuit, a failure re-opens it.
+
+    Only server-side trouble counts as failure: connection errors, timeouts
+    and 5xx responses. 4xx and 429 responses show the server is alive.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        server_url: str,
+        failure_rate: float = 0.5,
+        min_requests: int = 20,
+        window_seconds: float = 30,
+        open_seconds: float = 15,
+        half_open_probes: int = 1
+    ):
+        self.server_url = server_url
+        self.failure_rate = failure_rate
+        self.min_requests = min_requests
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+
+        self.state = self.CLOSED
+        self._outcomes: deque = deque()  # (monotonic time, success)
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._publish_state()
+
+    def _publish_state(self):
+        states = {self.CLOSED: 0, self.HALF_OPEN: 1, self.OPEN: 2}
+        get_metrics().set("axigen_circuit_state", states[self.state], server=self.server_url)
+
+    def _transition(self, state: str):
+        if state == self.state:
+            return
+        logger.warning(f"Circuit for {self.server_url}: {self.state} -> {state}")
+        self.state = state
+        if state == self.OPEN:
+            self._opened_at = time.monotonic()
+            get_metrics().increment("axigen_circuit_opened_total", server=self.server_url)
+        if state != self.HALF_OPEN:
+            self._probes_in_flight = 0
+        self._outcomes.clear()
+        self._failures = 0
+        self._publish_state()
+
+    def _reject(self):
+        get_metrics().increment("axigen_circuit_rejected_total", server=self.server_url)
+        retry_in = max(0.0, self._opened_at + self.open_seconds - time.monotonic())
+        raise CircuitOpenError(self.server_url, retry_in)
+
+    def acquire(self) -> bool:
+        """
+        Admit a request or raise CircuitOpenError.
+
+        Returns:
+            True if the request holds a half-open probe slot, which must be
+            handed back with release().
+        """
+        if self.state == self.OPEN:
+            if time.monotonic() - self._opened_at < self.open_seconds:
+                self._reject()
+            self._transition(self.HALF_OPEN)
+        if self.state == self.HALF_OPEN:
+            if self._probes_in_flight >= self.half_open_probes:
+                self._reject()
+            self._probes_in_flight += 1
+            return True
+        return False
+
+    def release(self, probe: bool):
+        """Hand back a probe slot obtained from acquire()."""
+        if probe and self.state == self.HALF_OPEN and self._probes_in_flight > 0:
+            self._probes_in_flight -= 1
+
+    def check(self):
+        """Raise CircuitOpenError if the circuit is open, without taking a slot."""
+        if self.state == self.OPEN and time.monotonic() - self._opened_at < self.open_seconds:
+            self._reject()
+
+    def record(self, success: bool):
+        """Record the outcome of one upstream attempt."""
+        if self.state == self.HALF_OPEN:
+            self._transition(self.CLOSED if success else self.OPEN)
+            return
+        if self.state == self.OPEN:
+            return
+
+        now = time.monotonic()
+        self._outcomes.append((now, success))
+        if not success:
+            self._failures += 1
+        while self._outcomes and now - self._outcomes[0][0] > self.window_seconds:
+            _, old_success = self._outcomes.popleft()
+            if not old_success:
+                self._failures -= 1
+
+        total = len(self._outcomes)
+        if total >= self.min_requests and self._failures / total >= self.failure_rate:
+            self._transition(self.OPEN)
+
+class CircuitBreakerRegistry:
+    """
+    One CircuitBreaker per Axigen server URL.
+
+    Defaults can be overridden with environment variables:
+        AXIGEN_BREAKER_FAILURE_RATE   Failure fraction that opens the circuit (default 0.5)
+        AXIGEN_BREAKER_MIN_REQUESTS   Requests in the window before it can open (default 20)
+        AXIGEN_BREAKER_WINDOW         Sliding window in seconds (default 30)
+        AXIGEN_BREAKER_OPEN_SECONDS   Cool-down before probing again (default 15)
+        AXIGEN_BREAKER_PROBES         Concurrent half-open probes (default 1)
+    """
+
+    def __init__(self):
+        self.failure_rate = _env_float("AXIGEN_BREAKER_FAILURE_RATE", 0.5)
+        self.min_requests = _env_int("AXIGEN_BREAKER_MIN_REQUESTS", 20)
+        self.window_seconds = _env_float("AXIGEN_BREAKER_WINDOW", 30)
+        self.open_seconds = _env_float("AXIGEN_BREAKER_OPEN_SECONDS", 15)
+        self.half_open_probes = _env_int("AXIGEN_BREAKER_PROBES", 1)
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, server_url: str) -> CircuitBreaker:
+        """Get the breaker for a server, creating it on first use."""
+        key = server_url.rstrip('/')
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                key,
+                failure_rate=self.failure_rate,
+                min_requests=self.min_requests,
+                window_seconds=self.window_seconds,
+                open_seconds=self.open_seconds,
+                half_open_probes=self.half_open_probes
+            )
+            self._breakers[key] = breaker
+        return breaker
+
+    def states(self) -> Dict[str, str]:
+        """Current state of every known breaker."""
+        return {key: breaker.state for key, breaker in self._breakers.items()}
+
+# Global circuit breaker registry instance
+_circuit_breakers = CircuitBreakerRegistry()
+
+def get_circuit_breakers() -> CircuitBreakerRegistry:
+    """Get the global circuit breaker registry instance."""
+    return _circuit_breakers
+
+# ============================================================================
+# Concurrency Governor
+# ============================================================================
+
+class _HostGate:
+    """Admission state for one Axigen host: active counts and per-account queues."""
+
+    def __init__(self, server_url: str, loop: asyncio.AbstractEventLoop):
+        self.server_url = server_url
+        # Waiters are futures of this loop, so only it may admit or release
+        self.loop = loop
+        self.active = 0
+        self.account_active: Dict[str, int] = defaultdict(int)
+        self.queues: Dict[str, deque] = {}
+        self.vtime: Dict[str, float] = {}
+        self.queued = 0
+
+class ConcurrencyGovernor:
+    """
+    Caps concurrent Axigen requests per account and per host.
+
+    Requests over a limit wait in a per-account queue. When a slot frees up
+    the host picks the next account by weighted fair queuing: each admission
+    advances the account's virtual time by 1/weight, and the waiting account
+    with the lowest virtual time goes next. An account fanning out hundreds
+    of calls therefore only gets its share of the host while others wait.
+
+    Defaults can be overridden with environment variables:
+        AXIGEN_ACCOUNT_CONCURRENCY   Concurrent requests per account, 0 = no limit (default 8)
+        AXIGEN_HOST_CONCURRENCY      Concurrent requests per host, 0 = no limit (default 64)
+
+    Like the session cache, it serves one running event loop at a time.
+    """
+
+    def __init__(self, account_limit: Optional[int] = None, host_limit: Optional[int] = None):
+        self.account_limit = (account_limit if account_limit is not None
+                              else _env_int("AXIGEN_ACCOUNT_CONCURRENCY", 8))
+        self.host_limit = (host_limit if host_limit is not None
+                           else _env_int("AXIGEN_HOST_CONCURRENCY", 64))
+        self._weights: Dict[str, float] = {}
+        self._gates: Dict[str, _HostGate] = {}
+
+    def set_weight(self, account: str, weight: float):
+        """Give an account a larger (or smaller) share of each host; default 1."""
+        if weight <= 0:
+            raise ValueError("weight must be positive")
+        self._weights[account.lower()] = weight
+
+    def _gate(self, server_url: str) -> _HostGate:
+        key = server_url.rstrip('/')
+        loop = asyncio.get_running_loop()
+        gate = self._gates.get(key)
+        if gate is None or (gate.loop is not loop and gate.loop.is_closed()):
+            gate = self._gates[key] = _HostGate(key, loop)
+        elif gate.loop is not loop:
+            raise RuntimeError(f"Requests to {key} are already governed on another event loop")
+        return gate
+
+    def _has_room(self, gate: _HostGate, account: str) -> bool:
+        if self.host_limit > 0 and gate.active >= self.host_limit:
+            return False
+        return self.account_limit <= 0 or gate.account_active[account] < self.account_limit
+
+    def _admit(self, gate: _HostGate, account: str):
+        gate.active += 1
+        gate.account_active[account] += 1
+        # Start idle accounts at the current floor so they can't bank credit
+        floor = min(gate.vtime.values(), default=0.0)
+        gate.vtime[account] = max(gate.vtime.get(account, floor), floor) + 1 / self._weights.get(account, 1)
+
+    def _publish(self, gate: _HostGate):
+        metrics = get_metrics()
+        metrics.set("axigen_governor_active", gate.active, server=gate.server_url)
+        metrics.set("axigen_governor_queue_depth", gate.queued, server=gate.server_url)
+
+    def _dispatch(self, gate: _HostGate):
+        """Hand free slots to waiting accounts, lowest virtual time first."""
+        while gate.queued:
+            eligible = [
+                account for account, queue in gate.queues.items()
+                if queue and self._has_room(gate, account)
+            ]
+            if not eligible:
+                break
+            account = min(eligible, key=lambda a: gate.vtime.get(a, 0.0))
+            waiter = gate.queues[account].popleft()
+            gate.queued -= 1
+            if not gate.queues[account]:
+                del gate.queues[account]
+            self._admit(gate, account)
+            waiter.set_result(None)
+        self._publish(gate)
+
+    def _release(self, gate: _HostGate, account: str):
+        gate.active -= 1
+        gate.account_active[account] -= 1
+        if not gate.account_active[account]:
+            del gate.account_active[account]
+            if account not in gate.queues:
+                gate.vtime.pop(account, None)
+        self._dispatch(gate)
+
+    @asynccontextmanager
+    async def slot(self, server_url: str, account: str, timeout: Optional[float] = None):
+        """
+        Hold one request slot for account on server_url, waiting if needed.
+
+        Args:
+            server_url: Axigen server URL
+            account: Account (email) the request is made for
+            timeout: Give up waiting after this many seconds (DeadlineExceededError)
+        """
+        gate = self._gate(server_url)
+        account = account.lower()
+        if not gate.queued and self._has_room(gate, account):
+            self._admit(gate, account)
+            self._publish(gate)
+        else:
+            waiter = asyncio.get_running_loop().create_future()
+            gate.queues.setdefault(account, deque()).append(waiter)
+            gate.queued += 1
+            self._publish(gate)
+            started = time.monotonic()
+            try:
+                if timeout is None:
+                    await waiter
+                else:
+                    await asyncio.wait_for(waiter, max(timeout, 0))
+            except (asyncio.CancelledError, asyncio.TimeoutError) as e:
+                if waiter.done() and not waiter.cancelled():
+                    # Admitted just as we were cancelled: give the slot back
+                    self._release(gate, account)
+                else:
+                    queue = gate.queues.get(account)
+                    if queue and waiter in queue:
+                        queue.remove(waiter)
+                        gate.queued -= 1
+                        if not queue:
+                            del gate.queues[account]
+                    self._publish(gate)
+                if isinstance(e, asyncio.TimeoutError):
+                    get_metrics().increment("axigen_governor_timeouts_total", server=gate.server_url)
+                    raise DeadlineExceededError(f"Deadline exceeded waiting for a slot on {gate.server_url}")
+                raise
+            metrics = get_metrics()
+            metrics.increment("axigen_governor_waits_total", server=gate.server_url)
+            metrics.increment("axigen_governor_wait_seconds_total", time.monotonic() - started,
+                              server=gate.server_url)
+        try:
+            yield
+        finally:
+            self._release(gate, account)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Active and queued requests per host."""
+        return {
+            key: {
+                "active": gate.active,
+                "queued": gate.queued,
+                "accounts_active": len(gate.account_active),
+                "accounts_waiting": len(gate.queues),
+            }
+            for key, gate in self._gates.items()
+        }
+
+# Global concurrency governor instance
+_governor = ConcurrencyGovernor()
+
+def get_governor() -> ConcurrencyGovernor:
+    """Get the global concurrency governor instance."""
+    return _governor
+
+# ============================================================================
+# Streaming Responses
+# ============================================================================
+
+class ResponseStream:
+    """
+    Body of a streamed Axigen response, read chunk by chunk.
+
+    Iterate with `async for chunk in stream`. The body is never buffered as a
+    whole; max_bytes caps how much is read and progress(received, total) is
+    called after every chunk (total is None without a Content-Length).
+    """
+
+    def __init__(
+        self,
+        response: "aiohttp.ClientResponse",
+        chunk_size: int = 65536,
+        max_bytes: Optional[int] = None,
+        progress=None
+    ):
+        self._response = response
+        self.chunk_size = chunk_size
+        self.max_bytes = max_bytes
+        self.progress = progress
+        self.status = response.status
+        self.headers = response.headers
+        self.content_type = response.content_type
+        self.content_length = response.content_length
+        self.filename = response.content_disposition.filename if response.content_disposition else None
+        self.bytes_received = 0
+
+    async def __aiter__(self):
+        async for chunk in self._response.content.iter_chunked(self.chunk_size):
+            self.bytes_received += len(chunk)
+            if self.max_bytes is not None and self.bytes_received > self.max_bytes:
+                raise ResponseTooLargeError(self.max_bytes)
+            if self.progress:
+                self.progress(self.bytes_received, self.content_length)
+            yield chunk
+
+    @property
+    def complete(self) -> bool:
+        """True once the whole body has been read."""
+        return self._response.content.at_eof()
+
+    async def read(self) -> bytes:
+        """Read the rest of the body (still subject to max_bytes)."""
+        return b"".join([chunk async for chunk in self])
+
+async def _write_to_sink(sink, chunk: bytes):
+    """Write to a file-like object whose write() may be sync or async."""
+    result = sink.write(chunk)
+    if inspect.isawaitable(result):
+        await result
+
 # ============================================================================
 # Session Management
 # ============================================================================
 
+# Servers that answered 404/405/501 to POST /logout
+_logout_unsupported: set = set()
+
+# Idle TTL and background refresh window, shared by every session
+_SESSION_TTL = timedelta(minutes=30)
+_SESSION_REFRESH_WINDOW = timedelta(minutes=_env_float("AXIGEN_SESSION_REFRESH_MINUTES", 5))
+# Only sessions used in at least this many bursts are refreshed; requests less
+# than _SESSION_BURST_GAP seconds apart are one burst
+_SESSION_REFRESH_MIN_USES = _env_int("AXIGEN_SESSION_REFRESH_MIN_USES", 2)
+_SESSION_BURST_GAP = 2.0
+
+# Keyed with a random per-process secret so fingerprints are useless outside it
+_fingerprint_hash = hashlib.blake2b(key=os.urandom(16), digest_size=16)
+
+def credential_fingerprint(password: str) -> bytes:
+    """Keyed digest of a password, for checking cached credentials without keeping them."""
+    digest = _fingerprint_hash.copy()
+    digest.update(password.encode())
+    return digest.digest()
+
 class AxigenSession:
     """
     Manages authentication and session state for Axigen API calls.
     Handles automatic re-authentication when session expires.
+
+    Sessions are kept compact because the cache may hold one per account for
+    very many accounts: attributes live in __slots__, times are epoch floats,
+    server URLs are interned and shared, the password is only kept inside the
+    auth header, and locks and tables are created on first use.
     """
 
+    __slots__ = (
+        "email", "server_url", "base_url", "session_id", "auth_header", "fingerprint",
+        "expires_at", "authenticated_at", "last_activity", "uses", "last_used", "session_ttl",
+        "refresh_window", "_http_session", "_loop", "_auth_lock", "_refresh_task", "_in_flight", "_drained",
+        "_pending_reads", "_restore_pending",
+    )
+
     def __init__(self, email: str, password: str, server_url: str):
         """
         Initialize session with credentials.
@@ -145,20 +1776,56 @@ class AxigenSession:
             server_url: Axigen server URL (without /api/v1)
         """
         self.email = email
-        self.password = password
-        self.server_url = server_url.rstrip('/')
-        self.base_url = f"{self.server_url}/api/v1"
+        # Interned so every session for a server shares one copy
+        self.server_url = sys.intern(server_url.rstrip('/'))
+        self.base_url = sys.intern(f"{self.server_url}/api/v1")
 
-        # Session state
+        # Session state; times are epoch seconds
         self.session_id: Optional[str] = None
         self.auth_header: str = self._create_basic_auth(email, password)
-        self.expires_at: Optional[datetime] = None
-
-        # HTTP client (will be initialized on first use)
-        self._http_session: Optional[aiohttp.ClientSession] = None
-
-        # Session cache TTL (30 minutes)
-        self.session_ttl = timedelta(minutes=30)
+        self.fingerprint = credential_fingerprint(password)
+        self.expires_at: Optional[float] = None
+
+        # Shared per-host HTTP pool (borrowed from the pool manager on first use)
+        # and the event loop it belongs to
+        self._http_session: "Optional[aiohttp.ClientSession]" = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Serializes logins so concurrent callers share one POST /login
+        # (created on first login)
+        self._auth_lock: Optional[asyncio.Lock] = None
+
+        # Session idle TTL (30 minutes), slid forward by every accepted request
+        self.session_ttl = _SESSION_TTL
+
+        # Sessions this close to expiry that were used since their last login,
+        # in at least _SESSION_REFRESH_MIN_USES bursts while cached, are
+        # re-authenticated in the background
+        self.refresh_window = _SESSION_REFRESH_WINDOW
+        self.authenticated_at: Optional[float] = None
+        self.last_activity: Optional[float] = None
+        self.uses = 0
+        self._refresh_task: Optional[asyncio.Task] = None
+
+        # In-flight request tracking so close() can drain before logging out
+        self._in_flight = 0
+        self._drained: Optional[asyncio.Future] = None
+
+        # Identical GETs in flight, shared by concurrent callers (created on first GET)
+        self._pending_reads: Optional[Dict[Tuple, List]] = None
+
+        # Monotonic time of the last cache lookup, used for idle eviction
+        self.last_used = time.monotonic()
+
+        # Look for a session saved by a previous process before the first login
+        # (unless the store is known to be off)
+        self._restore_pending = _session_store is not None
+
+    @property
+    def password(self) -> str:
+        """Password, recovered from the auth header (only the session store needs it)."""
+        credentials = base64.b64decode(self.auth_header[len("Basic "):]).decode()
+        return credentials[len(self.email) + 1:]
 
     def _create_basic_auth(self, email: str, password: str) -> str:
         """Create Basic Authentication header value."""
@@ -166,22 +1833,119 @@ class AxigenSession:
         encoded = base64.b64encode(credentials.encode()).decode('ascii')
         return f"Basic {encoded}"
 
+    def _bind_loop(self):
+        """
+        Tie the session to the running event loop on first use. Its login
+        lock, shared GETs and governor slots only work on that loop; a
+        session whose loop has closed starts over on the new one.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        if self._loop is not None and not self._loop.is_closed():
+            raise RuntimeError(
+                f"Session for {self.email} is in use on another event loop; "
+                "a SessionCache serves one event loop at a time"
+            )
+        self._loop = loop
+        self._auth_lock = None
+        self._pending_reads = None
+
     async def _ensure_http_session(self):
-        """Ensure HTTP session is created."""
-        if self._http_session is None or self._http_session.closed:
-            timeout = aiohttp.ClientTimeout(total=30)
-            self._http_session = aiohttp.ClientSession(timeout=timeout)
+        """Ensure we hold the shared connection pool for our server."""
+        self._http_session = get_pool_manager().get_pool(self.server_url)
 
-    async def authenticate(self) -> str:
+    async def authenticate(self, rejected_session_id: Optional[str] = None) -> str:
         """
         Authenticate with Axigen server and obtain session ID.
 
+        Logins are single-flight: callers that arrive while another login is
+        in progress wait for it and reuse the session it obtained instead of
+        issuing their own POST /login.
+
+        Args:
+            rejected_session_id: Session ID the caller saw rejected by the
+                server. A fresh login is only made if it is still current.
+
         Returns:
             Session ID string
 
         Raises:
             AuthenticationError: If authentication fails
         """
+        self._bind_loop()
+        if self._auth_lock is None:
+            self._auth_lock = asyncio.Lock()
+        async with self._auth_lock:
+            if self.is_session_valid() and self.session_id != rejected_session_id:
+                return self.session_id
+            if self._restore_pending:
+                await self._restore()
+                if self.is_session_valid() and rejected_session_id is None:
+                    return self.session_id
+            started = time.perf_counter()
+            trace = _call_trace.get()
+            call = trace.call("POST", "login") if trace is not None else None
+            tracer = _tracer
+            span = tracer.start("axigen login") if tracer is not None else None
+            try:
+                session_id = await self._login()
+            except AxigenError as e:
+                get_metrics().increment("axigen_logins_total", result="failed")
+                if call is not None:
+                    CallTrace.finish(call, outcome="auth_failed")
+                if span is not None:
+                    tracer.end(span, error=e)
+                raise
+            get_metrics().increment("axigen_logins_total", result="ok")
+            if call is not None:
+                CallTrace.finish(call, outcome="ok")
+            if span is not None:
+                tracer.end(span)
+            get_metrics().observe("axigen_login_seconds", time.perf_counter() - started)
+            self.authenticated_at = time.time()
+            await self._persist()
+            return session_id
+
+    def restore(self, stored: Dict[str, Any]):
+        """Adopt a session loaded from the persistent store."""
+        self.session_id = stored["session_id"]
+        self.expires_at = stored["expires_at"]
+        if stored.get("authenticated_at"):
+            self.authenticated_at = stored["authenticated_at"]
+
+    async def _restore(self):
+        """Adopt a still-valid session saved by a previous process, if any."""
+        self._restore_pending = False
+        store = await open_session_store()
+        if store is None:
+            return
+        try:
+            stored = await asyncio.to_thread(store.load, self.email, self.password, self.server_url)
+        except Exception as e:
+            logger.warning(f"Session store lookup failed: {e}")
+            return
+        get_metrics().increment("axigen_session_store_lookups_total", result="hit" if stored else "miss")
+        if stored:
+            # If the server has dropped it meanwhile, the first request's 401
+            # triggers a normal re-login
+            logger.debug(f"Restored stored session for {self.email}")
+            self.restore(stored)
+
+    async def _persist(self):
+        """Write the current session to the persistent store, if there is one."""
+        store = await open_session_store()
+        if store is None:
+            return
+        try:
+            await asyncio.to_thread(store.save, self)
+        except Exception as e:
+            logger.warning(f"Could not persist session for {self.email}: {e}")
+
+    async def _login(self) -> str:
+        """Perform the POST /login round-trip. Caller must hold the auth lock."""
+        import aiohttp
+
         await self._ensure_http_session()
 
         headers = {
@@ -189,16 +1953,19 @@ class AxigenSession:
             "Content-Type": "application/json"
         }
 
+        breaker = get_circuit_breakers().get(self.server_url)
         try:
             async with self._http_session.post(
                 f"{self.base_url}/login",
-                headers=headers
+                headers=headers,
+                timeout=get_timeout_profiles().get("auth").client_timeout()
             ) as response:
+                breaker.record(response.status < 500)
                 if response.status == 404:
                     # Login endpoint doesn't exist, use sessionless auth
                     logger.info(f"Login endpoint not found, using sessionless auth for {self.email}")
                     self.session_id = "sessionless"
-                    self.expires_at = datetime.now() + self.session_ttl
+                    self.expires_at = time.time() + self.session_ttl.total_seconds()
                     return self.session_id
                 elif response.status == 401:
                     raise AuthenticationError("Invalid email or password")
@@ -206,31 +1973,157 @@ class AxigenSession:
                     text = await response.text()
                     raise AuthenticationError(f"Authentication failed: {response.status} - {text}")
 
-                data = await response.json()
+                data = json_loads(await response.read())
                 self.session_id = data.get("sessid")
                 if not self.session_id:
                     raise AuthenticationError("No session ID received from server")
 
                 # Set expiration time
-                self.expires_at = datetime.now() + self.session_ttl
+                self.expires_at = time.time() + self.session_ttl.total_seconds()
 
                 logger.info(f"Successfully authenticated as {self.email}")
                 return self.session_id
 
         except aiohttp.ClientError as e:
+            breaker.record(False)
             raise AuthenticationError(f"Connection error: {str(e)}")
+        except asyncio.TimeoutError:
+            breaker.record(False)
+            get_metrics().increment("axigen_timeouts_total", server=self.server_url, profile="auth")
+            raise AuthenticationError(f"Login timed out for {self.server_url}")
 
     def is_session_valid(self) -> bool:
         """Check if current session is still valid."""
         if not self.session_id or not self.expires_at:
             return False
-        return datetime.now() < self.expires_at
+        return time.time() < self.expires_at
+
+    def _touch(self):
+        """Slide the idle expiry forward after the server accepted our session."""
+        now = time.time()
+        if self.last_activity is None or now - self.last_activity > _SESSION_BURST_GAP:
+            self.uses += 1
+        self.last_activity = now
+        if self.session_id:
+            self.expires_at = now + self.session_ttl.total_seconds()
+
+    def needs_refresh(self) -> bool:
+        """
+        Whether the session is about to expire, was used since its last login
+        and has come back at least _SESSION_REFRESH_MIN_USES times. The count
+        isn't reset by logins, so a returning user stays warm across gaps
+        longer than the session lifetime, while one-off users just expire.
+        """
+        if not self.is_session_valid() or self.session_id == "sessionless":
+            return False
+        if self.last_activity is None or self.authenticated_at is None:
+            return False
+        if self.last_activity <= self.authenticated_at:
+            return False
+        if self.uses < _SESSION_REFRESH_MIN_USES:
+            return False
+        return self.expires_at - time.time() < self.refresh_window.total_seconds()
+
+    def refresh_in_background(self):
+        """Start a background re-login unless one is already running."""
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        self._refresh_task = _background_task(asyncio.get_running_loop(), self._refresh())
+
+    async def _refresh(self):
+        """Replace the current session with a fresh one without blocking callers."""
+        old_session_id = self.session_id
+        try:
+            await self.authenticate(rejected_session_id=old_session_id)
+            get_metrics().increment("axigen_session_refreshes_total", result="success")
+        except Exception as e:
+            get_metrics().increment("axigen_session_refreshes_total", result="failure")
+            logger.warning(f"Background session refresh failed for {self.email}: {e}")
+            return
+        # The replaced session is still alive server-side until we log it out
+        if old_session_id and old_session_id != self.session_id:
+            await self._logout_session(old_session_id)
+
+    async def _logout_session(self, session_id: str) -> bool:
+        """
+        Log a session out on the server. Failures are logged, never raised.
+
+        Returns:
+            True if the server confirmed the logout
+        """
+        import aiohttp
+
+        if session_id == "sessionless" or self.server_url in _logout_unsupported:
+            return False
+        if get_circuit_breakers().get(self.server_url).state == CircuitBreaker.OPEN:
+            get_metrics().increment("axigen_logouts_total", result="skipped")
+            return False
+
+        headers = {
+            "Authorization": self.auth_header,
+            "X-Axigen-Session": session_id
+        }
+        try:
+            pool = get_pool_manager().get_pool(self.server_url)
+            async with pool.post(
+                f"{self.base_url}/logout",
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=5)
+            ) as response:
+                if response.status in (404, 405, 501):
+                    logger.info(f"{self.server_url} has no logout endpoint, skipping logouts")
+                    _logout_unsupported.add(self.server_url)
+                    get_metrics().increment("axigen_logouts_total", result="unsupported")
+                    return False
+                # 401 means the session already expired server-side
+                if response.status < 300 or response.status == 401:
+                    get_metrics().increment("axigen_logouts_total", result="ok")
+                    return True
+                get_metrics().increment("axigen_logouts_total", result="failed")
+                logger.warning(f"Logout for {self.email} failed: {response.status}")
+                return False
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            get_metrics().increment("axigen_logouts_total", result="failed")
+            logger.warning(f"Logout for {self.email} failed: {e}")
+            return False
+
+    async def logout(self) -> bool:
+        """Log out the current server-side session and forget it locally."""
+        session_id = self.session_id
+        self.session_id = None
+        self.expires_at = None
+        if not session_id:
+            return False
+        return await self._logout_session(session_id)
+
+    async def wait_idle(self, timeout: float):
+        """Wait up to timeout seconds for in-flight requests to finish."""
+        if self._in_flight == 0:
+            return
+        if self._drained is None or self._drained.done():
+            self._drained = asyncio.get_running_loop().create_future()
+        try:
+            await asyncio.wait_for(asyncio.shield(self._drained), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"{self._in_flight} request(s) for {self.email} still running at close")
 
     async def ensure_authenticated(self):
         """Ensure we have a valid session, re-authenticating if necessary."""
-        if not self.is_session_valid():
+        metrics = get_metrics()
+        if self.is_session_valid():
+            metrics.increment("axigen_session_auth_checks_total", outcome="valid")
+            if self.needs_refresh():
+                self.refresh_in_background()
+        else:
+            outcome = "expired" if self.session_id else "new"
+            metrics.increment("axigen_session_auth_checks_total", outcome=outcome)
             await self.authenticate()
 
+        # Share of calls on known accounts that did not block on a login
+        valid = metrics.get("axigen_session_auth_checks_total", outcome="valid")
+        expired = metrics.get("axigen_session_auth_checks_total", outcome="expired")
+        metrics.set("axigen_session_refresh_hit_rate", valid / (valid + expired) if valid + expired else 1.0)
+
     async def make_request(
         self,
         method: str,
@@ -254,10 +2147,383 @@ class AxigenSession:
 
         Raises:
             APIError: If request fails
+            CircuitOpenError: If the server's circuit breaker is open
+
+        Requests wait for a slot from the concurrency governor first, so
+        one account can't monopolise a host. Concurrent identical GETs are
+        coalesced into one upstream call; when it was shared, every caller
+        gets its own copy of the decoded result.
         """
+        self._bind_loop()
+        if method.upper() not in COALESCED_METHODS or not _coalescing_enabled():
+            return await self._hedged(method, endpoint, json_data, params, headers)
+
+        key = _request_key(method, endpoint, params, headers)
+        if self._pending_reads is None:
+            self._pending_reads = {}
+        # [task, shared, owner trace, its length at the start]: shared is set
+        # once a second caller joins
+        pending = self._pending_reads.get(key)
+        trace = _call_trace.get()
+        if pending is None:
+            # The call is traced and spanned as the first caller's; only its
+            # deadline is dropped, since every caller waits with its own below
+            task = asyncio.ensure_future(self._shared_read(method, endpoint, json_data, params, headers))
+            pending = self._pending_reads[key] = [task, False, trace, len(trace.calls) if trace is not None else 0]
+            task.add_done_callback(lambda done: self._forget_read(key, done))
+        else:
+            pending[1] = True
+            get_metrics().increment("axigen_requests_coalesced_total", method=method.upper())
+            if trace is not None:
+                trace.count("shared_get")
+                call = trace.call(method, endpoint)
+                if pending[0].done():
+                    # Finished but not yet forgotten: the result is returned without waiting
+                    CallTrace.finish(call, shared=True, **_shared_fields(pending, call, pending[0]))
+                else:
+                    pending[0].add_done_callback(
+                        lambda done: CallTrace.finish(call, shared=True, **_shared_fields(pending, call, done))
+                    )
+        task = pending[0]
+        # Shield so one caller giving up doesn't cancel the call for the others;
+        # each caller still waits no longer than its own deadline
+        remaining = remaining_time()
+        try:
+            result = await asyncio.wait_for(asyncio.shield(task), remaining)
+        except asyncio.TimeoutError:
+            if task.done():
+                raise
+            raise DeadlineExceededError(f"Deadline exceeded during {method} {endpoint}")
+        # Tools add fields to what they get back, so nobody may keep the shared dict
+        return copy.deepcopy(result) if pending[1] else result
+
+    async def _shared_read(
+        self,
+        method: str,
+        endpoint: str,
+        json_data: Optional[Dict],
+        params: Optional[Dict],
+        headers: Optional[Dict]
+    ) -> Dict[str, Any]:
+        """Run a coalesced GET on behalf of every caller waiting on it."""
+        # Runs in its own task; don't let the first caller's deadline cut it short
+        _deadline.set(None)
+        return await self._hedged(method, endpoint, json_data, params, headers)
+
+    async def _hedged(
+        self,
+        method: str,
+        endpoint: str,
+        json_data: Optional[Dict],
+        params: Optional[Dict],
+        headers: Optional[Dict]
+    ) -> Dict[str, Any]:
+        """Send a request, hedging slow GETs when the hedge policy is enabled."""
+        policy = get_hedge_policy()
+        if not policy.enabled or method.upper() != "GET":
+            return await self._request(method, endpoint, json_data, params, headers)
+
+        profile = get_timeout_profiles().for_request(method, endpoint).name
+        policy.credit(self.server_url)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+
+        def observe(task: asyncio.Task):
+            if not task.cancelled() and task.exception() is None:
+                policy.observe(self.server_url, profile, loop.time() - started)
+
+        primary = asyncio.ensure_future(self._request(method, endpoint, json_data, params, headers))
+        primary.add_done_callback(observe)
+        delay = policy.hedge_delay(self.server_url, profile)
+        try:
+            if delay is None:
+                return await asyncio.shield(primary)
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done or not policy.try_spend(self.server_url):
+                return await asyncio.shield(primary)
+
+            get_metrics().increment("axigen_hedges_total", server=self.server_url)
+            hedge = asyncio.ensure_future(self._request(method, endpoint, json_data, params, headers))
+            pending = {primary, hedge}
+            try:
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        if task.exception() is None or not pending:
+                            if task is hedge:
+                                get_metrics().increment("axigen_hedge_wins_total", server=self.server_url)
+                            return task.result()
+                    # One copy failed while the other is still running: wait for it
+            finally:
+                for task in pending:
+                    task.cancel()
+        finally:
+            if not primary.done():
+                primary.cancel()
+
+    def _forget_read(self, key: Tuple, task: asyncio.Task):
+        pending = self._pending_reads.get(key)
+        if pending is not None and pending[0] is task:
+            del self._pending_reads[key]
+        if not task.cancelled():
+            # Mark the exception retrieved even if every caller was cancelled
+            task.exception()
+
+    async def _request(
+        self,
+        method: str,
+        endpoint: str,
+        json_data: Optional[Dict],
+        params: Optional[Dict],
+        headers: Optional[Dict]
+    ) -> Dict[str, Any]:
+        """Run one request through the breaker and governor."""
+        started = time.perf_counter()
+        outcome = "error"
+        label = endpoint_label(endpoint)
+        trace = _call_trace.get()
+        call = trace.call(method, endpoint) if trace is not None else None
+        tracer = _tracer
+        span = None
+        if tracer is not None:
+            span = tracer.start(f"axigen {method} {label}", **{"http.request.method": method, "axigen.endpoint": label})
+        try:
+            breaker = get_circuit_breakers().get(self.server_url)
+            # Fail fast on an open circuit instead of queueing behind it
+            breaker.check()
+            self._in_flight += 1
+            try:
+                async with get_governor().slot(self.server_url, self.email, remaining_time()):
+                    if call is not None:
+                        call["queued_ms"] = round((time.perf_counter() - started) * 1000, 2)
+                    probe = breaker.acquire()
+                    try:
+                        result = await self._send(method, endpoint, json_data, params, headers, breaker, call)
+                    finally:
+                        breaker.release(probe)
+            finally:
+                self._request_done()
+            outcome = "ok"
+            return result
+        except CircuitOpenError:
+            outcome = "circuit_open"
+            raise
+        except DeadlineExceededError:
+            outcome = "deadline"
+            raise
+        except AuthenticationError:
+            outcome = "auth_failed"
+            raise
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        finally:
+            metrics = get_metrics()
+            metrics.increment("axigen_requests_total", method=method, endpoint=label, outcome=outcome)
+            metrics.observe("axigen_request_seconds", time.perf_counter() - started, method=method, endpoint=label)
+            if call is not None:
+                CallTrace.finish(call, outcome=outcome)
+            if span is not None:
+                tracer.end(span, error=None if outcome == "ok" else outcome, **{"axigen.outcome": outcome})
+
+    def _request_done(self):
+        self._in_flight -= 1
+        if self._in_flight == 0 and self._drained is not None and not self._drained.done():
+            self._drained.set_result(None)
+
+    @asynccontextmanager
+    async def stream(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        headers: Optional[Dict] = None,
+        max_bytes: Optional[int] = None,
+        chunk_size: int = 65536,
+        progress=None
+    ):
+        """
+        Make an authenticated request and stream the response body.
+
+        Use for raw content such as mails/{id}/source or attachment downloads:
+
+            async with session.stream("GET", f"mails/{mail_id}/source") as body:
+                async for chunk in body:
+                    ...
+
+        Leaving the block early stops the transfer and drops the connection
+        instead of reading the rest. Streams are not retried or coalesced.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint (without base URL)
+            params: Query parameters
+            headers: Additional headers
+            max_bytes: Raise ResponseTooLargeError past this many body bytes
+            chunk_size: Bytes per chunk
+            progress: Optional callback(bytes_received, content_length)
+
+        Yields:
+            ResponseStream for the 2xx response
+
+        Raises:
+            APIError: If the request fails or returns an error status
+            ResponseTooLargeError: If the body exceeds max_bytes
+            CircuitOpenError: If the server's circuit breaker is open
+        """
+        self._bind_loop()
+        breaker = get_circuit_breakers().get(self.server_url)
+        breaker.check()
+        trace = _call_trace.get()
+        call = trace.call(method, endpoint) if trace is not None else None
+        self._in_flight += 1
+        try:
+            async with get_governor().slot(self.server_url, self.email, remaining_time()):
+                probe = breaker.acquire()
+                try:
+                    response = await self._open_stream(method, endpoint, params, headers, breaker)
+                    body = ResponseStream(response, chunk_size, max_bytes, progress)
+                    try:
+                        if max_bytes is not None and (body.content_length or 0) > max_bytes:
+                            raise ResponseTooLargeError(max_bytes, body.content_length)
+                        yield body
+                    finally:
+                        if call is not None:
+                            CallTrace.finish(call, status=response.status, bytes=body.bytes_received,
+                                             outcome="ok" if body.complete else "aborted")
+                            call = None
+                        record_response_bytes(response, self.server_url, body.bytes_received)
+                        if body.complete:
+                            response.release()
+                        else:
+                            # Don't download the rest just to reuse the connection
+                            get_metrics().increment("axigen_streams_aborted_total", server=self.server_url)
+                            response.close()
+                finally:
+                    breaker.release(probe)
+        finally:
+            if call is not None:
+                CallTrace.finish(call, outcome="error")
+            self._request_done()
+
+    async def _open_stream(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict],
+        headers: Optional[Dict],
+        breaker: CircuitBreaker
+    ) -> "aiohttp.ClientResponse":
+        """Send a request and return the response with its body unread."""
+        import aiohttp
+
+        await self.ensure_authenticated()
+        await self._ensure_http_session()
+        sent_session_id = self.session_id
+
+        request_headers = {"Authorization": self.auth_header}
+        if self.session_id and self.session_id != "sessionless":
+            request_headers["X-Axigen-Session"] = self.session_id
+        if headers:
+            request_headers.update(headers)
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+
+        # Large bodies can take longer than the pool's total timeout; the bulk
+        # profile only bounds the gaps between reads (and the deadline, if any)
+        timeout_profile = get_timeout_profiles().get("bulk")
+
+        reauthenticated = False
+        while True:
+            try:
+                response = await self._http_session.request(
+                    method=method,
+                    url=url,
+                    params=params,
+                    headers=request_headers,
+                    timeout=timeout_profile.client_timeout()
+                )
+            except aiohttp.ClientError as e:
+                breaker.record(False)
+                raise APIError(f"Connection error: {str(e)}")
+            except asyncio.TimeoutError:
+                breaker.record(False)
+                get_metrics().increment("axigen_timeouts_total", server=self.server_url, profile=timeout_profile.name)
+                remaining = remaining_time()
+                if remaining is not None and remaining <= 0:
+                    raise DeadlineExceededError(f"Deadline exceeded during {method} {endpoint}")
+                raise APIError(f"Request timed out: {method} {endpoint}")
+
+            breaker.record(response.status < 500)
+            if response.status == 401 and not reauthenticated and self.session_id != "sessionless":
+                response.release()
+                logger.info("Session expired, re-authenticating...")
+                reauthenticated = True
+                sent_session_id = await self.authenticate(sent_session_id)
+                if self.session_id and self.session_id != "sessionless":
+                    request_headers["X-Axigen-Session"] = self.session_id
+                continue
+            if response.status == 401:
+                response.release()
+                raise AuthenticationError("Authentication failed after retry")
+            if response.status >= 400:
+                error_text = (await response.content.read(4096)).decode("utf-8", errors="replace")
+                response.close()
+                raise APIError(f"API request failed: {response.status} - {error_text}")
+
+            self._touch()
+            return response
+
+    async def download(
+        self,
+        endpoint: str,
+        sink,
+        params: Optional[Dict] = None,
+        max_bytes: Optional[int] = None,
+        progress=None
+    ) -> Dict[str, Any]:
+        """
+        Stream a GET response into a file-like sink.
+
+        Args:
+            endpoint: API endpoint (without base URL)
+            sink: Object with a sync or async write(bytes) method
+            params: Query parameters
+            max_bytes: Raise ResponseTooLargeError past this many bytes
+            progress: Optional callback(bytes_received, content_length)
+
+        Returns:
+            Bytes written, content type and filename from Content-Disposition
+        """
+        async with self.stream("GET", endpoint, params=params, max_bytes=max_bytes,
+                               progress=progress) as body:
+            async for chunk in body:
+                await _write_to_sink(sink, chunk)
+            return {
+                "bytes": body.bytes_received,
+                "content_type": body.content_type,
+                "filename": body.filename
+            }
+
+    async def _send(
+        self,
+        method: str,
+        endpoint: str,
+        json_data: Optional[Dict],
+        params: Optional[Dict],
+        headers: Optional[Dict],
+        breaker: CircuitBreaker,
+        call: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Authenticate if needed, then send the request with retries. Status,
+        attempts and bytes are written to call when it is being traced.
+        """
+        import aiohttp
+
         # Ensure we have valid session
         await self.ensure_authenticated()
         await self._ensure_http_session()
+        sent_session_id = self.session_id
 
         # Build request headers
         request_headers = {
@@ -275,56 +2541,154 @@ class AxigenSession:
             endpoint = endpoint[1:]
         url = f"{self.base_url}/{endpoint}"
 
-        # Make request with retry on 401
-        for attempt in range(2):
+        # Encode the body once with the fast codec; retries resend the bytes
+        body = json_dumps(json_data) if json_data is not None else None
+        compressed_body = compress_request_body(body, self.server_url) if body else None
+        if compressed_body is not None:
+            request_headers["Content-Encoding"] = "gzip"
+            get_metrics().increment("axigen_request_bytes_total", len(body), server=self.server_url, stage="raw")
+            get_metrics().increment("axigen_request_bytes_total", len(compressed_body), server=self.server_url, stage="wire")
+
+        retry_policy = get_retry_policy()
+        retryable = retry_policy.is_retryable(method, endpoint)
+        timeout_profile = get_timeout_profiles().for_request(method, endpoint)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        reauthenticated = False
+        compression_fallback = False
+        attempt = 0
+
+        # Retry once on 401, and with backoff on transient failures
+        while True:
+            retry_after = None
             try:
                 async with self._http_session.request(
                     method=method,
                     url=url,
-                    json=json_data,
+                    data=compressed_body if compressed_body is not None else body,
                     params=params,
-                    headers=request_headers
+                    headers=request_headers,
+                    timeout=timeout_profile.client_timeout()
                 ) as response:
+                    breaker.record(response.status < 500)
+                    if call is not None:
+                        call["status"] = response.status
+                        call["attempts"] = call.get("attempts", 0) + 1
 
                     # Handle authentication errors
                     if response.status == 401:
-                        if attempt == 0 and self.session_id != "sessionless":
+                        if not reauthenticated and self.session_id != "sessionless":
                             # First attempt failed, try re-authenticating
                             logger.info("Session expired, re-authenticating...")
-                            self.session_id = None
-                            await self.authenticate()
+                            reauthenticated = True
+                            sent_session_id = await self.authenticate(sent_session_id)
                             if self.session_id and self.session_id != "sessionless":
                                 request_headers["X-Axigen-Session"] = self.session_id
                             continue
                         else:
                             raise AuthenticationError("Authentication failed after retry")
 
+                    # Server may not take a gzip body: resend it plain once
+                    if compressed_body is not None and response.status in (400, 415):
+                        logger.info(f"{self.server_url} rejected a compressed body, resending uncompressed")
+                        if response.status == 415:
+                            _request_compression_unsupported.add(self.server_url)
+                        compression_fallback = True
+                        compressed_body = None
+                        del request_headers["Content-Encoding"]
+                        continue
+                    if compression_fallback and response.status < 400:
+                        # Plain body worked where gzip got a 400: stop compressing
+                        _request_compression_unsupported.add(self.server_url)
+                        compression_fallback = False
+
+                    # The server accepted our session, so its idle expiry slides
+                    self._touch()
+
                     # Handle successful empty responses
                     if response.status in (200, 201, 204):
                         if response.status == 204:
                             return {}
 
                         content_type = response.headers.get('content-type', '')
+                        raw = await response.read()
+                        record_response_bytes(response, self.server_url, len(raw))
+                        if call is not None:
+                            call["bytes"] = len(raw)
                         if 'application/json' in content_type:
-                            return await response.json()
+                            if not raw.strip():
+                                return {}
+                            try:
+                                return json_loads(raw)
+                            except ValueError as e:
+                                raise APIError(f"Invalid JSON in response to {method} {endpoint}: {e}")
                         else:
                             # Return raw text for non-JSON responses
-                            text = await response.text()
+                            text = raw.decode(response.get_encoding(), errors="replace")
                             return {"raw_response": text}
 
                     # Handle errors
                     error_text = await response.text()
-                    raise APIError(f"API request failed: {response.status} - {error_text}")
+                    failure = APIError(f"API request failed: {response.status} - {error_text}")
+                    if not retryable or response.status not in retry_policy.retry_statuses:
+                        raise failure
+                    reason = str(response.status)
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
 
             except aiohttp.ClientError as e:
-                raise APIError(f"Connection error: {str(e)}")
-
-        raise APIError("Request failed after retries")
+                breaker.record(False)
+                if not retryable:
+                    raise APIError(f"Connection error: {str(e)}")
+                failure = APIError(f"Connection error: {str(e)}")
+                reason = "connection_error"
+            except asyncio.TimeoutError:
+                breaker.record(False)
+                get_metrics().increment("axigen_timeouts_total", server=self.server_url, profile=timeout_profile.name)
+                remaining = remaining_time()
+                if remaining is not None and remaining <= 0:
+                    raise DeadlineExceededError(f"Deadline exceeded during {method} {endpoint}")
+                if not retryable:
+                    raise APIError(f"Request timed out: {method} {endpoint} ({timeout_profile.name} profile)")
+                failure = APIError(f"Request timed out: {method} {endpoint} ({timeout_profile.name} profile)")
+                reason = "timeout"
+
+            delay = retry_policy.next_delay(attempt, loop.time() - started, retry_after)
+            remaining = remaining_time()
+            if delay is not None and remaining is not None and delay >= remaining:
+                # Sleeping would eat the rest of the tool's budget
+                delay = None
+            if delay is None:
+                if attempt:
+                    get_metrics().increment("axigen_retries_exhausted_total", method=method)
+                raise failure
+            breaker.check()
+            get_metrics().increment("axigen_retries_total", method=method, reason=reason)
+            logger.info(f"Retrying {method} {endpoint} in {delay:.2f}s ({reason}, attempt {attempt + 1})")
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def close(self, drain_timeout: Optional[float] = None, logout: bool = True):
+        """
+        Drain in-flight requests, log out server-side and release the pool.
+        The pool itself is shared and stays open.
 
-    async def close(self):
-        """Close HTTP session."""
-        if self._http_session:
-            await self._http_session.close()
+        Args:
+            drain_timeout: Seconds to wait for in-flight requests
+                (default AXIGEN_SHUTDOWN_DRAIN_SECONDS or 10)
+            logout: Log the session out; False keeps it alive server-side
+                (used when it has been saved to the persistent store)
+        """
+        if drain_timeout is None:
+            drain_timeout = _env_float("AXIGEN_SHUTDOWN_DRAIN_SECONDS", 10)
+        await self.wait_idle(drain_timeout)
+        if self._refresh_task is not None and not self._refresh_task.done():
+            self._refresh_task.cancel()
+        if logout:
+            await self.logout()
+            store = await open_session_store()
+            if store is not None:
+                await asyncio.to_thread(store.delete, self.email, self.password, self.server_url)
+        self._http_session = None
 
     async def __aenter__(self):
         """Context manager entry."""
@@ -334,6 +2698,170 @@ class AxigenSession:
         """Context manager exit."""
         await self.close()
 
+# ============================================================================
+# Persistent Session Store
+# ============================================================================
+
+class SessionStore:
+    """
+    Encrypted SQLite store of session IDs so a restarted server can reuse
+    still-valid Axigen sessions instead of logging every user in again.
+
+    Rows are keyed by an HMAC of (email, server URL, password), so an entry
+    can only be found with the right credentials, and the session ID and
+    expiry are encrypted with Fernet. Passwords and emails are never written.
+    Keys are derived from a passphrase with scrypt and a per-file salt.
+
+    Requires the optional cryptography package.
+    """
+
+    def __init__(self, path: str, passphrase: str):
+        import sqlite3
+        from cryptography.fernet import Fernet, InvalidToken
+
+        self.path = path
+        self._invalid_token = InvalidToken
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value BLOB)")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS sessions (id TEXT PRIMARY KEY, payload BLOB, expires_at REAL)"
+        )
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'salt'").fetchone()
+        if row is None:
+            salt = os.urandom(16)
+            self._db.execute("INSERT OR IGNORE INTO meta VALUES ('salt', ?)", (salt,))
+            row = self._db.execute("SELECT value FROM meta WHERE key = 'salt'").fetchone()
+        keys = hashlib.scrypt(passphrase.encode(), salt=row[0], n=2 ** 14, r=8, p=1, dklen=64)
+        self._fernet = Fernet(base64.urlsafe_b64encode(keys[:32]))
+        self._id_key = keys[32:]
+
+    def _entry_id(self, email: str, password: str, server_url: str) -> str:
+        message = "\0".join((email.lower(), server_url.rstrip('/'), password)).encode()
+        return hmac.new(self._id_key, message, hashlib.sha256).hexdigest()
+
+    def load(self, email: str, password: str, server_url: str) -> Optional[Dict[str, Any]]:
+        """
+        Stored session for these credentials if it hasn't expired.
+
+        Returns:
+            {"session_id", "expires_at", "authenticated_at"} (epoch seconds) or None
+        """
+        entry_id = self._entry_id(email, password, server_url)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT payload FROM sessions WHERE id = ? AND expires_at > ?", (entry_id, time.time())
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            return json.loads(self._fernet.decrypt(row[0]))
+        except (self._invalid_token, ValueError):
+            # Written with another passphrase, or corrupt
+            self.delete(email, password, server_url)
+            return None
+
+    def save(self, session: "AxigenSession"):
+        """Store a session's ID and expiry, replacing any previous entry."""
+        self.save_many([session])
+
+    def save_many(self, sessions: List["AxigenSession"]):
+        """Store several sessions in one transaction."""
+        rows = []
+        for session in sessions:
+            if not session.is_session_valid() or session.session_id == "sessionless":
+                continue
+            payload = json.dumps({
+                "session_id": session.session_id,
+                "expires_at": session.expires_at,
+                "authenticated_at": session.authenticated_at
+            }).encode()
+            rows.append((
+                self._entry_id(session.email, session.password, session.server_url),
+                self._fernet.encrypt(payload),
+                session.expires_at
+            ))
+        if not rows:
+            return
+        with self._lock:
+            self._db.execute("BEGIN")
+            self._db.executemany("INSERT OR REPLACE INTO sessions VALUES (?, ?, ?)", rows)
+            self._db.execute("COMMIT")
+
+    def delete(self, email: str, password: str, server_url: str):
+        """Forget the stored session for these credentials."""
+        with self._lock:
+            self._db.execute("DELETE FROM sessions WHERE id = ?", (self._entry_id(email, password, server_url),))
+
+    def purge_expired(self) -> int:
+        """Delete expired entries. Returns how many were removed."""
+        with self._lock:
+            return self._db.execute("DELETE FROM sessions WHERE expires_at <= ?", (time.time(),)).rowcount
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+def load_session_store() -> Optional[SessionStore]:
+    """
+    Open the session store configured by the environment, if any.
+
+        AXIGEN_SESSION_STORE       Path of the SQLite file (unset = no store)
+        AXIGEN_SESSION_STORE_KEY   Passphrase the store is encrypted with
+
+    Returns None (with a warning) when the key or cryptography is missing,
+    so session IDs are never written unencrypted.
+    """
+    path = os.environ.get("AXIGEN_SESSION_STORE")
+    if not path:
+        return None
+    passphrase = os.environ.get("AXIGEN_SESSION_STORE_KEY")
+    if not passphrase:
+        logger.warning("AXIGEN_SESSION_STORE is set without AXIGEN_SESSION_STORE_KEY; session store disabled")
+        return None
+    import sqlite3
+
+    try:
+        return SessionStore(path, passphrase)
+    except ImportError:
+        logger.warning("cryptography is not installed; session store disabled")
+    except sqlite3.Error as e:
+        logger.warning(f"Could not open session store {path}: {e}")
+    return None
+
+_UNSET = object()
+_session_store: Any = _UNSET
+_session_store_lock = threading.Lock()
+
+def get_session_store() -> Optional[SessionStore]:
+    """Get the session store, opening it on first use. None if not configured."""
+    global _session_store
+    if _session_store is _UNSET:
+        with _session_store_lock:
+            if _session_store is _UNSET:
+                _session_store = load_session_store()
+    return _session_store
+
+async def open_session_store() -> Optional[SessionStore]:
+    """
+    get_session_store() for coroutines. Opening derives the key with scrypt,
+    which takes tens of milliseconds, so the first open runs on a thread.
+    """
+    if _session_store is _UNSET:
+        return await asyncio.to_thread(get_session_store)
+    return _session_store
+
+def set_session_store(store: Optional[SessionStore]):
+    """Replace the session store (None disables it)."""
+    global _session_store
+    _session_store = store
+
 # ============================================================================
 # Session Cache (for reusing sessions across tool calls)
 # ============================================================================
@@ -342,11 +2870,77 @@ class SessionCache:
     """
     Cache for Axigen sessions to avoid re-authentication on every tool call.
     Sessions are cached by (email, server_url) tuple.
+
+    The cache is bounded: it holds at most max_entries sessions, evicting the
+    least recently used one when full, and a background reaper evicts sessions
+    that have been idle for longer than the TTL. Evicted sessions are closed.
+    The reaper also refreshes recently used sessions that are about to expire,
+    so returning users rarely wait on a login.
+
+    Defaults can be overridden with environment variables:
+        AXIGEN_SESSION_CACHE_MAX      Maximum cached sessions (default 10000)
+        AXIGEN_SESSION_IDLE_MINUTES   Idle minutes before eviction (default 60)
+        AXIGEN_SESSION_REAP_SECONDS   Seconds between reaper sweeps (default 60)
+        AXIGEN_LOGOUT_CONCURRENCY     Concurrent logouts on eviction/shutdown (default 20)
+        AXIGEN_SESSION_CACHE_STRIPES  Creation lock stripes (default 64)
+
+    Lookups are safe from concurrent tasks and threads: creating a session
+    for a key happens under that key's lock stripe, so each key gets exactly
+    one session, while the shared LRU is only locked for the dictionary
+    operations themselves. The sessions themselves (their login lock, shared
+    GETs and governor slots) are bound to the event loop they first send a
+    request on, so one cache serves one running loop at a time. Using a
+    session from a second running loop raises RuntimeError rather than
+    deadlocking; sessions left from a closed loop are replaced.
     """
 
-    def __init__(self, ttl_minutes: int = 25):
-        self._cache: Dict[Tuple[str, str], AxigenSession] = {}
-        self.ttl = timedelta(minutes=ttl_minutes)
+    def __init__(
+        self,
+        ttl_minutes: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        reap_interval: Optional[float] = None
+    ):
+        self._cache: "OrderedDict[Tuple[str, str], AxigenSession]" = OrderedDict()
+        self.ttl = timedelta(minutes=(
+            ttl_minutes if ttl_minutes is not None
+            else _env_float("AXIGEN_SESSION_IDLE_MINUTES", 60)
+        ))
+        self.max_entries = max(1, max_entries if max_entries is not None
+                               else _env_int("AXIGEN_SESSION_CACHE_MAX", 10000))
+        self.reap_interval = (
+            reap_interval if reap_interval is not None
+            else _env_float("AXIGEN_SESSION_REAP_SECONDS", 60)
+        )
+        self.logout_concurrency = max(1, _env_int("AXIGEN_LOGOUT_CONCURRENCY", 20))
+        self._reaper: Optional[asyncio.Task] = None
+        self._closing: set = set()
+        self._close_semaphore: Optional[asyncio.Semaphore] = None
+        self._close_semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Guards the OrderedDict; held only for dictionary operations
+        self._lock = threading.Lock()
+        # Serialize session creation per key without a global bottleneck
+        self._stripes = [threading.Lock() for _ in range(max(1, _env_int("AXIGEN_SESSION_CACHE_STRIPES", 64)))]
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def _lookup(self, cache_key: Tuple[str, str], fingerprint: bytes) -> Optional[AxigenSession]:
+        """Cached session for key if its password matches. Caller holds self._lock."""
+        session = self._cache.get(cache_key)
+        if session is None:
+            return None
+        if session.fingerprint != fingerprint:
+            # Password changed, remove old session
+            logger.info(f"Password changed for {cache_key[0]}, creating new session")
+            self._evict(cache_key, "password_changed")
+            return None
+        if session._loop is not None and session._loop.is_closed():
+            # Left over from a finished event loop, whose lock and pool it can't use
+            self._evict(cache_key, "loop_closed")
+            return None
+        self._cache.move_to_end(cache_key)
+        session.last_used = time.monotonic()
+        return session
 
     def get_session(self, email: str, password: str, server_url: str) -> AxigenSession:
         """
@@ -360,43 +2954,194 @@ class SessionCache:
         Returns:
             AxigenSession instance
         """
-        cache_key = (email.lower(), server_url.rstrip('/'))
-
-        # Check if we have a cached session
-        if cache_key in self._cache:
-            session = self._cache[cache_key]
-            # Verify password hasn't changed
-            new_auth = base64.b64encode(f"{email}:{password}".encode()).decode('ascii')
-            if session.auth_header == f"Basic {new_auth}":
-                logger.debug(f"Using cached session for {email}")
+        normalized = email.lower()
+        cache_key = (normalized, sys.intern(server_url.rstrip('/')))
+        self._ensure_reaper()
+        fingerprint = credential_fingerprint(password)
+        metrics = get_metrics()
+
+        with self._lock:
+            session = self._lookup(cache_key, fingerprint)
+        if session is not None:
+            logger.debug(f"Using cached session for {email}")
+            metrics.increment("axigen_session_cache_lookups_total", result="hit")
+            trace = _call_trace.get()
+            if trace is not None:
+                trace.count("session_hit")
+            return session
+
+        with self._stripes[hash(cache_key) % len(self._stripes)]:
+            # Another thread may have created it while we waited for the stripe
+            with self._lock:
+                session = self._lookup(cache_key, fingerprint)
+            trace = _call_trace.get()
+            if session is not None:
+                metrics.increment("axigen_session_cache_lookups_total", result="hit")
+                if trace is not None:
+                    trace.count("session_hit")
                 return session
-            else:
-                # Password changed, remove old session
-                logger.info(f"Password changed for {email}, creating new session")
-                del self._cache[cache_key]
-
-        # Create new session
-        logger.info(f"Creating new session for {email}")
-        session = AxigenSession(email, password, server_url)
-        self._cache[cache_key] = session
+
+            metrics.increment("axigen_session_cache_lookups_total", result="miss")
+            if trace is not None:
+                trace.count("session_miss")
+            started = time.perf_counter()
+            logger.info(f"Creating new session for {email}")
+            # Share the key's string when the address is already lower case
+            session = AxigenSession(normalized if normalized == email else email, password, server_url)
+
+            with self._lock:
+                self._cache[cache_key] = session
+                # Enforce the size bound by dropping least recently used sessions
+                while len(self._cache) > self.max_entries:
+                    oldest_key = next(iter(self._cache))
+                    self._evict(oldest_key, "lru")
+                size = len(self._cache)
+
+        metrics.increment("axigen_session_cache_creations_total")
+        metrics.observe("axigen_session_create_seconds", time.perf_counter() - started)
+        metrics.set("axigen_session_cache_size", size)
         return session
 
-    def clear_expired(self):
-        """Remove expired sessions from cache."""
-        now = datetime.now()
-        expired_keys = [
-            key for key, session in self._cache.items()
-            if not session.is_session_valid()
-        ]
-        for key in expired_keys:
-            logger.debug(f"Removing expired session for {key[0]}")
-            del self._cache[key]
+    def _evict(self, key: Tuple[str, str], reason: str):
+        """Drop a session from the cache and close it in the background."""
+        session = self._cache.pop(key)
+        get_metrics().increment("axigen_session_cache_evictions_total", reason=reason)
+        logger.debug(f"Evicting session for {key[0]} ({reason})")
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        owner = session._loop
+        if owner is None or owner is loop:
+            if loop is None:
+                # Never connected, so there is nothing to log out
+                return
+            task = _background_task(loop, self._close_session(session))
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+        elif owner.is_closed():
+            logger.warning(f"Session for {session.email} outlived its event loop and was not logged out")
+        else:
+            # Evicted from another thread or loop: its requests and pool live
+            # on the owning loop, so close it there
+            asyncio.run_coroutine_threadsafe(self._close_session(session), owner)
+
+    async def _close_session(
+        self,
+        session: AxigenSession,
+        drain_timeout: Optional[float] = None,
+        logout: bool = True
+    ):
+        """Close a session, bounding how many logouts run at once."""
+        loop = asyncio.get_running_loop()
+        if self._close_semaphore is None or self._close_semaphore_loop is not loop:
+            self._close_semaphore = asyncio.Semaphore(self.logout_concurrency)
+            self._close_semaphore_loop = loop
+        # Drain outside the semaphore so slow requests don't hold up other logouts
+        await session.wait_idle(
+            drain_timeout if drain_timeout is not None
+            else _env_float("AXIGEN_SHUTDOWN_DRAIN_SECONDS", 10)
+        )
+        async with self._close_semaphore:
+            try:
+                await session.close(drain_timeout=0, logout=logout)
+            except Exception as e:
+                logger.warning(f"Closing session for {session.email} failed: {e}")
 
-    async def close_all(self):
-        """Close all cached sessions."""
-        for session in self._cache.values():
-            await session.close()
-        self._cache.clear()
+    def _ensure_reaper(self):
+        """Start the background reaper on the running loop if it isn't running."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        reaper = self._reaper
+        # One reaper is enough even when several loops share the cache
+        if reaper is not None and not reaper.done() and (reaper.get_loop() is loop or reaper.get_loop().is_running()):
+            return
+        self._reaper = _background_task(loop, self._reap_forever())
+
+    async def _reap_forever(self):
+        """Periodically evict idle sessions and refresh ones about to expire."""
+        while True:
+            await asyncio.sleep(self.reap_interval)
+            try:
+                await self.clear_expired()
+                self.refresh_expiring()
+            except Exception as e:
+                logger.error(f"Session reaper sweep failed: {e}")
+
+    def refresh_expiring(self) -> int:
+        """
+        Start background refreshes for recently used sessions close to expiry.
+
+        Returns:
+            Number of refreshes started
+        """
+        started = 0
+        with self._lock:
+            sessions = list(self._cache.values())
+        for session in sessions:
+            if session.needs_refresh():
+                session.refresh_in_background()
+                started += 1
+        return started
+
+    async def clear_expired(self) -> int:
+        """
+        Evict sessions idle for longer than the TTL and close them.
+
+        Returns:
+            Number of sessions evicted
+        """
+        cutoff = time.monotonic() - self.ttl.total_seconds()
+        expired_keys = []
+        with self._lock:
+            # Entries are in LRU order, so stop at the first recently used one
+            for key, session in self._cache.items():
+                if session.last_used > cutoff:
+                    break
+                expired_keys.append(key)
+            for key in expired_keys:
+                self._evict(key, "idle")
+        if self._closing:
+            await asyncio.gather(*list(self._closing), return_exceptions=True)
+        get_metrics().set("axigen_session_cache_size", len(self._cache))
+        return len(expired_keys)
+
+    async def close_all(self, drain_timeout: Optional[float] = None):
+        """
+        Shut down: drain in-flight requests, log every cached session out
+        (concurrently, bounded by logout_concurrency), then close the
+        connection pools they share.
+
+        With a persistent session store, sessions are saved instead of logged
+        out so the next process can pick them up.
+
+        Args:
+            drain_timeout: Seconds to wait for in-flight requests
+                (default AXIGEN_SHUTDOWN_DRAIN_SECONDS or 10)
+        """
+        if self._reaper is not None:
+            self._reaper.cancel()
+            self._reaper = None
+        with self._lock:
+            sessions = list(self._cache.values())
+            self._cache.clear()
+        store = await open_session_store()
+        await asyncio.gather(
+            *(self._close_session(session, drain_timeout, logout=store is None) for session in sessions),
+            *list(self._closing),
+            return_exceptions=True
+        )
+        if store is not None:
+            # Saved after draining so the expiries include the last requests
+            try:
+                await asyncio.to_thread(store.save_many, sessions)
+                await asyncio.to_thread(store.purge_expired)
+            except Exception as e:
+                logger.warning(f"Could not persist sessions at shutdown: {e}")
+        get_metrics().set("axigen_session_cache_size", 0)
+        await get_pool_manager().close_all()
 
 # Global session cache instance
 _session_cache = SessionCache()
@@ -405,6 +3150,248 @@ def get_session_cache() -> SessionCache:
     """Get the global session cache instance."""
     return _session_cache
 
+# ============================================================================
+# Metrics Endpoint
+# ============================================================================
+
+METRICS_PATH = "/metrics"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Path segments that name a resource rather than identify one; any other
+# segment is an ID and is reported as {id} so per-endpoint series stay bounded
+ENDPOINT_SEGMENTS = frozenset({
+    "account", "aliases", "attachments", "avas", "batch", "blacklist", "body", "contactinfo", "copy",
+    "counters", "delete", "delta", "download", "drafts", "eml", "flags", "folders", "headers", "info",
+    "labels", "login", "logout", "mails", "move", "password", "reset", "schedule", "search", "send",
+    "settings", "signatures", "source", "spam", "temporaryaliases", "ui", "vacation", "whitelist",
+})
+
+def endpoint_label(endpoint: str) -> str:
+    """Endpoint with IDs replaced by {id}, e.g. mails/{id}/move."""
+    path = endpoint.split("?", 1)[0].strip("/")
+    return "/".join(part if part in ENDPOINT_SEGMENTS else "{id}" for part in path.split("/"))
+
+def collect_metrics():
+    """Refresh the gauges that are only worth computing when someone scrapes."""
+    metrics = get_metrics()
+    metrics.set("axigen_session_cache_size", len(get_session_cache()))
+    hits = metrics.get("axigen_session_cache_lookups_total", result="hit")
+    misses = metrics.get("axigen_session_cache_lookups_total", result="miss")
+    metrics.set("axigen_session_cache_hit_ratio", hits / (hits + misses) if hits + misses else 0.0)
+
+    metrics.clear_gauge("axigen_pool_connections")
+    metrics.clear_gauge("axigen_pool_utilization")
+    for server_url, pool in get_pool_manager().stats().items():
+        metrics.set("axigen_pool_connections", pool["in_use"], server=server_url, state="in_use")
+        metrics.set("axigen_pool_connections", pool["idle"], server=server_url, state="idle")
+        metrics.set("axigen_pool_utilization", pool["in_use"] / pool["limit"] if pool["limit"] else 0.0,
+                    server=server_url)
+
+def render_metrics() -> str:
+    """Current metrics in the Prometheus text format."""
+    collect_metrics()
+    return get_metrics().render_prometheus()
+
+# Request _meta key a client sets to get a timing breakdown for one call
+TIMING_META_KEY = "axigen/timing"
+
+def request_meta(context: Any) -> Dict[str, Any]:
+    """The _meta of the MCP request behind a middleware context, or {}."""
+    request_context = getattr(getattr(context, "fastmcp_context", None), "request_context", None)
+    meta = getattr(request_context, "meta", None)
+    if not isinstance(meta, dict):
+        meta = getattr(meta, "model_extra", None) or {}
+    return meta
+
+def timing_requested(context: Any) -> bool:
+    """Whether a tools/call asked for timing in its _meta, or AXIGEN_DEBUG_TIMING is on."""
+    return timing_enabled() or bool(request_meta(context).get(TIMING_META_KEY))
+
+def attach_timing(result: Any, trace: CallTrace) -> Any:
+    """Return a copy of a tool result with the trace summary under "timing"."""
+    from fastmcp.tools import ToolResult
+
+    structured = getattr(result, "structured_content", None)
+    if not isinstance(structured, dict):
+        return result
+    return ToolResult(structured_content={**structured, "timing": trace.summary()},
+                      meta=result.meta, is_error=getattr(result, "is_error", False))
+
+# Set once a server in this process serves METRICS_PATH
+_metrics_route_registered = False
+
+def instrument_server(mcp: Any):
+    """
+    Count and time every tool call on a FastMCP server, add a timing
+    breakdown to results when asked (see timing_requested) and serve
+    METRICS_PATH when it runs on the HTTP transport.
+
+    Mounted servers keep their middleware, so a gateway mounting
+    instrumented servers must not instrument itself as well. Their routes
+    carry over too, so only the first server instrumented in a process
+    registers METRICS_PATH; the metrics are process-wide anyway.
+    """
+    global _metrics_route_registered
+    from fastmcp.server.middleware import Middleware
+    from starlette.responses import Response
+
+    class ToolMetrics(Middleware):
+        async def on_call_tool(self, context, call_next):
+            started = time.perf_counter()
+            outcome = "error"
+            tracer = _tracer
+            span = None
+            if tracer is not None:
+                # Continue the client's trace if it sent a traceparent in _meta
+                span = tracer.start(
+                    f"tools/call {context.message.name}", SPAN_KIND_SERVER,
+                    parent=parse_traceparent(request_meta(context).get("traceparent")),
+                    **{"mcp.method.name": "tools/call", "gen_ai.tool.name": context.message.name}
+                )
+            try:
+                if timing_requested(context):
+                    with trace_calls() as trace:
+                        result = await call_next(context)
+                    result = attach_timing(result, trace)
+                else:
+                    result = await call_next(context)
+                structured = getattr(result, "structured_content", None)
+                failed = isinstance(structured, dict) and structured.get("success") is False
+                outcome = "failed" if failed else "ok"
+                return result
+            finally:
+                metrics = get_metrics()
+                metrics.increment("axigen_tool_calls_total", tool=context.message.name, outcome=outcome)
+                metrics.observe("axigen_tool_seconds", time.perf_counter() - started, tool=context.message.name)
+                if span is not None:
+                    tracer.end(span, error=None if outcome == "ok" else outcome, **{"axigen.outcome": outcome})
+
+    mcp.add_middleware(ToolMetrics())
+
+    if _metrics_route_registered:
+        return
+    _metrics_route_registered = True
+
+    @mcp.custom_route(METRICS_PATH, methods=["GET"])
+    async def metrics_endpoint(request):
+        return Response(render_metrics(), headers={"Content-Type": PROMETHEUS_CONTENT_TYPE})
+
+# Side-port server, for the stdio transport where there is no HTTP app
+_metrics_runner = None
+
+async def start_metrics_server(port: Optional[int] = None, host: Optional[str] = None) -> bool:
+    """
+    Serve METRICS_PATH on its own port (default AXIGEN_METRICS_PORT, off if 0).
+
+    Returns:
+        True if this call started the server
+    """
+    global _metrics_runner
+    port = port if port is not None else _env_int("AXIGEN_METRICS_PORT", 0)
+    if not port or _metrics_runner is not None:
+        return False
+    host = host or os.environ.get("AXIGEN_METRICS_HOST", "127.0.0.1")
+    from aiohttp import web
+
+    async def handle(request):
+        return web.Response(body=render_metrics().encode(), headers={"Content-Type": PROMETHEUS_CONTENT_TYPE})
+
+    app = web.Application()
+    app.router.add_get(METRICS_PATH, handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    try:
+        await web.TCPSite(runner, host, port).start()
+    except OSError as e:
+        logger.warning(f"Could not serve metrics on {host}:{port}: {e}")
+        await runner.cleanup()
+        return False
+    _metrics_runner = runner
+    logger.info(f"Serving metrics on http://{host}:{port}{METRICS_PATH}")
+    return True
+
+async def stop_metrics_server():
+    """Stop the side-port metrics server, if running."""
+    global _metrics_runner
+    runner, _metrics_runner = _metrics_runner, None
+    if runner is not None:
+        await runner.cleanup()
+
+# ============================================================================
+# Lifespan
+# ============================================================================
+
+# Modules deferred at import time that nearly every tool call needs
+PRELOADED_MODULES = ("aiohttp", "email_validator")
+
+def preload_imports() -> Optional[threading.Thread]:
+    """
+    Import PRELOADED_MODULES on a daemon thread, so they load while the MCP
+    client is still handshaking instead of on the first tool call. Off with
+    AXIGEN_PRELOAD_IMPORTS=0, which leaves them to load on first use.
+    """
+    if not _env_int("AXIGEN_PRELOAD_IMPORTS", 1):
+        return None
+    missing = [name for name in PRELOADED_MODULES if name not in sys.modules]
+    if not missing:
+        return None
+
+    def preload():
+        for name in missing:
+            try:
+                __import__(name)
+            except ImportError as e:
+                logger.warning(f"Could not preload {name}: {e}")
+
+    thread = threading.Thread(target=preload, name="axigen-preload", daemon=True)
+    thread.start()
+    return thread
+
+# Nesting depth of session_lifespan
+_lifespan_depth = 0
+
+@asynccontextmanager
+async def session_lifespan(server: Any = None):
+    """
+    FastMCP lifespan that preloads deferred imports, opens the session store
+    (if configured) off the event loop, serves metrics on AXIGEN_METRICS_PORT
+    if set, and gracefully shuts down the session layer: in-flight requests
+    are drained, cached sessions are logged out (or saved, with a persistent
+    session store) and pools closed.
+
+    A gateway's lifespan and those of the servers it mounts nest; only the
+    outermost one starts and stops the session layer.
+    """
+    global _lifespan_depth
+    _lifespan_depth += 1
+    if _lifespan_depth > 1:
+        try:
+            yield {}
+        finally:
+            _lifespan_depth -= 1
+        return
+
+    try:
+        preload_imports()
+        await open_session_store()
+        metrics_server = await start_metrics_server()
+        try:
+            yield {}
+        finally:
+            if metrics_server:
+                await stop_metrics_server()
+            logger.info("Shutting down: closing cached Axigen sessions")
+            await get_session_cache().close_all()
+            store = get_session_store()
+            if store is not None:
+                store.close()
+                set_session_store(None)
+            tracer = get_tracer()
+            if tracer is not None:
+                await asyncio.to_thread(tracer.exporter.flush)
+    finally:
+        _lifespan_depth -= 1
+
 # ============================================================================
 # Convenience Functions
 # ============================================================================
@@ -434,4 +3421,66 @@ async def quick_request(
         Response data
     """
     session = get_session_cache().get_session(email, password, server_url)
-    return await session.make_request(method, endpoint, json_data=data, params=params)
\ No newline at end of file
+    return await session.make_request(method, endpoint, json_data=data, params=params)
+
+@asynccontextmanager
+async def quick_stream(
+    email: str,
+    password: str,
+    server_url: str,
+    method: str,
+    endpoint: str,
+    params: Optional[Dict] = None,
+    max_bytes: Optional[int] = None,
+    progress=None
+):
+    """
+    Stream a response body without managing the session manually.
+
+    Args:
+        email: User's email
+        password: User's password
+        server_url: Axigen server URL
+        method: HTTP method
+        endpoint: API endpoint
+        params: Query parameters
+        max_bytes: Size cap for the body
+        progress: Optional callback(bytes_received, content_length)
+
+    Yields:
+        ResponseStream to iterate over
+    """
+    session = get_session_cache().get_session(email, password, server_url)
+    async with session.stream(method, endpoint, params=params, max_bytes=max_bytes,
+                              progress=progress) as body:
+        yield body
+
+async def quick_download(
+    email: str,
+    password: str,
+    server_url: str,
+    endpoint: str,
+    sink,
+    params: Optional[Dict] = None,
+    max_bytes: Optional[int] = None,
+    progress=None
+) -> Dict[str, Any]:
+    """
+    Download a response body into a file-like sink without managing the session.
+
+    Args:
+        email: User's email
+        password: User's password
+        server_url: Axigen server URL
+        endpoint: API endpoint
+        sink: Object with a sync or async write(bytes) method
+        params: Query parameters
+        max_bytes: Size cap for the body
+        progress: Optional callback(bytes_received, content_length)
+
+    Returns:
+        Bytes written, content type and filename
+    """
+    session = get_session_cache().get_session(email, password, server_url)
+    return await session.download(endpoint, sink, params=params, max_bytes=max_bytes,
+                                  progress=progress)
@@ -13,7 +13,7 @@ from fastmcp import FastMCP
 from src.utils import (
     format_success, format_error,
     validate_email_address, validate_server_url,
-    get_session_cache, quick_request,
+    get_session_cache, quick_request, session_lifespan, instrument_server, tool_deadline,
     AxigenError, AuthenticationError, APIError
 )
 
@@ -46,8 +46,10 @@ mcp = FastMCP(
 
     Note: Filter rules management requires understanding of Axigen's filter
     syntax and conditions. Complex filters should be tested carefully.
-    """
+    """,
+    lifespan=session_lifespan
 )
+instrument_server(mcp)
 
 # ============================================================================
 # Anti-Spam/Anti-Virus Settings
@@ -466,6 +468,7 @@ async def remove_from_blacklist(
 # ============================================================================
 
 @mcp.tool()
+@tool_deadline()
 async def bulk_update_whitelist(
     email: str,
     password: str,
@@ -564,6 +567,7 @@ async def bulk_update_whitelist(
 
 
 @mcp.tool()
+@tool_deadline()
 async def bulk_update_blacklist(
     email: str,
     password: str,
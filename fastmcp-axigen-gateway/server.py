@@ -0,0 +1,120 @@
+"""
+FastMCP Axigen Gateway Server
+=============================
+Runs the email, settings, filters and security servers in one process.
+
+All four tool sets share a single session layer (src/utils.py): one session
+cache, one connection pool per Axigen host and one set of metrics, so a user
+who touches several tool sets logs in once. The individual servers are
+unchanged and can still be run on their own.
+
+Set AXIGEN_GATEWAY_SERVERS to a comma-separated subset (e.g. "email,filters")
+to mount only some of them.
+"""
+
+import hashlib
+import importlib.util
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Any
+
+from fastmcp import FastMCP
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Mount name -> server directory
+SERVERS = {
+    "email": "fastmcp-axigen-email",
+    "settings": "fastmcp-axigen-settings",
+    "filters": "fastmcp-axigen-filters",
+    "security": "fastmcp-axigen-security",
+}
+
+# Every server does `from src.utils import ...`; with the email copy first on
+# the path they all get the same module, and with it the same cache and pools
+sys.path.insert(0, str(REPO_ROOT / SERVERS["email"]))
+
+from src.utils import (  # noqa: E402
+    format_success, get_governor, get_metrics, get_pool_manager,
+    get_session_cache, session_lifespan
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def check_utils_copies():
+    """Warn if a server's src/utils.py has drifted from the shared copy."""
+    digests = {
+        name: hashlib.sha256((REPO_ROOT / directory / "src" / "utils.py").read_bytes()).hexdigest()
+        for name, directory in SERVERS.items()
+    }
+    for name, digest in digests.items():
+        if digest != digests["email"]:
+            logger.warning(
+                f"{SERVERS[name]}/src/utils.py differs from the email copy; "
+                f"the gateway uses the email copy for all servers"
+            )
+
+def load_server(name: str) -> FastMCP:
+    """Import a server's server.py under a unique module name and return its FastMCP app."""
+    path = REPO_ROOT / SERVERS[name] / "server.py"
+    spec = importlib.util.spec_from_file_location(f"axigen_{name}_server", path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module.mcp
+
+def enabled_servers() -> list:
+    """Servers to mount, from AXIGEN_GATEWAY_SERVERS (default: all)."""
+    raw = os.environ.get("AXIGEN_GATEWAY_SERVERS")
+    if not raw:
+        return list(SERVERS)
+    names = [name.strip() for name in raw.split(",") if name.strip()]
+    unknown = [name for name in names if name not in SERVERS]
+    if unknown:
+        raise ValueError(f"Unknown servers in AXIGEN_GATEWAY_SERVERS: {', '.join(unknown)}")
+    return names
+
+# ============================================================================
+# Server Creation - MUST be at module level for FastMCP Cloud
+# ============================================================================
+
+mcp = FastMCP(
+    name="Axigen Gateway",
+    instructions="""
+    Axigen Gateway for MCP - Email, Settings, Filters and Security in one server
+
+    Provides every tool from the Axigen email, settings, filters and security
+    servers. All credentials are passed as tool parameters; sessions are
+    shared across the tool sets, so each account logs in once.
+    """,
+    lifespan=session_lifespan
+)
+
+check_utils_copies()
+# Each server instruments its own tools, and the middleware carries over when
+# mounted, so the gateway adds none of its own. /metrics comes from the first
+# server mounted, and only the gateway's lifespan runs the shared session layer
+for server_name in enabled_servers():
+    mcp.mount(load_server(server_name))
+    logger.info(f"Mounted {server_name} tools")
+
+@mcp.tool()
+async def get_gateway_stats() -> Dict[str, Any]:
+    """
+    Get session layer statistics for the gateway.
+
+    Returns:
+        Cached sessions, connection pools, concurrency queues and all counters
+    """
+    return format_success({
+        "sessions_cached": len(get_session_cache()),
+        "pools": get_pool_manager().stats(),
+        "governor": get_governor().stats(),
+        "metrics": get_metrics().snapshot()
+    }, "Gateway statistics retrieved")
+
+if __name__ == "__main__":
+    mcp.run()
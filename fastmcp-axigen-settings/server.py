@@ -14,7 +14,7 @@ from fastmcp import FastMCP
 from src.utils import (
     format_success, format_error,
     validate_email_address, validate_server_url,
-    get_session_cache, quick_request,
+    get_session_cache, quick_request, session_lifespan, instrument_server,
     AxigenError, AuthenticationError, APIError
 )
 
@@ -46,8 +46,10 @@ mcp = FastMCP(
 
     All tools require email, password, and server_url as parameters.
     The server handles session management automatically with caching for efficiency.
-    """
+    """,
+    lifespan=session_lifespan
 )
+instrument_server(mcp)
 
 # ============================================================================
 # Account Settings Tools